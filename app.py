@@ -4,7 +4,7 @@ from flask_cors import CORS
 from datetime import datetime
 import json
 from database import Database
-from amazon_scraper import AmazonScraper
+from scrapers.amazon_scraper import AmazonScraper
 from scrapers.main_scraper import MainScraper
 from price_tracker import PriceTracker
 from notifier import NotificationManager
@@ -220,14 +220,10 @@ def scrape_now():
                 "total_saved": results['total_saved'],
                 "scrape_time": results['scrape_time'],
                 "by_site": {
-                    "trendyol": {
-                        "count": results['trendyol']['count'],
-                        "success": results['trendyol']['success']
-                    },
-                    "hepsiburada": {
-                        "count": results['hepsiburada']['count'], 
-                        "success": results['hepsiburada']['success']
-                    }
+                    site: {
+                        "count": results[site]['count'],
+                        "success": results[site]['success']
+                    } for site in results['sites']
                 },
                 "errors": results['errors']
             },
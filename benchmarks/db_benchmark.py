@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import random
+import argparse
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.seed import (add_volume_arguments, volumes_from_args, use_bench_database,
+                             seed, bench_asin, CATEGORIES)
+from benchmarks.report import time_call, build_report, write_report, compare_reports, print_comparison
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def rolled_back(conn, func: Callable) -> Callable:
+    """Silme işlemlerini transaction içinde çalıştırıp geri al (tekrarlanabilir ölçüm için)"""
+    def wrapper():
+        conn.autocommit = False
+        try:
+            return func()
+        finally:
+            conn.rollback()
+            conn.autocommit = True
+    return wrapper
+
+
+def run_benchmarks(db, tracker, product_count: int, repeat: int, sample: int) -> Dict:
+    """Veritabanı ve analiz hot path'lerini ölç"""
+    rng = random.Random(42)
+    sample_asins = [bench_asin(rng.randint(1, product_count)) for _ in range(sample)]
+    preferences = {
+        'categories': CATEGORIES[:2],
+        'min_discount': 70,
+        'min_price': 10,
+        'max_price': 10000
+    }
+
+    # Bir taramanın yazma yükü: ürün başına add_product vs toplu upsert / last_seen
+    crawl_products = [{
+        'asin': asin,
+        'title': f'Benchmark ürünü {asin}',
+        'current_price': 99.90,
+        'list_price': 249.90,
+        'discount_percent': 60,
+        'image_url': '',
+        'product_url': f'https://example.com/p/{asin}',
+        'category': CATEGORIES[0],
+        'fingerprint': None
+    } for asin in sample_asins]
+
+    def add_one_by_one():
+        for product in crawl_products:
+            if db.add_product(product):
+                db.add_price_history(product['asin'], product['current_price'])
+
+    cases = {
+        'database.get_big_deals': lambda: db.get_big_deals(min_discount=70),
+        'database.get_big_deals[category]': lambda: db.get_big_deals(min_discount=70, category=CATEGORIES[0]),
+        'database.get_new_deals': lambda: db.get_new_deals(hours=1),
+        'database.is_fake_discount[x%d]' % sample: lambda: [db.is_fake_discount(a) for a in sample_asins],
+        'database.get_price_history[x%d]' % sample: lambda: [db.get_price_history(a, days=30) for a in sample_asins],
+        'price_tracker.get_trending_products': lambda: tracker.get_trending_products('decreasing', days=7),
+        'price_tracker.generate_price_alerts': lambda: tracker.generate_price_alerts(preferences),
+        'price_tracker.get_price_statistics': lambda: tracker.get_price_statistics(),
+        'price_tracker.cleanup_old_price_history': rolled_back(
+            tracker.db.conn, lambda: tracker.cleanup_old_price_history(days_to_keep=90)),
+        'database.cleanup_stale_products': rolled_back(
+            db.conn, lambda: db.cleanup_stale_products(days=30)),
+        'crawl.add_product[x%d]' % sample: rolled_back(db.conn, add_one_by_one),
+        'crawl.save_products_batch[x%d]' % sample: rolled_back(
+            db.conn, lambda: db.save_products_batch(crawl_products)),
+        'crawl.touch_products[x%d]' % sample: rolled_back(
+            db.conn, lambda: db.touch_products(sample_asins)),
+    }
+
+    results = {}
+    for name, func in cases.items():
+        logger.info("⏱️ %s ölçülüyor...", name)
+        results[name] = time_call(func, repeat=repeat)
+        logger.info("⏱️ %s: p50=%sms", name, results[name]['p50_ms'])
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Veritabanı ve analiz hot path benchmark\'ı')
+    add_volume_arguments(parser)
+    parser.add_argument('--skip-seed', action='store_true', help='Mevcut sentetik veriyi kullan')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--sample', type=int, default=100, help='Tek ürün sorguları için örnek ASIN sayısı')
+    parser.add_argument('--output', help='JSON rapor dosyası (varsayılan: stdout)')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON rapor')
+    args = parser.parse_args()
+
+    use_bench_database(args.database_url)
+    from database import Database
+    from price_tracker import PriceTracker
+
+    volumes = volumes_from_args(args)
+    db = Database()
+    if not args.skip_seed:
+        seed(db, volumes)
+
+    tracker = PriceTracker()
+    results = run_benchmarks(db, tracker, volumes['products'], args.repeat, args.sample)
+
+    report = build_report('database', {**volumes, 'repeat': args.repeat, 'sample': args.sample}, results)
+    write_report(report, args.output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(compare_reports(json.load(f), report))
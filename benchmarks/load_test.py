@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.seed import bench_asin, use_bench_database, CATEGORIES, DEFAULT_VOLUMES
+from benchmarks.report import percentile, build_report, write_report, compare_reports, print_comparison
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Üretim trafiğinden çıkarılan istek dağılımı (route → ağırlık)
+DEFAULT_MIX = {
+    'deals': 30,
+    'deals_filtered': 15,
+    'products_new': 10,
+    'product_detail': 20,
+    'product_history': 12,
+    'trending': 5,
+    'categories': 5,
+    'register_device': 3
+}
+
+
+def build_request(route: str, rng: random.Random, product_count: int) -> Tuple[str, str, Dict]:
+    """Route adından (method, path, json_body) üret"""
+    if route == 'deals':
+        return 'GET', '/deals', None
+    if route == 'deals_filtered':
+        category = rng.choice(CATEGORIES)
+        min_discount = rng.choice([70, 75, 80, 90])
+        return 'GET', f'/deals?min_discount={min_discount}&category={category}&limit=20', None
+    if route == 'products_new':
+        return 'GET', f'/products/new?hours={rng.choice([1, 2, 24])}', None
+    if route == 'product_detail':
+        return 'GET', f'/product/{bench_asin(rng.randint(1, product_count))}', None
+    if route == 'product_history':
+        return 'GET', f'/product/{bench_asin(rng.randint(1, product_count))}/history?days=30', None
+    if route == 'trending':
+        return 'GET', f'/trending?type={rng.choice(["decreasing", "increasing", "volatile"])}', None
+    if route == 'categories':
+        return 'GET', '/categories', None
+    if route == 'register_device':
+        body = {
+            'device_token': f'loadtest{rng.randint(1, 10_000_000)}',
+            'preferences': {'min_discount': rng.choice([60, 70, 80]), 'categories': [rng.choice(CATEGORIES)]}
+        }
+        return 'POST', '/register-device', body
+    raise ValueError(f"Bilinmeyen route: {route}")
+
+
+class RouteStats:
+    """Route bazlı gecikme ve hata sayaçları (thread-safe)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, route: str, latency: float, ok: bool):
+        with self.lock:
+            self.latencies.setdefault(route, []).append(latency)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict:
+        result = {}
+        for route, values in sorted(self.latencies.items()):
+            ms = [v * 1000 for v in values]
+            errors = self.errors.get(route, 0)
+            result[route] = {
+                'requests': len(ms),
+                'throughput_rps': round(len(ms) / elapsed, 2) if elapsed else 0,
+                'p50_ms': round(percentile(ms, 50), 2),
+                'p95_ms': round(percentile(ms, 95), 2),
+                'p99_ms': round(percentile(ms, 99), 2),
+                'error_rate': round(errors / len(ms), 4)
+            }
+        return result
+
+
+def worker(base_url: str, mix: Dict, seed: int, deadline: float, product_count: int,
+           stats: RouteStats, timeout: float):
+    """Süre dolana kadar karışımdan istek üret"""
+    rng = random.Random(seed)
+    routes = list(mix.keys())
+    weights = list(mix.values())
+    session = requests.Session()
+
+    while time.time() < deadline:
+        route = rng.choices(routes, weights)[0]
+        method, path, body = build_request(route, rng, product_count)
+
+        start = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=timeout)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        stats.record(route, time.perf_counter() - start, ok)
+
+
+def run_level(base_url: str, mix: Dict, concurrency: int, duration: float, product_count: int,
+              seed: int, timeout: float) -> Dict:
+    """Tek eşzamanlılık seviyesinde yük uygula"""
+    stats = RouteStats()
+    deadline = time.time() + duration
+    start = time.time()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(worker, base_url, mix, seed * 1000 + i, deadline, product_count, stats, timeout)
+                   for i in range(concurrency)]
+        for future in futures:
+            future.result()
+
+    elapsed = time.time() - start
+    routes = stats.summary(elapsed)
+    total = sum(r['requests'] for r in routes.values())
+    all_latencies = [v * 1000 for values in stats.latencies.values() for v in values]
+
+    return {
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 2),
+        'total_requests': total,
+        'throughput_rps': round(total / elapsed, 2) if elapsed else 0,
+        'p50_ms': round(percentile(all_latencies, 50), 2),
+        'p95_ms': round(percentile(all_latencies, 95), 2),
+        'p99_ms': round(percentile(all_latencies, 99), 2),
+        'error_rate': round(sum(stats.errors.values()) / total, 4) if total else 0,
+        'routes': routes
+    }
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """app.py'yi benchmark veritabanına karşı ayrı süreçte başlat"""
+    env = dict(os.environ, PORT=str(port))
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=ROOT_DIR, env=env)
+
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(60):
+        try:
+            if requests.get(base_url + '/health', timeout=2).status_code == 200:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+
+    process.terminate()
+    raise RuntimeError("Sunucu 60 saniyede hazır olmadı")
+
+
+def flatten(levels: List[Dict]) -> Dict:
+    """compare_reports için seviye/route bazlı düz sonuç tablosu"""
+    results = {}
+    for level in levels:
+        for route, route_stats in level['routes'].items():
+            results[f"c{level['concurrency']}/{route}"] = route_stats
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Flask API yük testi')
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--start-server', action='store_true',
+                        help='app.py\'yi BENCH_DATABASE_URL ile başlat (önce benchmarks/seed.py çalıştırın)')
+    parser.add_argument('--database-url', help='--start-server için benchmark veritabanı')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--concurrency', default='1,4,16,32', help='Virgülle ayrılmış seviyeler')
+    parser.add_argument('--duration', type=float, default=30, help='Seviye başına saniye')
+    parser.add_argument('--products', type=int, default=DEFAULT_VOLUMES['products'],
+                        help='Seed edilen ürün sayısı (ASIN aralığı)')
+    parser.add_argument('--mix', help='Route ağırlıklarını içeren JSON dosyası')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--output', help='JSON rapor dosyası (varsayılan: stdout)')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON rapor')
+    args = parser.parse_args()
+
+    mix = DEFAULT_MIX
+    if args.mix:
+        with open(args.mix, encoding='utf-8') as f:
+            mix = json.load(f)
+
+    server = None
+    base_url = args.base_url.rstrip('/')
+    if args.start_server:
+        use_bench_database(args.database_url)
+        server = start_server(args.port)
+        base_url = f'http://127.0.0.1:{args.port}'
+
+    try:
+        levels = []
+        for concurrency in [int(c) for c in args.concurrency.split(',')]:
+            logger.info("🚦 Eşzamanlılık %s (%ss)...", concurrency, args.duration)
+            level = run_level(base_url, mix, concurrency, args.duration, args.products, args.seed, args.timeout)
+            logger.info("🚦 c=%s: %s rps, p95=%sms, hata=%s",
+                        concurrency, level['throughput_rps'], level['p95_ms'], level['error_rate'])
+            levels.append(level)
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = build_report('http_load', {
+        'base_url': base_url,
+        'duration_s': args.duration,
+        'products': args.products,
+        'seed': args.seed,
+        'mix': mix
+    }, flatten(levels))
+    report['levels'] = levels
+    write_report(report, args.output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(compare_reports(json.load(f), report, metric='p95_ms'), metric='p95_ms')
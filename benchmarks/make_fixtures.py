@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.replay import FixtureStore, DEFAULT_FIXTURE_DIR
+from scrapers.amazon_scraper import AmazonScraper
+
+# Gerçek sayfaların iskeletini taklit eden deterministik fixture üretici.
+# Canlı sayfalar `python -m scrapers.replay` ile aynı depoya yakalanabilir.
+
+BRANDS = ['Logitech', 'Samsung', 'Apple', 'Xiaomi', 'Philips', 'Arzum', 'Tefal', 'Nike', 'Adidas', 'Lenovo']
+CATEGORIES = ['Bilgisayar', 'Telefon', 'Küçük Ev Aletleri', 'Spor', 'Oyun']
+ITEMS = ['Kablosuz Mouse', 'Bluetooth Kulaklık', 'Akıllı Saat', 'Kahve Makinesi', 'Spor Ayakkabı',
+         'Tablet 10.1"', 'Mekanik Klavye', 'Airfryer 4L', 'Powerbank 20000 mAh', 'Oyun Kumandası']
+
+# Amazon kategori taraması fixture'ları (kategori × sayfa)
+AMAZON_CATEGORIES = [('Bilgisayar', 'mouse'), ('Oyun', 'oyun kumandası')]
+AMAZON_PAGES = 2
+
+
+def tr_price(value: float) -> str:
+    """1299.99 → '1.299,99'"""
+    whole, fraction = f"{value:.2f}".split('.')
+    groups = []
+    while len(whole) > 3:
+        groups.insert(0, whole[-3:])
+        whole = whole[:-3]
+    groups.insert(0, whole)
+    return f"{'.'.join(groups)},{fraction}"
+
+
+def page_noise(rng: random.Random, size_kb: int) -> str:
+    """Gerçek sayfalardaki menü, script ve footer yükünü taklit et"""
+    links = ''.join(f'<li><a href="/kategori-{i}">Kategori {i}</a></li>' for i in range(300))
+    blob = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(size_kb * 1024))
+    return (f'<nav class="main-nav"><ul>{links}</ul></nav>'
+            f'<script>window.__ANALYTICS__ = "{blob}";</script>')
+
+
+def category_for(n: int) -> str:
+    """Rastgele akışı değiştirmeden deterministik kategori"""
+    return CATEGORIES[n % len(CATEGORIES)]
+
+
+def product_sample(rng: random.Random):
+    title = f"{rng.choice(BRANDS)} {rng.choice(ITEMS)} {rng.randint(100, 999)}"
+    list_price = round(rng.uniform(50, 8000), 2)
+    discount = rng.choice([10, 20, 35, 40, 45, 50, 60, 70, 75])
+    current_price = round(list_price * (100 - discount) / 100, 2)
+    return title, list_price, current_price
+
+
+def state_script(marker: str, state: dict) -> str:
+    """Sayfaya gömülü JSON state (gerçek sayfalardaki initial state script'i)"""
+    payload = json.dumps(state, ensure_ascii=False).replace('</', '<\\/')
+    if marker.startswith('<script'):
+        return f'{marker}{payload}</script>'
+    return f'<script>{marker}={payload};</script>'
+
+
+def trendyol_page(rng: random.Random, page: int, cards: int = 24, with_state: bool = True) -> str:
+    items = []
+    state_products = []
+    for i in range(cards):
+        content_id = 100000000 + page * 1000 + i
+        title, list_price, current_price = product_sample(rng)
+        brand, name = title.split(' ', 1)
+        slug = name.lower().replace(' ', '-').replace('"', '')
+        href = f"/{brand.lower()}/{slug}-p-{content_id}?boutiqueId=61&merchantId={rng.randint(1000, 99999)}"
+        rating_count = rng.randint(0, 5000)
+        state_products.append({
+            'id': content_id,
+            'name': name,
+            'brand': {'name': brand},
+            'url': href,
+            'images': [f"/ty{content_id}/1_org_zoom.jpg"],
+            'categoryName': category_for(content_id),
+            'price': {'originalPrice': list_price, 'sellingPrice': current_price, 'discountedPrice': current_price},
+            'ratingScore': {'averageRating': round(3 + (content_id % 20) / 10, 1), 'totalCount': rating_count}
+        })
+        items.append(f'''
+<div class="p-card-wrppr with-campaign-view" data-id="{content_id}" title="{title}">
+  <div class="p-card-chldrn-cntnr card-border">
+    <a href="{href.replace('&', '&amp;')}">
+      <div class="image-container"><img class="p-card-img" src="https://cdn.dsmcdn.com/ty{content_id}/1_org_zoom.jpg" alt="{title}"></div>
+      <div class="prdct-desc-cntnr-wrppr"><div class="prdct-desc-cntnr"><div class="prdct-desc-cntnr-ttl-w">
+        <span class="prdct-desc-cntnr-ttl">{brand}</span> <span class="prdct-desc-cntnr-name">{name}</span>
+      </div></div></div>
+      <div class="ratings"><div class="star-w"></div><span class="ratingCount">({rating_count})</span></div>
+      <div class="price-promotion-container"><div class="prc-cntnr">
+        <div class="prc-box-orgnl">{tr_price(list_price)} TL</div>
+        <div class="prc-box-dscntd">{tr_price(current_price)} TL</div>
+      </div></div>
+    </a>
+  </div>
+</div>''')
+
+    state = state_script('window.__SEARCH_APP_INITIAL_STATE__',
+                         {'products': state_products, 'totalCount': cards}) if with_state else ''
+    return f'''<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8"><title>İndirimli Ürünler - Trendyol</title></head>
+<body><div id="container">{page_noise(rng, 40)}
+<div class="prdct-cntnr-wrppr">{''.join(items)}</div></div>{state}</body></html>'''
+
+
+def hepsiburada_page(rng: random.Random, page: int, cards: int = 24, with_state: bool = True) -> str:
+    items = []
+    state_products = []
+    for i in range(cards):
+        sku = f"HBCV0000{page}{i:05d}"
+        title, list_price, current_price = product_sample(rng)
+        slug = title.lower().replace(' ', '-').replace('"', '')
+        state_products.append({
+            'sku': sku,
+            'name': title,
+            'brand': title.split(' ', 1)[0],
+            'url': f"https://www.hepsiburada.com/{slug}-p-{sku}?magaza=Hepsiburada",
+            'image': f"https://productimages.hepsiburada.net/s/{sku}.jpg",
+            'categoryName': category_for(i),
+            'price': {'original': list_price, 'current': current_price},
+            'rating': round(3 + (i % 20) / 10, 1),
+            'reviewCount': i * 7
+        })
+        items.append(f'''
+<li class="productListContent-item">
+  <div data-test-id="product-card" class="productCard-module">
+    <a class="product-card productCardLink" data-test-id="product-card-link" href="https://www.hepsiburada.com/{slug}-p-{sku}?magaza=Hepsiburada">
+      <div class="product-image"><img data-test-id="product-card-image" src="https://productimages.hepsiburada.net/s/{sku}.jpg" alt="{title}"></div>
+      <h3 data-test-id="product-card-name">{title}</h3>
+      <div data-test-id="price-old-price">{tr_price(list_price)} TL</div>
+      <div data-test-id="price-current-price">{tr_price(current_price)} TL</div>
+    </a>
+  </div>
+</li>''')
+
+    state = state_script('<script id="reduxStore" type="application/json">',
+                         {'productList': {'products': state_products}}) if with_state else ''
+    return f'''<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8"><title>Kampanyalar - Hepsiburada</title></head>
+<body>{page_noise(rng, 50)}
+<ul class="productListContent-wrapper">{''.join(items)}</ul>{state}</body></html>'''
+
+
+def amazon_page(rng: random.Random, keyword: str, cards: int = 48) -> str:
+    # Gerçek sayfalardaki gibi ASIN'siz yer tutucu kart (parser atlamalı)
+    items = ['<div data-asin="" data-component-type="s-search-result" class="s-result-item AdHolder"></div>']
+    for i in range(cards):
+        asin = f"B0{rng.randint(10000000, 99999999)}"
+        title, list_price, current_price = product_sample(rng)
+        whole, fraction = tr_price(current_price).split(',')
+        strike = ''
+        if rng.random() < 0.7:
+            strike = (f'<span class="a-price a-text-price" data-a-strike="true">'
+                      f'<span class="a-offscreen">{tr_price(list_price)} TL</span></span>')
+        items.append(f'''
+<div data-asin="{asin}" data-index="{i}" data-component-type="s-search-result" class="s-result-item s-asin">
+  <div class="s-card-container"><span class="rush-component"><a class="a-link-normal s-no-outline" href="/dp/{asin}">
+    <img class="s-image" src="https://m.media-amazon.com/images/I/{asin}.jpg" alt="{title}"></a></span>
+  <h2 class="a-size-mini"><a class="a-link-normal s-link-style a-text-normal" href="/{title.replace(' ', '-').replace('"', '')}/dp/{asin}/ref=sr_1_{i + 1}">
+    <span class="a-size-base-plus a-color-base a-text-normal">{title}</span></a></h2>
+  <div class="a-row"><a class="a-link-normal" href="/dp/{asin}">
+    <span class="a-price" data-a-size="xl"><span class="a-offscreen">{tr_price(current_price)} TL</span>
+    <span aria-hidden="true"><span class="a-price-whole">{whole}<span class="a-price-decimal">,</span></span><span class="a-price-fraction">{fraction}</span><span class="a-price-symbol">TL</span></span></span>
+    {strike}</a></div>
+  </div>
+</div>''')
+
+    return f'''<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8"><title>Amazon.com.tr : {keyword}</title></head>
+<body>{page_noise(rng, 60)}
+<div class="s-main-slot s-result-list">{''.join(items)}</div></body></html>'''
+
+
+def generate(root: str, seed: int = 2024):
+    """Trendyol, Hepsiburada ve Amazon liste sayfası fixture'larını üret"""
+    rng = random.Random(seed)
+    store = FixtureStore(root)
+
+    for page in (1, 2):
+        store.put(f"https://www.trendyol.com/sr?pi={page}&sst=DISCOUNTED", 'trendyol',
+                  trendyol_page(rng, page).encode('utf-8'), name=f'page_{page}.html')
+
+    store.put("https://www.hepsiburada.com/kampanyalar", 'hepsiburada',
+              hepsiburada_page(rng, 1).encode('utf-8'), name='page_1.html')
+    store.put("https://www.hepsiburada.com/kampanyalar?sayfa=2", 'hepsiburada',
+              hepsiburada_page(rng, 2).encode('utf-8'), name='page_2.html')
+
+    amazon = AmazonScraper()
+    amazon.categories = AMAZON_CATEGORIES
+    amazon.deal_discount = 40
+    for listing in amazon.listing_pages(AMAZON_PAGES):
+        store.put(amazon.page_url(listing), 'amazon', amazon_page(rng, listing.query).encode('utf-8'),
+                  name=f"{listing.category.lower()}_page_{listing.number}.html")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Sentetik liste sayfası fixture\'ları üret')
+    parser.add_argument('--root', default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+    generate(args.root, args.seed)
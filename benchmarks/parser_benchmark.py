@@ -0,0 +1,120 @@
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.replay import FixtureStore, ReplaySession, DEFAULT_FIXTURE_DIR
+from scrapers.html_parser import available_backends
+from scrapers.trendyol_scraper import TrendyolScraper
+from scrapers.hepsiburada_scraper import HepsiburadaScraper
+from scrapers.amazon_scraper import AmazonScraper
+from benchmarks.make_fixtures import AMAZON_CATEGORIES, AMAZON_PAGES
+from benchmarks.report import summarize, build_report, write_report, compare_reports, print_comparison
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def measure(name: str, run_page: Callable[[], List[Dict]], iterations: int, pages: int = 1) -> Dict:
+    """Ölçümü `iterations` kez çalıştır (her çalıştırma `pages` sayfa); sayfa/sn ve ürün/dk hesapla"""
+    run_page()  # ısınma
+
+    durations = []
+    products = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        products += len(run_page())
+        durations.append(time.perf_counter() - start)
+
+    total = sum(durations)
+    result = summarize(durations)
+    result['pages_per_sec'] = round(iterations * pages / total, 2) if total else 0
+    result['products_per_sec'] = round(products / total, 2) if total else 0
+    result['products_per_min'] = round(products * 60 / total, 1) if total else 0
+    result['products_per_page'] = round(products / (iterations * pages), 2)
+    logger.info("📄 %s: %s sayfa/sn, %s ürün/dk", name, result['pages_per_sec'], result['products_per_min'])
+    return result
+
+
+def site_cases(store: FixtureStore, backend: str,
+               mode: str = 'auto') -> Dict[str, Tuple[Callable[[], List[Dict]], int]]:
+    """Replay transport ile çalışan scraper çağrıları ve her çağrının sayfa sayısı
+
+    mode: 'auto' (gömülü JSON state, yoksa DOM) veya 'dom' (sadece selector'lar)
+    """
+    cases = {}
+
+    for scraper_cls, pages in [(TrendyolScraper, (1, 2)), (HepsiburadaScraper, (1, 2))]:
+        scraper = scraper_cls()
+        ReplaySession(store).attach(scraper)
+        scraper.parser_backend = backend
+        scraper.extraction_mode = mode
+
+        for page in pages:
+            def run(scraper=scraper, page=page):
+                scraper.dedupe.reset()
+                return scraper.scrape_page(page)
+            cases[f"{scraper_cls.__name__}.scrape_page[{page}]@{backend}:{mode}"] = (run, 1)
+
+    # Amazon: fixture kategorilerinin tüm fırsat sayfaları tek tarama olarak
+    amazon = AmazonScraper()
+    ReplaySession(store).attach(amazon)
+    amazon.parser_backend = backend
+    amazon.categories = AMAZON_CATEGORIES
+    amazon.deal_discount = 40
+    listings = amazon.listing_pages(AMAZON_PAGES)
+
+    def crawl():
+        amazon.dedupe.reset()
+        return [product for listing in listings for product in amazon.scrape_page(listing)]
+    cases[f"AmazonScraper.crawl[{len(listings)}]@{backend}"] = (crawl, len(listings))
+
+    return cases
+
+
+def run_benchmarks(store: FixtureStore, iterations: int, backends: List[str],
+                   modes: List[str], only: str = None) -> Dict:
+    results = {}
+    for backend in backends:
+        for mode in modes:
+            for name, (run_page, pages) in site_cases(store, backend, mode).items():
+                # Amazon çıkarım modundan bağımsız; bir kez ölçülür
+                if name in results or (only and only.lower() not in name.lower()):
+                    continue
+                results[name] = measure(name, run_page, iterations, pages)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fixture sayfaları üzerinde parser benchmark\'ı')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--only', help='Sadece adı bu metni içeren ölçümler')
+    parser.add_argument('--parsers', default=','.join(available_backends()),
+                        help='Virgülle ayrılmış HTML parser backend\'leri')
+    parser.add_argument('--modes', default='auto,dom',
+                        help='Virgülle ayrılmış çıkarım modları (auto: gömülü JSON state, dom: selector\'lar)')
+    parser.add_argument('--output', help='JSON rapor dosyası (varsayılan: stdout)')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON rapor')
+    args = parser.parse_args()
+
+    store = FixtureStore(args.fixtures)
+    backends = args.parsers.split(',')
+    modes = args.modes.split(',')
+    results = run_benchmarks(store, args.iterations, backends, modes, args.only)
+
+    report = build_report('parser', {
+        'iterations': args.iterations,
+        'parsers': backends,
+        'modes': modes,
+        'fixtures': sorted(store.urls())
+    }, results)
+    write_report(report, args.output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(compare_reports(json.load(f), report))
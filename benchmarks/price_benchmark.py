@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import random
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.price_parser import parse_price, parse_prices, MIN_PRICE, MAX_PRICE
+from benchmarks.make_fixtures import tr_price
+from benchmarks.report import time_call, build_report, write_report, compare_reports, print_comparison
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def en_price(value: float) -> str:
+    """1299.99 → '1,299.99'"""
+    return f"{value:,.2f}"
+
+
+def spaced_price(value: float, space: str = ' ') -> str:
+    """1299.99 → '1 299,99' (boşluk binlik ayırıcı)"""
+    return tr_price(value).replace('.', space)
+
+
+# Her biçim (ad, değer → metin, metinden beklenen değer); beklenen değer özellik kontrolüdür
+FORMATS: List[Tuple[str, Callable[[float], str], Callable[[float], float]]] = [
+    ('tr', lambda v: f"{tr_price(v)} TL", lambda v: v),
+    ('tr_symbol', lambda v: f"₺{tr_price(v)}", lambda v: v),
+    ('tr_whole', lambda v: f"{tr_price(v).split(',')[0]} TL", lambda v: float(int(v))),
+    ('tr_no_thousands', lambda v: f"{v:.2f}".replace('.', ',') + ' ₺', lambda v: v),
+    ('amazon_whole', lambda v: f"{tr_price(v).split(',')[0]},", lambda v: float(int(v))),
+    ('en', lambda v: f"{en_price(v)} TL", lambda v: v),
+    ('spaced', lambda v: f"{spaced_price(v)} TL", lambda v: v),
+    ('one_decimal', lambda v: f"{tr_price(v)[:-1]} TL", lambda v: float(tr_price(v)[:-1].replace('.', '').replace(',', '.'))),
+    ('range', lambda v: f"{tr_price(v)} - {tr_price(v * 1.5)} TL", lambda v: v),
+    ('with_percent', lambda v: f"%40 {tr_price(v)} TL", lambda v: v),
+]
+
+
+def corpus(count: int, seed: int) -> List[Tuple[str, str, float]]:
+    """Rastgele fiyatların tüm biçimlerdeki metinleri: (biçim, metin, beklenen)"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        # Küçük ve büyük fiyatlar eşit ağırlıkta (binlik ayırıcılı/ayırıcısız)
+        value = round(10 ** rng.uniform(0, 5.5), 2)
+        for name, render, expected in FORMATS:
+            samples.append((name, render(value), expected(value)))
+    return samples
+
+
+def check(samples: List[Tuple[str, str, float]]) -> Dict[str, Dict]:
+    """Her biçim için yanlış parse edilen metinleri say"""
+    results = {}
+    for name, text, expected in samples:
+        row = results.setdefault(name, {'samples': 0, 'mismatches': 0, 'examples': []})
+        row['samples'] += 1
+        want = expected if MIN_PRICE <= expected <= MAX_PRICE else None
+        got = parse_price(text)
+        if got != want and not (got is not None and want is not None and abs(got - want) < 0.005):
+            row['mismatches'] += 1
+            if len(row['examples']) < 5:
+                row['examples'].append({'text': text, 'expected': want, 'got': got})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fiyat parser doğruluk ve hız ölçümü')
+    parser.add_argument('--count', type=int, default=5000, help='Biçim başına rastgele fiyat sayısı')
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='JSON rapor dosyası (varsayılan: stdout)')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON rapor')
+    args = parser.parse_args()
+
+    samples = corpus(args.count, args.seed)
+    texts = [text for _, text, _ in samples]
+    formats = check(samples)
+    mismatches = sum(row['mismatches'] for row in formats.values())
+
+    results = {
+        'parse_price[tek tek]': time_call(lambda: [parse_price(text) for text in texts], args.repeat),
+        'parse_prices[memo]': time_call(lambda: parse_prices(texts), args.repeat),
+    }
+    for name, result in results.items():
+        result['prices_per_sec'] = round(len(texts) / (result['p50_ms'] / 1000)) if result['p50_ms'] else 0
+        logger.info("💱 %s: %s fiyat/sn", name, result['prices_per_sec'])
+
+    report = build_report('price', {'count': args.count, 'seed': args.seed, 'samples': len(samples)}, results)
+    report['formats'] = formats
+    report['mismatches'] = mismatches
+    write_report(report, args.output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print_comparison(compare_reports(json.load(f), report))
+
+    if mismatches:
+        logger.error("❌ %s fiyat metni yanlış parse edildi", mismatches)
+        sys.exit(1)
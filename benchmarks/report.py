@@ -0,0 +1,107 @@
+import json
+import math
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+
+def current_commit() -> str:
+    """Çalışılan git commit'ini döndür (git yoksa 'unknown')"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or 'unknown'
+    except Exception:
+        return 'unknown'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Sıralı olmayan listeden yüzdelik değer (en yakın sıra yöntemi)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(durations: List[float]) -> Dict:
+    """Süre listesinden özet istatistik (milisaniye)"""
+    ms = [d * 1000 for d in durations]
+    return {
+        'runs': len(ms),
+        'min_ms': round(min(ms), 3),
+        'mean_ms': round(statistics.mean(ms), 3),
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p95_ms': round(percentile(ms, 95), 3),
+        'max_ms': round(max(ms), 3)
+    }
+
+
+def time_call(func: Callable, repeat: int = 5, warmup: int = 1) -> Dict:
+    """Fonksiyonu `repeat` kez çalıştırıp süre özetini döndür"""
+    for _ in range(warmup):
+        func()
+
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+
+    summary = summarize(durations)
+    if isinstance(result, (list, tuple, set, dict)):
+        summary['result_size'] = len(result)
+    elif isinstance(result, (int, float)):
+        summary['result_value'] = result
+    return summary
+
+
+def build_report(suite: str, params: Dict, results: Dict) -> Dict:
+    """Makine tarafından okunabilir rapor"""
+    return {
+        'suite': suite,
+        'commit': current_commit(),
+        'generated_at': datetime.now().isoformat(),
+        'params': params,
+        'results': results
+    }
+
+
+def write_report(report: Dict, path: str = None):
+    """Raporu dosyaya ya da stdout'a JSON olarak yaz"""
+    text = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+def compare_reports(baseline: Dict, current: Dict, metric: str = 'p50_ms', threshold: float = 1.10) -> List[Dict]:
+    """İki raporu karşılaştır; `threshold` oranından fazla yavaşlayanları işaretle"""
+    rows = []
+    for name, result in current.get('results', {}).items():
+        old = baseline.get('results', {}).get(name)
+        if not old or metric not in old or metric not in result:
+            continue
+
+        ratio = result[metric] / old[metric] if old[metric] else 0
+        rows.append({
+            'name': name,
+            'baseline': old[metric],
+            'current': result[metric],
+            'ratio': round(ratio, 3),
+            'regression': ratio > threshold
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict], metric: str = 'p50_ms'):
+    """Karşılaştırma tablosunu yazdır"""
+    print(f"{'benchmark':<40} {'önce':>12} {'sonra':>12} {'oran':>8}")
+    for row in rows:
+        flag = '  ⚠️' if row['regression'] else ''
+        print(f"{row['name']:<40} {row['baseline']:>12.3f} {row['current']:>12.3f} {row['ratio']:>8.3f}{flag}")
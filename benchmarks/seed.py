@@ -0,0 +1,144 @@
+import os
+import sys
+import time
+import argparse
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+CATEGORIES = ['Bilgisayarlar', 'Elektronik', 'Ev & Mutfak', 'Spor', 'Oyun']
+ASIN_PREFIX = 'BM'
+TOKEN_PREFIX = 'benchtoken'
+
+# Varsayılan hacimler (CLI ile değiştirilebilir)
+DEFAULT_VOLUMES = {
+    'products': 100_000,
+    'price_history': 50_000_000,
+    'device_tokens': 100_000
+}
+
+HISTORY_CHUNK = 1_000_000
+
+
+def bench_asin(index: int) -> str:
+    """Sentetik ürün için deterministik ASIN (1 tabanlı)"""
+    return f"{ASIN_PREFIX}{index:08d}"
+
+
+def use_bench_database(database_url: str = None) -> str:
+    """Benchmark veritabanını DATABASE_URL olarak ayarla
+
+    Seed işlemi tabloları boşalttığı için yalnızca açıkça verilen
+    BENCH_DATABASE_URL (veya --database-url) kullanılır.
+    """
+    url = database_url or os.environ.get('BENCH_DATABASE_URL')
+    if not url:
+        raise ValueError("BENCH_DATABASE_URL environment variable (veya --database-url) gerekli")
+    os.environ['DATABASE_URL'] = url
+    return url
+
+
+def seed(db, volumes: Dict, reset: bool = True):
+    """Benchmark tablolarını sentetik veriyle doldur (sunucu tarafında generate_series ile)"""
+    products = volumes['products']
+    history = volumes['price_history']
+    tokens = volumes['device_tokens']
+
+    cursor = db.conn.cursor()
+    try:
+        if reset:
+            cursor.execute("TRUNCATE price_history, products, user_preferences RESTART IDENTITY CASCADE")
+
+        start = time.time()
+        # Ürünlerin ~%30'u %70+ indirimli, %5'i son 1 saatte bulunmuş, %10'u 30 günden eski
+        cursor.execute("""
+            INSERT INTO products (asin, title, current_price, list_price, discount_percent,
+                                  image_url, product_url, category, first_seen, last_updated, last_seen)
+            SELECT %s || lpad(g::text, 8, '0'),
+                   'Benchmark ürünü ' || g,
+                   round((lp * (100 - d) / 100.0)::numeric, 2),
+                   round(lp::numeric, 2),
+                   d,
+                   'https://example.com/img/' || g || '.jpg',
+                   'https://example.com/p/' || g,
+                   (%s::text[])[1 + (g %% %s)],
+                   CASE WHEN g %% 20 = 0 THEN now() - random() * interval '1 hour'
+                        ELSE now() - random() * interval '60 days' END,
+                   CASE WHEN g %% 10 = 0 THEN now() - interval '31 days' - random() * interval '30 days'
+                        ELSE now() - random() * interval '29 days' END,
+                   NULL  -- last_seen yok: cleanup last_updated kullanır
+            FROM (
+                SELECT g,
+                       20 + random() * 5000 AS lp,
+                       CASE WHEN random() < 0.3 THEN 70 + floor(random() * 25)::int
+                            ELSE floor(random() * 70)::int END AS d
+                FROM generate_series(1, %s) AS g
+            ) src
+        """, (ASIN_PREFIX, CATEGORIES, len(CATEGORIES), products))
+        logger.info("🌱 %s ürün eklendi (%.1fs)", products, time.time() - start)
+
+        start = time.time()
+        inserted = 0
+        while inserted < history:
+            chunk = min(HISTORY_CHUNK, history - inserted)
+            cursor.execute("""
+                INSERT INTO price_history (asin, price, recorded_at)
+                SELECT %s || lpad((1 + ((g + %s) %% %s))::text, 8, '0'),
+                       round((10 + random() * 5000)::numeric, 2),
+                       now() - random() * interval '120 days'
+                FROM generate_series(1, %s) AS g
+            """, (ASIN_PREFIX, inserted, products, chunk))
+            inserted += chunk
+            logger.info("🌱 price_history: %s/%s", inserted, history)
+        logger.info("🌱 %s fiyat kaydı eklendi (%.1fs)", history, time.time() - start)
+
+        start = time.time()
+        cursor.execute("""
+            INSERT INTO user_preferences (device_token, min_discount, categories, min_price, max_price)
+            SELECT %s || g,
+                   50 + (g %% 40),
+                   to_jsonb(ARRAY[(%s::text[])[1 + (g %% %s)]]),
+                   10.00,
+                   10000.00
+            FROM generate_series(1, %s) AS g
+        """, (TOKEN_PREFIX, CATEGORIES, len(CATEGORIES), tokens))
+        logger.info("🌱 %s cihaz token'ı eklendi (%.1fs)", tokens, time.time() - start)
+
+        cursor.execute("ANALYZE products")
+        cursor.execute("ANALYZE price_history")
+        cursor.execute("ANALYZE user_preferences")
+    finally:
+        cursor.close()
+
+
+def add_volume_arguments(parser: argparse.ArgumentParser):
+    """Seed hacmi ve veritabanı argümanlarını ekle"""
+    parser.add_argument('--database-url', help='Benchmark veritabanı (varsayılan: BENCH_DATABASE_URL)')
+    parser.add_argument('--products', type=int, default=DEFAULT_VOLUMES['products'])
+    parser.add_argument('--price-history', type=int, default=DEFAULT_VOLUMES['price_history'])
+    parser.add_argument('--device-tokens', type=int, default=DEFAULT_VOLUMES['device_tokens'])
+
+
+def volumes_from_args(args) -> Dict:
+    return {
+        'products': args.products,
+        'price_history': args.price_history,
+        'device_tokens': args.device_tokens
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark veritabanını sentetik veriyle doldur')
+    add_volume_arguments(parser)
+    args = parser.parse_args()
+
+    use_bench_database(args.database_url)
+    from database import Database
+
+    db = Database()
+    seed(db, volumes_from_args(args))
+    db.close()
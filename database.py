@@ -5,12 +5,15 @@ from datetime import datetime, timedelta
 import json
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
+from logger import get_logger
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
 class Database:
-    def __init__(self):
-        self.database_url = os.environ.get("DATABASE_URL")
+    def __init__(self, database_url: str = None):
+        self.database_url = database_url or os.environ.get("DATABASE_URL")
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
         
@@ -23,9 +26,9 @@ class Database:
         try:
             self.conn = psycopg2.connect(self.database_url)
             self.conn.autocommit = True
-            print("PostgreSQL veritabanına başarıyla bağlanıldı")
+            logger.info("PostgreSQL veritabanına başarıyla bağlanıldı")
         except Exception as e:
-            print(f"Veritabanı bağlantı hatası: {e}")
+            logger.error("Veritabanı bağlantı hatası: %s", e)
             raise
     
     def create_tables(self):
@@ -46,10 +49,41 @@ class Database:
                     product_url TEXT NOT NULL,
                     category VARCHAR(100) NOT NULL,
                     first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    fingerprint VARCHAR(32),
+                    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    site VARCHAR(30)
                 )
             """)
             
+            # Artımlı tarama kolonları (eski kurulumlar için; mevcut satırlarda last_seen NULL kalır)
+            cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(32)")
+            cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS last_seen TIMESTAMP")
+            cursor.execute("ALTER TABLE products ALTER COLUMN last_seen SET DEFAULT CURRENT_TIMESTAMP")
+            
+            # Detay sayfası zenginleştirme kolonları (bkz. scrapers/enrichment.py)
+            cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS category_path TEXT")
+            cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS seller VARCHAR(200)")
+            cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS in_stock BOOLEAN")
+            cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS reference_price DECIMAL(10,2)")
+            cursor.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS enriched_at TIMESTAMP")
+            
+            # Site kolonu (eski kurulumlarda bir kez eklenir ve URL'den doldurulur)
+            cursor.execute("""
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'products' AND column_name = 'site'
+            """)
+            if not cursor.fetchone():
+                cursor.execute("ALTER TABLE products ADD COLUMN site VARCHAR(30)")
+                cursor.execute("""
+                    UPDATE products SET site = CASE
+                        WHEN product_url LIKE '%trendyol.com%' THEN 'trendyol'
+                        WHEN product_url LIKE '%hepsiburada.com%' THEN 'hepsiburada'
+                        WHEN product_url LIKE '%amazon.com.tr%' THEN 'amazon'
+                    END
+                """)
+                logger.info("products.site kolonu eklendi, %s satır dolduruldu", cursor.rowcount)
+            
             # Price history tablosu
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS price_history (
@@ -79,13 +113,14 @@ class Database:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_asin ON products(asin)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_discount ON products(discount_percent)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_category ON products(category)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_site ON products(site)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_history_asin ON price_history(asin)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_history_date ON price_history(recorded_at)")
             
-            print("Veritabanı tabloları başarıyla oluşturuldu")
+            logger.info("Veritabanı tabloları başarıyla oluşturuldu")
             
         except Exception as e:
-            print(f"Tablo oluşturma hatası: {e}")
+            logger.error("Tablo oluşturma hatası: %s", e)
             raise
         finally:
             cursor.close()
@@ -109,8 +144,11 @@ class Database:
                         discount_percent = %s,
                         image_url = %s,
                         product_url = %s,
-                        category = %s,
-                        last_updated = CURRENT_TIMESTAMP
+                        category = CASE WHEN category_path IS NULL THEN %s ELSE category END,
+                        fingerprint = %s,
+                        site = COALESCE(%s, site),
+                        last_updated = CURRENT_TIMESTAMP,
+                        last_seen = CURRENT_TIMESTAMP
                     WHERE asin = %s
                 """, (
                     product_data['title'],
@@ -120,15 +158,17 @@ class Database:
                     product_data['image_url'],
                     product_data['product_url'],
                     product_data['category'],
+                    product_data.get('fingerprint'),
+                    product_data.get('site'),
                     product_data['asin']
                 ))
-                print(f"Ürün güncellendi: {product_data['asin']}")
+                logger.debug("Ürün güncellendi: %s", product_data['asin'])
             else:
                 # Yeni ürün ekle
                 cursor.execute("""
                     INSERT INTO products (asin, title, current_price, list_price, 
-                                        discount_percent, image_url, product_url, category)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                                        discount_percent, image_url, product_url, category, fingerprint, site)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """, (
                     product_data['asin'],
                     product_data['title'],
@@ -137,18 +177,138 @@ class Database:
                     product_data['discount_percent'],
                     product_data['image_url'],
                     product_data['product_url'],
-                    product_data['category']
+                    product_data['category'],
+                    product_data.get('fingerprint'),
+                    product_data.get('site')
                 ))
-                print(f"Yeni ürün eklendi: {product_data['asin']}")
+                logger.debug("Yeni ürün eklendi: %s", product_data['asin'])
             
             return True
             
         except Exception as e:
-            print(f"Ürün ekleme/güncelleme hatası: {e}")
+            logger.error("Ürün ekleme/güncelleme hatası: %s", e)
             return False
         finally:
             cursor.close()
     
+    def save_products_batch(self, products: List[Dict], page_size: int = 500) -> int:
+        """Ürünleri tek upsert ile yaz ve fiyat geçmişlerini toplu ekle"""
+        if not products:
+            return 0
+        
+        cursor = self.conn.cursor()
+        
+        try:
+            # Aynı ID iki kez gelirse ON CONFLICT aynı satırı iki kez güncelleyemez
+            unique = {product['asin']: product for product in products}
+            rows = [(
+                p['asin'], p['title'], p['current_price'], p['list_price'], p['discount_percent'],
+                p['image_url'], p['product_url'], p['category'], p.get('fingerprint'), p.get('site')
+            ) for p in unique.values()]
+            
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO products (asin, title, current_price, list_price, discount_percent,
+                                      image_url, product_url, category, fingerprint, site)
+                VALUES %s
+                ON CONFLICT (asin) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    current_price = EXCLUDED.current_price,
+                    list_price = EXCLUDED.list_price,
+                    discount_percent = EXCLUDED.discount_percent,
+                    image_url = EXCLUDED.image_url,
+                    product_url = EXCLUDED.product_url,
+                    -- Detay sayfasından zenginleştirilen kategori liste kartının varsayılanıyla ezilmez
+                    category = CASE WHEN products.category_path IS NULL THEN EXCLUDED.category ELSE products.category END,
+                    fingerprint = EXCLUDED.fingerprint,
+                    site = COALESCE(EXCLUDED.site, products.site),
+                    last_updated = CURRENT_TIMESTAMP,
+                    last_seen = CURRENT_TIMESTAMP
+            """, rows, page_size=page_size)
+            
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO price_history (asin, price) VALUES %s
+            """, [(p['asin'], p['current_price']) for p in unique.values()], page_size=page_size)
+            
+            return len(rows)
+            
+        except Exception as e:
+            logger.error("Toplu ürün kaydetme hatası: %s", e)
+            return 0
+        finally:
+            cursor.close()
+    
+    def touch_products(self, asins: List[str]) -> int:
+        """Değişmeden görülen ürünlerin sadece last_seen'ini güncelle"""
+        if not asins:
+            return 0
+        
+        cursor = self.conn.cursor()
+        
+        try:
+            cursor.execute("""
+                UPDATE products SET last_seen = CURRENT_TIMESTAMP
+                WHERE asin = ANY(%s)
+            """, (list(asins),))
+            
+            return cursor.rowcount
+            
+        except Exception as e:
+            logger.error("last_seen güncelleme hatası: %s", e)
+            return 0
+        finally:
+            cursor.close()
+    
+    def save_enrichments_batch(self, rows: List[Dict], page_size: int = 500) -> int:
+        """Detay sayfası bilgilerini toplu yaz (None alanlar mevcut değeri korur)
+        
+        rows: asin, category (sadece varsayılan kategori değişecekse), category_path,
+        seller, in_stock, reference_price
+        """
+        if not rows:
+            return 0
+        
+        cursor = self.conn.cursor()
+        
+        try:
+            unique = {row['asin']: row for row in rows}
+            psycopg2.extras.execute_values(cursor, """
+                UPDATE products AS p SET
+                    category = COALESCE(v.category, p.category),
+                    category_path = COALESCE(v.category_path, p.category_path),
+                    seller = COALESCE(v.seller, p.seller),
+                    in_stock = COALESCE(v.in_stock, p.in_stock),
+                    reference_price = COALESCE(v.reference_price, p.reference_price),
+                    enriched_at = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS v(asin, category, category_path, seller, in_stock, reference_price)
+                WHERE p.asin = v.asin
+            """, [(
+                r['asin'], r.get('category'), r.get('category_path'), r.get('seller'),
+                r.get('in_stock'), r.get('reference_price')
+            ) for r in unique.values()],
+                template='(%s, %s, %s, %s, %s::boolean, %s::numeric)', page_size=page_size)
+            
+            return len(unique)
+            
+        except Exception as e:
+            logger.error("Toplu zenginleştirme kaydetme hatası: %s", e)
+            return 0
+        finally:
+            cursor.close()
+    
+    def get_fingerprints(self) -> Dict[str, str]:
+        """Ürün ID → son kaydedilen fingerprint"""
+        cursor = self.conn.cursor()
+        
+        try:
+            cursor.execute("SELECT asin, fingerprint FROM products WHERE fingerprint IS NOT NULL")
+            return dict(cursor.fetchall())
+            
+        except Exception as e:
+            logger.error("Fingerprint getirme hatası: %s", e)
+            return {}
+        finally:
+            cursor.close()
+    
     def add_price_history(self, asin: str, price: float) -> bool:
         """Fiyat geçmişine yeni kayıt ekle"""
         cursor = self.conn.cursor()
@@ -162,7 +322,7 @@ class Database:
             return True
             
         except Exception as e:
-            print(f"Fiyat geçmişi ekleme hatası: {e}")
+            logger.error("Fiyat geçmişi ekleme hatası: %s", e)
             return False
         finally:
             cursor.close()
@@ -182,7 +342,60 @@ class Database:
             return [dict(row) for row in cursor.fetchall()]
             
         except Exception as e:
-            print(f"Fiyat geçmişi getirme hatası: {e}")
+            logger.error("Fiyat geçmişi getirme hatası: %s", e)
+            return []
+        finally:
+            cursor.close()
+    
+    def get_price_histories(self, asins: List[str], days: int = 30) -> Dict[str, List[Dict]]:
+        """Birden çok ürünün son X günlük fiyat geçmişi tek sorguda (ASIN → kayıtlar)"""
+        if not asins:
+            return {}
+        
+        cursor = self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        
+        try:
+            cursor.execute("""
+                SELECT asin, price, recorded_at
+                FROM price_history
+                WHERE asin = ANY(%s) AND recorded_at >= %s
+                ORDER BY asin, recorded_at ASC
+            """, (list(asins), datetime.now() - timedelta(days=days)))
+            
+            histories = {}
+            for row in cursor.fetchall():
+                histories.setdefault(row['asin'], []).append({'price': row['price'], 'recorded_at': row['recorded_at']})
+            return histories
+            
+        except Exception as e:
+            logger.error("Toplu fiyat geçmişi getirme hatası: %s", e)
+            return {}
+        finally:
+            cursor.close()
+    
+    def get_recrawl_candidates(self, sites: List[str] = None, seen_within_days: int = 7) -> List[Dict]:
+        """Detay sayfasından yeniden taranabilecek ürünler (site ve URL'i bilinen, yakın zamanda görülmüş)"""
+        cursor = self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        
+        try:
+            query = """
+                SELECT asin, site, title, current_price, list_price, discount_percent,
+                       image_url, product_url, category, first_seen,
+                       COALESCE(last_seen, last_updated) AS last_seen
+                FROM products
+                WHERE site IS NOT NULL AND product_url IS NOT NULL AND product_url <> ''
+                  AND COALESCE(last_seen, last_updated) >= %s
+            """
+            params = [datetime.now() - timedelta(days=seen_within_days)]
+            if sites:
+                query += " AND site = ANY(%s)"
+                params.append(list(sites))
+            
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            logger.error("Yeniden tarama adayları getirme hatası: %s", e)
             return []
         finally:
             cursor.close()
@@ -233,7 +446,7 @@ class Database:
             return False
             
         except Exception as e:
-            print(f"Sahte indirim tespiti hatası: {e}")
+            logger.error("Sahte indirim tespiti hatası: %s", e)
             return False
         finally:
             cursor.close()
@@ -267,11 +480,40 @@ class Database:
             return real_deals
             
         except Exception as e:
-            print(f"Fırsatları getirme hatası: {e}")
+            logger.error("Fırsatları getirme hatası: %s", e)
             return []
         finally:
             cursor.close()
     
+    def get_site_statistics(self, min_discount: int = 40) -> Dict[str, Dict]:
+        """Site bazında fırsat sayısı, en yüksek/ortalama indirim ve toplam tasarruf"""
+        cursor = self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        
+        try:
+            cursor.execute("""
+                SELECT COALESCE(site, 'other') AS site,
+                       COUNT(*) AS deals,
+                       MAX(discount_percent) AS best_discount,
+                       AVG(discount_percent) AS average_discount,
+                       SUM(list_price - current_price) AS total_savings
+                FROM products
+                WHERE discount_percent >= %s
+                GROUP BY COALESCE(site, 'other')
+            """, (min_discount,))
+            
+            return {row['site']: {
+                'deals': row['deals'],
+                'best_discount': row['best_discount'] or 0,
+                'average_discount': float(row['average_discount'] or 0),
+                'total_savings': float(row['total_savings'] or 0)
+            } for row in cursor.fetchall()}
+            
+        except Exception as e:
+            logger.error("Site istatistikleri hatası: %s", e)
+            return {}
+        finally:
+            cursor.close()
+    
     def get_new_deals(self, hours: int = 1) -> List[Dict]:
         """Son X saatte bulunan yeni fırsatlar"""
         cursor = self.conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
@@ -294,7 +536,7 @@ class Database:
             return real_deals
             
         except Exception as e:
-            print(f"Yeni fırsatları getirme hatası: {e}")
+            logger.error("Yeni fırsatları getirme hatası: %s", e)
             return []
         finally:
             cursor.close()
@@ -350,7 +592,7 @@ class Database:
             return True
             
         except Exception as e:
-            print(f"Device token kaydetme hatası: {e}")
+            logger.error("Device token kaydetme hatası: %s", e)
             return False
         finally:
             cursor.close()
@@ -365,13 +607,104 @@ class Database:
             return tokens
             
         except Exception as e:
-            print(f"Device token'ları getirme hatası: {e}")
+            logger.error("Device token'ları getirme hatası: %s", e)
             return []
         finally:
             cursor.close()
     
+    def cleanup_stale_products(self, days: int = 30) -> int:
+        """X günden uzun süredir taramada görülmeyen ürünleri sil"""
+        cursor = self.conn.cursor()
+        
+        try:
+            # Değişmeyen ürünler sadece last_seen alır; last_updated eski kalabilir
+            cursor.execute("""
+                DELETE FROM products 
+                WHERE COALESCE(last_seen, last_updated) < %s
+            """, (datetime.now() - timedelta(days=days),))
+            
+            return cursor.rowcount
+            
+        except Exception as e:
+            logger.error("Eski ürünleri silme hatası: %s", e)
+            return 0
+        finally:
+            cursor.close()
+    
+    def merge_product_ids(self, id_map: Dict[str, str]) -> Dict[str, int]:
+        """Ürünleri eski ID'lerden yeni ID'lere taşı, aynı ID'ye düşen kopyaları birleştir
+        
+        Her yeni ID için en son güncellenen satır kalır (last_updated'i boş
+        satırlar en sona; first_seen en eskisi olur); fiyat geçmişi yeni ID'ye aktarılır. Tek transaction'da çalışır.
+        """
+        id_map = {old: new for old, new in id_map.items() if old != new}
+        if not id_map:
+            return {'mapped': 0, 'merged': 0, 'history_moved': 0}
+        
+        cursor = self.conn.cursor()
+        self.conn.autocommit = False
+        
+        try:
+            cursor.execute("CREATE TEMP TABLE id_map (old_asin VARCHAR(20) PRIMARY KEY, new_asin VARCHAR(20) NOT NULL) ON COMMIT DROP")
+            psycopg2.extras.execute_values(cursor, "INSERT INTO id_map (old_asin, new_asin) VALUES %s", list(id_map.items()))
+            
+            # Yeni ID başına en güncel satırı (mevcut yeni satır dahil) yaz
+            cursor.execute("""
+                INSERT INTO products (asin, title, current_price, list_price, discount_percent,
+                                      image_url, product_url, category, site, first_seen, last_updated)
+                SELECT DISTINCT ON (m.new_asin)
+                       m.new_asin, p.title, p.current_price, p.list_price, p.discount_percent,
+                       p.image_url, p.product_url, p.category, p.site,
+                       MIN(p.first_seen) OVER (PARTITION BY m.new_asin), p.last_updated
+                FROM id_map m
+                JOIN products p ON p.asin = m.old_asin
+                ORDER BY m.new_asin, p.last_updated DESC NULLS LAST
+                ON CONFLICT (asin) DO UPDATE SET
+                    title = CASE WHEN EXCLUDED.last_updated > products.last_updated OR products.last_updated IS NULL THEN EXCLUDED.title ELSE products.title END,
+                    current_price = CASE WHEN EXCLUDED.last_updated > products.last_updated OR products.last_updated IS NULL THEN EXCLUDED.current_price ELSE products.current_price END,
+                    list_price = CASE WHEN EXCLUDED.last_updated > products.last_updated OR products.last_updated IS NULL THEN EXCLUDED.list_price ELSE products.list_price END,
+                    discount_percent = CASE WHEN EXCLUDED.last_updated > products.last_updated OR products.last_updated IS NULL THEN EXCLUDED.discount_percent ELSE products.discount_percent END,
+                    image_url = CASE WHEN EXCLUDED.last_updated > products.last_updated OR products.last_updated IS NULL THEN EXCLUDED.image_url ELSE products.image_url END,
+                    product_url = CASE WHEN EXCLUDED.last_updated > products.last_updated OR products.last_updated IS NULL THEN EXCLUDED.product_url ELSE products.product_url END,
+                    category = CASE WHEN EXCLUDED.last_updated > products.last_updated OR products.last_updated IS NULL THEN EXCLUDED.category ELSE products.category END,
+                    site = COALESCE(products.site, EXCLUDED.site),
+                    first_seen = LEAST(products.first_seen, EXCLUDED.first_seen),
+                    last_updated = GREATEST(products.last_updated, EXCLUDED.last_updated)
+                RETURNING (xmax = 0) AS inserted
+            """)
+            # Yeni ID zaten bir satırdaysa (güncellendiyse) o satır da birleşmeye katılmıştır
+            upserted = [row[0] for row in cursor.fetchall()]
+            mapped, inserted = len(upserted), sum(upserted)
+            
+            cursor.execute("""
+                UPDATE price_history h SET asin = m.new_asin
+                FROM id_map m
+                WHERE h.asin = m.old_asin
+            """)
+            history_moved = cursor.rowcount
+            
+            cursor.execute("""
+                DELETE FROM products p USING id_map m
+                WHERE p.asin = m.old_asin
+                  AND p.asin NOT IN (SELECT new_asin FROM id_map)
+            """)
+            merged = cursor.rowcount - inserted
+            
+            self.conn.commit()
+            logger.info("ID birleştirme: %s yeni ID, %s kopya birleştirildi, %s fiyat kaydı taşındı",
+                        mapped, max(merged, 0), history_moved)
+            return {'mapped': mapped, 'merged': max(merged, 0), 'history_moved': history_moved}
+        
+        except Exception as e:
+            self.conn.rollback()
+            logger.error("Ürün ID birleştirme hatası: %s", e)
+            raise
+        finally:
+            self.conn.autocommit = True
+            cursor.close()
+    
     def close(self):
         """Veritabanı bağlantısını kapat"""
         if self.conn:
             self.conn.close()
-            print("Veritabanı bağlantısı kapatıldı")
\ No newline at end of file
+            logger.info("Veritabanı bağlantısı kapatıldı")
\ No newline at end of file
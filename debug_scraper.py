@@ -3,6 +3,7 @@
 
 import requests
 from bs4 import BeautifulSoup
+from scrapers.block_detector import OK, classify_response
 
 def test_trendyol():
     """Test Trendyol response"""
@@ -43,9 +44,10 @@ def test_trendyol():
         if title:
             print(f"  Page title: {title.get_text()[:100]}...")
         
-        # Check for bot protection
-        if 'captcha' in response.text.lower() or 'robot' in response.text.lower():
-            print("  ⚠️ Possible bot protection detected")
+        # Check for bot protection (same classification the fetch layer uses)
+        verdict = classify_response(response.status_code, response.content, response.url, response.headers)
+        if verdict != OK:
+            print(f"  ⚠️ Bot protection / unusable page: {verdict}")
         
         print(f"  First 500 chars: {response.text[:500]}...")
         
@@ -92,9 +94,10 @@ def test_hepsiburada():
         if title:
             print(f"  Page title: {title.get_text()[:100]}...")
         
-        # Check for bot protection
-        if 'captcha' in response.text.lower() or 'robot' in response.text.lower():
-            print("  ⚠️ Possible bot protection detected")
+        # Check for bot protection (same classification the fetch layer uses)
+        verdict = classify_response(response.status_code, response.content, response.url, response.headers)
+        if verdict != OK:
+            print(f"  ⚠️ Bot protection / unusable page: {verdict}")
         
         print(f"  First 500 chars: {response.text[:500]}...")
         
@@ -0,0 +1,88 @@
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# LogRecord'un standart alanları; bunların dışındakiler `extra=` ile gelen yapısal alanlardır
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Log kayıtlarını tek satır JSON olarak biçimlendir"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+
+        # extra= ile verilen alanlar
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        elif record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Kaydı kuyruğa atan handler; stdout'a yazma işi dinleyici thread'inde yapılır"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Mesajı burada çöz ama JSON biçimlendirmesini dinleyiciye bırak
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = None, log_format: str = None):
+    """Kök logger'ı LOG_LEVEL/LOG_FORMAT'a göre kuyruk tabanlı handler ile yapılandır"""
+    global _listener
+
+    if _listener is not None:
+        return
+
+    level_name = (level or os.environ.get('LOG_LEVEL', 'INFO')).upper()
+    log_format = (log_format or os.environ.get('LOG_FORMAT', 'json')).lower()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if log_format == 'json':
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter('[%(asctime)s] [%(levelname)s] %(name)s: %(message)s',
+                                                      datefmt='%Y-%m-%d %H:%M:%S'))
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.handlers = [_NonBlockingQueueHandler(log_queue)]
+    root.setLevel(getattr(logging, level_name, logging.INFO))
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Modül logger'ını döndür (ilk çağrıda logging yapılandırılır)"""
+    setup_logging()
+    return logging.getLogger(name)
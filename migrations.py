@@ -0,0 +1,85 @@
+import re
+import argparse
+from typing import Dict
+from urllib.parse import urlsplit
+from database import Database
+from scrapers.product_ids import product_id
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# Kararlı ID'den önceki şemayla kaydedilmiş siteler (host → site adı): Trendyol/Hepsiburada
+# hash() ID'leri, Amazon öneksiz ASIN
+SCRAPED_HOSTS = {
+    'trendyol.com': 'Trendyol',
+    'hepsiburada.com': 'Hepsiburada',
+    'amazon.com.tr': 'Amazon',
+}
+AMAZON_ASIN = re.compile(r'[A-Z0-9]{10}')
+
+
+def site_for_url(product_url: str) -> str:
+    host = urlsplit(product_url).netloc.lower()
+    for domain, site_name in SCRAPED_HOSTS.items():
+        if host == domain or host.endswith('.' + domain):
+            return site_name
+    return None
+
+
+def stable_id(site_name: str, asin: str, product_url: str) -> str:
+    """Satırın kararlı ID'si; Amazon satırlarının ASIN'i linkte olmasa da korunur"""
+    if site_name == 'Amazon':
+        if AMAZON_ASIN.fullmatch(asin):
+            return product_id(site_name, product_url, asin)
+        if asin.startswith('AM') and AMAZON_ASIN.fullmatch(asin[2:]):
+            return asin
+    return product_id(site_name, product_url)
+
+
+def build_product_id_map(db: Database) -> Dict[str, str]:
+    """Mevcut satırlar için eski ID → kararlı ID eşlemesi"""
+    cursor = db.conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT asin, product_url FROM products
+            WHERE product_url LIKE '%%trendyol.com%%' OR product_url LIKE '%%hepsiburada.com%%'
+               OR product_url LIKE '%%amazon.com.tr%%'
+        """)
+        id_map = {}
+        for asin, product_url in cursor.fetchall():
+            site_name = site_for_url(product_url)
+            if site_name:
+                id_map[asin] = stable_id(site_name, asin, product_url)
+        return id_map
+    finally:
+        cursor.close()
+
+
+def migrate_product_ids(db: Database, dry_run: bool = False) -> Dict[str, int]:
+    """hash() ile üretilmiş Trendyol/Hepsiburada ID'lerini ve öneksiz Amazon ASIN'lerini kararlı ID'lere taşı
+
+    Aynı ürünün yeniden başlatmalarla oluşmuş kopyaları tek satırda
+    birleşir, fiyat geçmişleri yeni ID altında toplanır. Tekrar
+    çalıştırmak güvenlidir; taşınacak satır kalmadığında hiçbir şey yapmaz.
+    """
+    id_map = {old: new for old, new in build_product_id_map(db).items() if old != new}
+    logger.info("🔁 %s ürün %s kararlı ID'ye taşınacak", len(id_map), len(set(id_map.values())))
+
+    if dry_run or not id_map:
+        return {'mapped': len(set(id_map.values())), 'merged': 0, 'history_moved': 0}
+    return db.merge_product_ids(id_map)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Veritabanı veri migration\'ları')
+    parser.add_argument('migration', choices=['product-ids'])
+    parser.add_argument('--dry-run', action='store_true', help='Sadece kaç satırın etkileneceğini göster')
+    args = parser.parse_args()
+
+    db = Database()
+    try:
+        if args.migration == 'product-ids':
+            result = migrate_product_ids(db, args.dry_run)
+            logger.info("✅ Migration tamamlandı: %s", result)
+    finally:
+        db.close()
@@ -5,10 +5,13 @@ from typing import List, Dict, Optional
 from aioapns import APNs, NotificationRequest, PushType
 from datetime import datetime
 from database import Database
+from logger import get_logger
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
 class APNSNotifier:
     def __init__(self):
         self.key_id = os.environ.get('APNS_KEY_ID')
@@ -28,11 +31,11 @@ class APNSNotifier:
         """APNS client'ı başlat"""
         try:
             if not all([self.key_id, self.team_id]):
-                print("APNS yapılandırması eksik. Bildirimler devre dışı.")
+                logger.warning("APNS yapılandırması eksik. Bildirimler devre dışı.")
                 return
             
             if not os.path.exists(self.key_path):
-                print(f"APNS key dosyası bulunamadı: {self.key_path}")
+                logger.warning("APNS key dosyası bulunamadı: %s", self.key_path)
                 return
             
             self.apns_client = APNs(
@@ -43,10 +46,10 @@ class APNSNotifier:
                 use_alternative_port=False
             )
             
-            print(f"APNS client başlatıldı ({'Sandbox' if self.use_sandbox else 'Production'} modu)")
+            logger.info("APNS client başlatıldı (%s modu)", 'Sandbox' if self.use_sandbox else 'Production')
             
         except Exception as e:
-            print(f"APNS client başlatma hatası: {e}")
+            logger.error("APNS client başlatma hatası: %s", e)
             self.apns_client = None
     
     def create_deal_notification(self, product_data: Dict) -> Dict:
@@ -138,7 +141,7 @@ class APNSNotifier:
     async def send_notification_to_token(self, device_token: str, payload: Dict) -> bool:
         """Tek bir cihaza bildirim gönder"""
         if not self.apns_client:
-            print("APNS client mevcut değil")
+            logger.warning("APNS client mevcut değil")
             return False
         
         try:
@@ -149,11 +152,11 @@ class APNSNotifier:
             )
             
             await self.apns_client.send_notification(request)
-            print(f"✓ Bildirim gönderildi: {device_token[:10]}...")
+            logger.debug("✓ Bildirim gönderildi: %s...", device_token[:10])
             return True
             
         except Exception as e:
-            print(f"✗ Bildirim gönderme hatası ({device_token[:10]}...): {e}")
+            logger.error("✗ Bildirim gönderme hatası (%s...): %s", device_token[:10], e)
             return False
     
     async def send_deal_notification(self, product_data: Dict, device_tokens: List[str] = None) -> Dict:
@@ -195,7 +198,7 @@ class APNSNotifier:
         
         success = sent_count > 0
         
-        print(f"Bildirim özeti: {sent_count} başarılı, {failed_count} başarısız")
+        logger.info("Bildirim özeti: %s başarılı, %s başarısız", sent_count, failed_count)
         
         return {
             'success': success,
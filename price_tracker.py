@@ -2,6 +2,9 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
 import statistics
 from database import Database
+from logger import get_logger
+
+logger = get_logger(__name__)
 
 class PriceTracker:
     def __init__(self):
@@ -9,8 +12,15 @@ class PriceTracker:
     
     def analyze_price_pattern(self, asin: str, days: int = 30) -> Dict:
         """Fiyat desenini analiz et"""
-        price_history = self.db.get_price_history(asin, days)
-        
+        return self.summarize_price_history(self.db.get_price_history(asin, days))
+    
+    def analyze_price_patterns(self, asins: List[str], days: int = 30) -> Dict[str, Dict]:
+        """Birden çok ürünün fiyat deseni; geçmişler tek sorguda okunur (ASIN → analiz)"""
+        histories = self.db.get_price_histories(asins, days)
+        return {asin: self.summarize_price_history(histories.get(asin, [])) for asin in asins}
+    
+    def summarize_price_history(self, price_history: List[Dict]) -> Dict:
+        """Sıralı fiyat kayıtlarından değişim sayısı, trend, volatilite ve şüpheli aktivite"""
         if len(price_history) < 2:
             return {
                 'status': 'insufficient_data',
@@ -198,7 +208,7 @@ class PriceTracker:
             return trending_products[:20]  # En iyi 20 ürün
             
         except Exception as e:
-            print(f"Trend analizi hatası: {e}")
+            logger.error("Trend analizi hatası: %s", e)
             return []
     
     def generate_price_alerts(self, user_preferences: Dict) -> List[Dict]:
@@ -244,7 +254,7 @@ class PriceTracker:
             return alerts
             
         except Exception as e:
-            print(f"Fiyat alarm oluşturma hatası: {e}")
+            logger.error("Fiyat alarm oluşturma hatası: %s", e)
             return []
     
     def cleanup_old_price_history(self, days_to_keep: int = 90):
@@ -260,12 +270,12 @@ class PriceTracker:
             """, (cutoff_date,))
             
             deleted_count = cursor.rowcount
-            print(f"{deleted_count} eski fiyat kaydı silindi")
+            logger.info("%s eski fiyat kaydı silindi", deleted_count)
             
             return deleted_count
             
         except Exception as e:
-            print(f"Eski kayıtları temizleme hatası: {e}")
+            logger.error("Eski kayıtları temizleme hatası: %s", e)
             return 0
         finally:
             cursor.close()
@@ -308,7 +318,7 @@ class PriceTracker:
             }
             
         except Exception as e:
-            print(f"İstatistik oluşturma hatası: {e}")
+            logger.error("İstatistik oluşturma hatası: %s", e)
             return {}
         finally:
             cursor.close()
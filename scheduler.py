@@ -1,18 +1,23 @@
 import os
 import time
+import logging
 import threading
 from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
-from amazon_scraper import AmazonScraper
+from scrapers.amazon_scraper import AmazonScraper
+from scrapers.recrawl import RecrawlScheduler
 from price_tracker import PriceTracker
 from notifier import NotificationManager
 from database import Database
+from logger import get_logger
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = get_logger(__name__)
+
 class TaskScheduler:
     def __init__(self):
         self.scheduler = BackgroundScheduler()
@@ -20,6 +25,8 @@ class TaskScheduler:
         self.price_tracker = PriceTracker()
         self.notification_manager = NotificationManager()
         self.db = Database()
+        # Bilinen ürünlerin fiyat oynaklığına göre detay sayfasından yeniden taranması
+        self.recrawler = RecrawlScheduler(self.db, self.price_tracker)
         
         # Son çalışma zamanları
         self.last_scrape_time = None
@@ -33,8 +40,7 @@ class TaskScheduler:
     
     def log_message(self, message: str, level: str = "INFO"):
         """Log mesajı yazdır"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] [{level}] {message}")
+        logger.log(getattr(logging, level.upper(), logging.INFO), message)
     
     def scrape_amazon_deals(self):
         """Amazon fırsatlarını scrape et"""
@@ -114,6 +120,18 @@ class TaskScheduler:
         except Exception as e:
             self.log_message(f"✗ Yeni fırsat kontrol hatası: {e}", "ERROR")
     
+    def recrawl_products(self):
+        """Zamanı gelen ürünleri saatlik istek bütçesi içinde yeniden tara"""
+        try:
+            results = self.recrawler.run()
+            checked = sum(site['checked'] for site in results.values())
+            changed = sum(site['changed'] for site in results.values())
+            if checked:
+                self.log_message(f"✓ Yeniden tarama: {checked} ürün kontrol edildi, {changed} fiyat değişti")
+            
+        except Exception as e:
+            self.log_message(f"✗ Yeniden tarama hatası: {e}", "ERROR")
+    
     def track_price_changes(self):
         """Fiyat değişikliklerini takip et"""
         try:
@@ -188,14 +206,7 @@ class TaskScheduler:
             cleaned_count = self.price_tracker.cleanup_old_price_history(days_to_keep=90)
             
             # 30 günden eski olan ve hiç güncellenmeyen ürünleri sil
-            cursor = self.db.conn.cursor()
-            cursor.execute("""
-                DELETE FROM products 
-                WHERE last_updated < %s
-            """, (datetime.now() - timedelta(days=30),))
-            
-            deleted_products = cursor.rowcount
-            cursor.close()
+            deleted_products = self.db.cleanup_stale_products(days=30)
             
             self.log_message(f"✓ Temizlik tamamlandı: {cleaned_count} fiyat kaydı, {deleted_products} eski ürün silindi")
             self.last_cleanup_time = datetime.now()
@@ -230,6 +241,7 @@ class TaskScheduler:
             'last_scrape_time': self.last_scrape_time.isoformat() if self.last_scrape_time else None,
             'last_notification_time': self.last_notification_time.isoformat() if self.last_notification_time else None,
             'last_cleanup_time': self.last_cleanup_time.isoformat() if self.last_cleanup_time else None,
+            'recrawl': self.recrawler.stats(),
             'next_run_time': {
                 job.id: job.next_run_time.isoformat() if job.next_run_time else None 
                 for job in self.scheduler.get_jobs()
@@ -248,6 +260,17 @@ class TaskScheduler:
             replace_existing=True
         )
         
+        # Ürün yeniden taraması - oynak fiyatlı ürünler daha sık (RECRAWL_BUDGET_PER_HOUR=0 → kapalı)
+        if self.recrawler.budget_per_hour > 0:
+            self.scheduler.add_job(
+                func=self.recrawl_products,
+                trigger=IntervalTrigger(seconds=self.recrawler.run_every),
+                id='recrawl_products',
+                name='Ürün Yeniden Taraması',
+                max_instances=1,
+                replace_existing=True
+            )
+        
         # Fiyat değişikliği takibi - her 30 dakikada
         self.scheduler.add_job(
             func=self.track_price_changes,
@@ -0,0 +1,284 @@
+from .base_scraper import BaseScraper
+from .registry import register_site
+from .fingerprint import product_fingerprint
+from .product_ids import native_product_id
+from typing import Any, List, Dict, NamedTuple, Tuple
+from urllib.parse import urlencode
+from collections import Counter
+from database import Database
+from logger import get_logger
+import os
+
+logger = get_logger(__name__)
+
+# Kategori:arama çiftleri; değer "/" ile başlıyorsa hazır liste yolu (ör. tarama düğümü)
+DEFAULT_CATEGORIES = 'Bilgisayar:mouse,Elektronik:kulaklık,Ev&Mutfak:kahve makinesi,Spor:koşu ayakkabısı,Oyun:oyun kumandası'
+
+
+def parse_categories(value: str) -> List[Tuple[str, str]]:
+    """'Bilgisayar:mouse,Oyun:/s?i=videogames' → [('Bilgisayar', 'mouse'), ('Oyun', '/s?i=videogames')]"""
+    categories = []
+    for entry in value.split(','):
+        name, sep, query = entry.partition(':')
+        if sep and name.strip() and query.strip():
+            categories.append((name.strip(), query.strip()))
+        elif entry.strip():
+            logger.warning("⚠️  Geçersiz AMAZON_CATEGORIES girdisi: %s", entry)
+    return categories
+
+
+class AmazonListing(NamedTuple):
+    """Taranacak tek liste sayfası: kategori, arama (veya yol) ve sayfa numarası"""
+    category: str
+    query: str
+    number: int
+    
+    def __str__(self):
+        return f"{self.category}/{self.number}"
+
+
+@register_site('amazon', max_pages=int(os.environ.get('AMAZON_MAX_PAGES', 3)),
+               min_delay=2.0, max_delay=4.0, concurrency=2, default=False)
+class AmazonScraper(BaseScraper):
+    """Amazon.com.tr kategori fırsat sayfaları scraper'ı
+    
+    Her kategori için arama sonuçları indirim filtresiyle (`p_8`: en az
+    `AMAZON_DEAL_DISCOUNT`% indirim) sayfa sayfa taranır; ASIN kartın
+    `data-asin` attribute'undan okunur ve diğer sitelerle aynı kararlı
+    ID'ye çevrilir ("AM<ASIN>", bkz. product_ids).
+    """
+    
+    site_name = "Amazon"
+    base_url = "https://www.amazon.com.tr"
+    empty_listing_markers = ['için sonuç bulunamadı'.encode(), b'no results for']
+    results_container_marker = b's-main-slot'
+    card_markers = [b'data-component-type="s-search-result"']
+    detail_selectors = {
+        'price': [
+            '#corePriceDisplay_desktop_feature_div .priceToPay .a-offscreen',
+            '#corePrice_feature_div .a-offscreen',
+            '#priceblock_dealprice',
+            '#priceblock_ourprice'
+        ],
+        'list_price': [
+            '#corePriceDisplay_desktop_feature_div .basisPrice .a-offscreen',
+            '#corePriceDisplay_desktop_feature_div .a-text-price .a-offscreen',
+            '#priceblock_listprice'
+        ],
+        'breadcrumb': ['#wayfinding-breadcrumbs_feature_div ul li a'],
+        'seller': ['#sellerProfileTriggerId', '#merchant-info a'],
+        'out_of_stock': ['#outOfStock']
+    }
+    
+    def __init__(self):
+        super().__init__()
+        self._db = None
+        self.categories = parse_categories(os.environ.get('AMAZON_CATEGORIES', DEFAULT_CATEGORIES))
+        # 0 → indirim filtresi yok (tüm arama sonuçları)
+        self.deal_discount = int(os.environ.get('AMAZON_DEAL_DISCOUNT', 40))
+    
+    @property
+    def db(self) -> Database:
+        """Veritabanı bağlantısını ilk kullanımda aç"""
+        if self._db is None:
+            self._db = Database()
+        return self._db
+    
+    def listing_pages(self, max_pages: int) -> List[AmazonListing]:
+        """Her kategori için 1..max_pages fırsat sayfası"""
+        return [AmazonListing(category, query, number)
+                for category, query in self.categories
+                for number in range(1, max_pages + 1)]
+    
+    def _listing(self, page: Any) -> AmazonListing:
+        # Sayı verilirse ilk kategorinin o sayfası
+        if isinstance(page, AmazonListing):
+            return page
+        category, query = self.categories[0]
+        return AmazonListing(category, query, int(page))
+    
+    def page_url(self, page: Any) -> str:
+        """Kategori fırsat sayfası URL'i"""
+        listing = self._listing(page)
+        if listing.query.startswith('/'):
+            url = self.base_url + listing.query
+            params = {}
+        else:
+            url = f"{self.base_url}/s"
+            params = {'k': listing.query}
+            if self.deal_discount:
+                params['rh'] = f"p_8:{self.deal_discount}-"
+        if listing.number > 1:
+            params['page'] = listing.number
+        if not params:
+            return url
+        return f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+    
+    def parse_page(self, soup, page: Any = 1) -> List[Dict]:
+        """Amazon arama sonuçları sayfasını parse et"""
+        category = self._listing(page).category
+        
+        # Ürün kartlarını bul
+        product_cards = soup.select('div[data-component-type="s-search-result"]')
+        logger.info("🔍 %s ürün kartı bulundu", len(product_cards))
+        
+        if len(product_cards) == 0:
+            logger.warning("❌ Hiç ürün kartı bulunamadı")
+            # Alternative selectors
+            alt_cards = soup.select('.s-result-item')
+            logger.debug("🔍 Alternative: %s .s-result-item bulundu", len(alt_cards))
+            return []
+        
+        found_products = []
+        
+        for i, card in enumerate(product_cards):
+            logger.debug("--- ÜRÜN %s ANALİZİ ---", i + 1)
+            
+            try:
+                # 1. Link
+                link_element = card.select_one('h2 a')
+                product_url = ""
+                if link_element:
+                    href = link_element.get('href', '')
+                    product_url = self.build_full_url(self.base_url, href)
+                    logger.debug("🔗 Link: %s...", href[:50])
+                
+                # Sponsorlu/tekrar eden kartlar aynı ASIN'i taşır
+                if self.is_duplicate(product_url):
+                    self.log_product_skipped(self.site_name, "Duplicate ürün")
+                    continue
+                
+                # ASIN: kartın data-asin'i, yoksa ürün linki; ikisi de yoksa reklam/yer tutucu kart
+                native_id = card.get('data-asin') or native_product_id(self.site_name, product_url)
+                if not native_id:
+                    self.log_product_skipped(self.site_name, "ASIN bulunamadı")
+                    continue
+                asin = self.generate_product_id(self.site_name, product_url, native_id)
+                
+                # 2. Başlık
+                title_element = card.select_one('h2 a span, h2 span')
+                title = title_element.get_text(strip=True) if title_element else ''
+                if not title:
+                    self.log_product_skipped(self.site_name, "Başlık bulunamadı")
+                    continue
+                
+                logger.debug("📝 Başlık: %s...", title[:80])
+                
+                # 3. Mevcut fiyat
+                # Tam fiyat (kuruşlu) önce; a-price-whole sadece lira kısmını taşır
+                price_selectors = [
+                    '.a-price .a-offscreen',
+                    'span.a-price-whole',
+                    'span.a-color-price'
+                ]
+                current_price = self.extract_multiple_selectors(card, price_selectors, "mevcut fiyat",
+                                                                parse=self.first_price)
+                logger.debug("   ✅ Mevcut fiyat: %s₺", current_price)
+                
+                # 4. Liste fiyatı (çizili/strike)
+                strike_selectors = [
+                    'span.a-price[data-a-strike="true"] .a-offscreen',
+                    '.a-text-strike .a-offscreen',
+                    'span.a-text-strike',
+                    '.a-price-was'
+                ]
+                list_price = self.extract_multiple_selectors(card, strike_selectors, "liste fiyatı",
+                                                             parse=self.first_price)
+                logger.debug("   ✅ Liste fiyatı: %s₺", list_price)
+                
+                if not current_price:
+                    self.log_product_skipped(self.site_name, "Mevcut fiyat bulunamadı")
+                    continue
+                
+                if not list_price:
+                    self.log_product_skipped(self.site_name, f"Sadece mevcut fiyat: {current_price}₺")
+                    continue
+                
+                fingerprint = product_fingerprint(title, current_price, list_price)
+                if self.is_unchanged(asin, fingerprint):
+                    continue
+                
+                # 5. İndirim hesaplama
+                discount_percent = self.calculate_discount(list_price, current_price)
+                if not self.is_valid_deal(discount_percent, min_discount=40):
+                    self.log_product_skipped(self.site_name, f"İndirim yetersiz: %{discount_percent}")
+                    continue
+                
+                # 6. Resim
+                img_element = card.select_one('img.s-image, img')
+                image_url = self.extract_attr_safe(img_element, 'src')
+                
+                product_data = {
+                    'asin': asin,
+                    'title': title,
+                    'current_price': current_price,
+                    'list_price': list_price,
+                    'discount_percent': discount_percent,
+                    'product_url': product_url,
+                    'image_url': image_url,
+                    'category': category,
+                    'site_name': self.site_name,
+                    'fingerprint': fingerprint
+                }
+                
+                found_products.append(product_data)
+                self.log_product_found(self.site_name, title, discount_percent, current_price)
+            
+            except Exception as e:
+                self.log_error(self.site_name, f"Ürün {i+1} işleme hatası: {e}")
+                continue
+        
+        logger.info("🎯 %s sayfa %s: %s ürün bulundu", self.site_name, page, len(found_products))
+        return found_products
+    
+    def scrape_all_deals(self) -> List[Dict]:
+        """Tüm kategori fırsat sayfalarını tara ve toplu kaydet
+        
+        Paylaşılan fetch motoru (AsyncFetcher, rate limiter, fetch politikası)
+        ve toplu yazıcı CrawlPipeline üzerinden kullanılır.
+        """
+        from .pipeline import CrawlPipeline
+        from .registry import get_site
+        
+        results = CrawlPipeline(self.db, [get_site(self.site_key)], keep_products=True).run()
+        logger.info("💾 Amazon: %s ürün bulundu, %s kaydedildi, %s değişmedi (%ss)",
+                    results['total_products'], results['total_saved'], results['total_unchanged'],
+                    results['scrape_time'])
+        return results['products']
+    
+    def get_deal_summary(self) -> Dict:
+        """Özet bilgiler"""
+        try:
+            deals = self.db.get_big_deals(min_discount=40)
+            categories = Counter(d.get('category') or 'Elektronik' for d in deals)
+            
+            return {
+                'total_deals': len(deals),
+                'categories': dict(categories),
+                'best_discount': max([d['discount_percent'] for d in deals], default=0),
+                'average_discount': sum([d['discount_percent'] for d in deals]) / len(deals) if deals else 0
+            }
+        except Exception as e:
+            logger.error("Özet hatası: %s", e)
+            return {'total_deals': 0, 'categories': {}, 'best_discount': 0, 'average_discount': 0}
+
+# Test
+if __name__ == "__main__":
+    scraper = AmazonScraper()
+
+    print("🚀 AMAZON KATEGORİ TARAMASI")
+    print("=" * 50)
+    for category, query in scraper.categories:
+        print(f"   {category}: {query}")
+
+    products = scraper.scrape(max_pages=1)
+
+    print("\n📊 SONUÇLAR:")
+    if products:
+        for i, p in enumerate(products, 1):
+            print(f"{i}. [{p['category']}] {p['title'][:60]}...")
+            print(f"   %{p['discount_percent']} indirim: {p['current_price']}₺ → {p['list_price']}₺")
+    else:
+        print("❌ Hiçbir fırsat bulunamadı")
+
+    print(f"\n✅ Test tamamlandı: {len(products)} ürün")
@@ -1,22 +1,85 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import os
 import re
+import asyncio
+import requests
 import random
-from typing import Dict, Optional, List
+import time
+import threading
+from typing import Any, Callable, Dict, Optional, List, Tuple
 from urllib.parse import urljoin
+from logger import get_logger
+from .html_parser import parse_html
+from .fetcher import CIRCUIT_OPEN, AsyncFetcher, FetchResult
+from .http_cache import get_http_cache
+from .debug_capture import get_debug_capture
+from .selector_resolver import get_selector_resolver
+from .rate_limiter import get_rate_limiter
+from .fetch_policy import get_fetch_policy
+from .session_pool import USER_AGENTS, get_session_pool
+from .block_detector import BLOCK_VERDICTS, OK, classify_response
+from .embedded_state import dig, find_state, find_json_ld, to_float
+from .product_ids import product_id
+from .dedupe import DedupeIndex, dedupe_key
+from .fingerprint import FingerprintCache, product_fingerprint
+from .price_parser import parse_price, parse_prices
+
+logger = get_logger(__name__)
+
+# Liste kartında kategori yoksa kullanılan varsayılan (detay sayfası zenginleştirmesi gerçek kategoriyle değiştirir)
+DEFAULT_CATEGORY = 'Elektronik'
+
+# detail_selectors anahtarı → parse_product_page alanı
+DETAIL_FIELDS = {
+    'price': 'current_price',
+    'list_price': 'list_price',
+    'breadcrumb': 'category_path',
+    'seller': 'seller',
+    'out_of_stock': 'in_stock'
+}
 
 class BaseScraper:
     """Tüm scraper'lar için ortak fonksiyonlar"""
     
+    # Alt sınıflar tanımlar; site_key @register_site ile atanır
+    site_name = ""
+    site_key = ""
+    base_url = ""
+    # Sayfaya gömülü JSON state'in başladığı işaretler
+    state_markers: List[str] = []
+    # Sonuçsuz liste sayfası işaretleri (küçük harf, bkz. is_empty_listing): "sonuç yok"
+    # metinleri, sonuç listesinin kapsayıcısı ve ürün kartları
+    empty_listing_markers: List[bytes] = []
+    results_container_marker: bytes = b''
+    card_markers: List[bytes] = []
+    # Ürün detay sayfasında JSON-LD'de olmayan alanlar için selector'lar (bkz. parse_product_page):
+    # price, list_price, breadcrumb (kategori yolu linkleri), seller, out_of_stock (varsa stok yok)
+    detail_selectors: Dict[str, List[str]] = {}
+    
     def __init__(self):
         self.session = requests.Session()
-        self.user_agents = [
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0'
-        ]
+        self.user_agents = list(USER_AGENTS)
+        # SESSION_POOL_SIZE tanımlıysa istekler host başına oturum havuzuna dağıtılır (self.session kullanılmaz)
+        self.session_pool = get_session_pool()
+        # Giden istekleri host bazında sınırlar; replay/benchmark için None yapılabilir
+        self.rate_limiter = get_rate_limiter()
+        # Tekrar deneme / geri çekilme / devre kesici (None → tek deneme)
+        self.fetch_policy = get_fetch_policy()
+        # HTML parser backend'i (None → HTML_PARSER env / en hızlı kurulu olan)
+        self.parser_backend = os.environ.get('HTML_PARSER')
+        # auto: önce gömülü JSON state, yoksa DOM; dom: sadece DOM selector'ları
+        self.extraction_mode = os.environ.get('SCRAPER_EXTRACTION', 'auto').lower()
+        # Tarama boyunca görülen ürünler; MainScraper tüm sitelere ortak index verir
+        self.dedupe = DedupeIndex.for_site(self.site_key or self.site_name.lower())
+        # Artımlı tarama: MainScraper DB'den yüklenmiş cache verir; None ise her kart işlenir
+        self.fingerprints: Optional[FingerprintCache] = None
+        # HTTP_CACHE_PATH tanımlıysa koşullu istek ve değişmeyen sayfa atlama
+        self.http_cache = get_http_cache()
+        # Site/alan başına öğrenilen selector'lar (kart başına tek selector denenir)
+        self.selectors = get_selector_resolver()
+        # DEBUG_CAPTURE_DIR tanımlıysa hatalı/örneklenmiş sayfaların gövdesi yakalanır
+        self.debug_capture = get_debug_capture()
+        # Parse edilen sayfanın ürün ID'leri (parse thread'ine özel)
+        self._page_ids = threading.local()
     
     def get_headers(self, site_name: str = "default") -> Dict[str, str]:
         """Site'e özel headers"""
@@ -37,63 +100,393 @@ class BaseScraper:
             base_headers['Referer'] = 'https://www.trendyol.com/'
         elif site_name == "hepsiburada":
             base_headers['Referer'] = 'https://www.hepsiburada.com/'
+        elif site_name == "amazon":
+            base_headers['Referer'] = 'https://www.amazon.com.tr/'
         
         return base_headers
     
-    def get_html(self, url: str, site_name: str = "default", timeout: int = 30) -> Optional[BeautifulSoup]:
-        """HTML içeriği çek ve parse et"""
+    def fetch_page(self, url: str, site_name: str = "default", timeout: int = 30,
+                   empty_check: Callable[[bytes], bool] = None) -> FetchResult:
+        """Sayfayı senkron indir; geçici hatalarda fetch politikasına göre tekrar dene
+        
+        Engel sayfası politikaya bildirilir: oturum havuzu varsa yeni oturumla
+        tekrar denenir, yoksa host'un devresi açılır. Liste sayfaları için
+        `empty_check=self.is_empty_listing` verilir.
+        """
+        if self.fetch_policy is None:
+            return self._fetch_page_once(url, site_name, timeout, empty_check)
+        
+        attempt = 0
+        while True:
+            if not self.fetch_policy.allow(url):
+                return FetchResult(url, error=CIRCUIT_OPEN)
+            attempt += 1
+            result = self._fetch_page_once(url, site_name, timeout, empty_check)
+            if result.error == CIRCUIT_OPEN or self.fetch_policy.record_verdict(url, result.verdict, result.session):
+                return result
+            if result.verdict in BLOCK_VERDICTS:
+                # Engellenen oturum emekliye ayrıldı; yeni oturumla beklemeden tekrar dene
+                continue
+            delay = self.fetch_policy.retry_delay(url, attempt, result.status, result.error, result.headers)
+            if delay is None:
+                return result
+            time.sleep(delay)
+    
+    def _fetch_page_once(self, url: str, site_name: str, timeout: int,
+                         empty_check: Callable[[bytes], bool] = None) -> FetchResult:
+        """Tek istek; HTTP cache açıksa koşullu gönderilir, cevap parse edilmeden sınıflandırılır"""
+        # Rate limiter'da beklemeden önce: başka bir thread'de host engellendiyse istek gönderilmez
+        if self.fetch_policy is not None and self.fetch_policy.is_open(url):
+            return FetchResult(url, error=CIRCUIT_OPEN)
         try:
             headers = self.get_headers(site_name)
-            response = self.session.get(url, headers=headers, timeout=timeout)
+            if self.http_cache is not None:
+                headers.update(self.http_cache.conditional_headers(url))
+            pooled = self.session_pool.acquire(url) if self.session_pool is not None else None
+            if pooled is not None:
+                headers['User-Agent'] = pooled.user_agent
+            if self.rate_limiter is not None:
+                self.rate_limiter.wait(url)
+            try:
+                response = (pooled.session if pooled is not None else self.session).get(url, headers=headers,
+                                                                                         timeout=timeout)
+            except Exception as e:
+                if pooled is not None:
+                    self.session_pool.record(pooled, url, error=str(e))
+                raise
+            verdict = classify_response(response.status_code, response.content, response.url, response.headers,
+                                        empty_check)
+            session = pooled.id if pooled is not None else None
+            if pooled is not None:
+                self.session_pool.record(pooled, url, response.status_code, verdict)
+            
+            logger.debug("🌐 %s - Status: %s", site_name, response.status_code)
+            
+            if verdict != OK:
+                # Engel/boş sayfa parse edilmez ve cache'e yazılmaz
+                logger.debug("🚫 %s cevabı (%s, HTTP %s): %s", site_name, verdict, response.status_code, url)
+                return FetchResult(url, response.status_code, response.content, dict(response.headers),
+                                   verdict=verdict, session=session)
             
-            print(f"🌐 {site_name} - Status: {response.status_code}")
+            if self.http_cache is not None:
+                if response.status_code == 304:
+                    cached = self.http_cache.body(url)
+                    if cached is not None:
+                        return FetchResult(url, 200, cached, dict(response.headers), unchanged=True)
+                elif response.status_code == 200:
+                    changed = self.http_cache.store(url, response.content, response.headers)
+                    return FetchResult(url, 200, response.content, dict(response.headers), unchanged=not changed)
             
-            if response.status_code == 200:
-                return BeautifulSoup(response.content, 'html.parser')
-            else:
-                print(f"❌ HTTP {response.status_code}: {url}")
-                return None
+            if response.status_code != 200:
+                logger.warning("❌ HTTP %s: %s", response.status_code, url)
+            return FetchResult(url, response.status_code, response.content, dict(response.headers))
                 
         except Exception as e:
-            print(f"❌ Request hatası ({site_name}): {e}")
+            logger.error("❌ Request hatası (%s): %s", site_name, e)
+            return FetchResult(url, error=str(e))
+    
+    def get_body(self, url: str, site_name: str = "default", timeout: int = 30) -> Optional[bytes]:
+        """Sayfanın ham gövdesini çek (hata veya 200 dışı durumda None)"""
+        result = self.fetch_page(url, site_name, timeout)
+        return result.body if result.ok else None
+    
+    def get_html(self, url: str, site_name: str = "default", timeout: int = 30) -> Optional[Any]:
+        """HTML içeriği çek ve parse et (select/select_one/get_text/get destekleyen belge)"""
+        body = self.get_body(url, site_name, timeout)
+        if body is None:
             return None
+        return parse_html(body, self.parser_backend)
     
-    def parse_price(self, price_str: str) -> Optional[float]:
-        """Fiyat string'ini sayıya çevir: '1.299,99 TL' → 1299.99"""
-        if not price_str:
+    def listing_pages(self, max_pages: int) -> List[Any]:
+        """Taranacak liste sayfaları; her biri page_url/parse_page'e `page` olarak verilir
+        
+        Varsayılan tek liste için 1..max_pages; birden çok kategori tarayan
+        siteler (kategori, sayfa) anahtarları döndürür.
+        """
+        return list(range(1, max_pages + 1))
+    
+    def page_url(self, page: int) -> str:
+        """Liste sayfası URL'i (alt sınıflar tanımlar)"""
+        raise NotImplementedError
+    
+    def parse_page(self, soup, page: int = 1) -> List[Dict]:
+        """Ayrıştırılmış liste sayfasından ürünleri çıkar (alt sınıflar tanımlar)"""
+        raise NotImplementedError
+    
+    def state_items(self, state: Any) -> Optional[List]:
+        """Gömülü state'teki ürün listesi (alt sınıflar tanımlar)"""
+        return None
+    
+    def product_from_state(self, item: Dict) -> Optional[Dict]:
+        """State'teki tek ürünü ürün dict'ine çevir (alt sınıflar tanımlar)"""
+        return None
+    
+    def parse_state(self, body: bytes, page: int = 1) -> Optional[List[Dict]]:
+        """Gömülü JSON state'ten ürünleri çıkar; state yoksa None (DOM'a düşülür)"""
+        if not self.state_markers:
+            return None
+        
+        items = self.state_items(find_state(body, self.state_markers))
+        if items is None:
             return None
         
-        # Temizlik
-        price_clean = price_str.replace('TL', '').replace('₺', '').strip()
+        found_products = []
+        for i, item in enumerate(items[:20]):  # Max 20 ürün/sayfa
+            try:
+                href = item.get('url') if isinstance(item, dict) else None
+                if href and self.is_duplicate(self.build_full_url(self.base_url, href)):
+                    self.log_product_skipped(self.site_name, "Duplicate ürün")
+                    continue
+                
+                product = self.product_from_state(item)
+                if not product:
+                    self.log_product_skipped(self.site_name, "State ürünü eksik alanlı")
+                    continue
+                
+                asin = self.generate_product_id(self.site_name, product['product_url'],
+                                                product.get('site_product_id'))
+                fingerprint = product_fingerprint(product['title'], product['current_price'], product['list_price'])
+                if self.is_unchanged(asin, fingerprint):
+                    continue
+                
+                discount_percent = self.calculate_discount(product['list_price'], product['current_price'])
+                if not self.is_valid_deal(discount_percent, min_discount=40):
+                    self.log_product_skipped(self.site_name, f"İndirim yetersiz: %{discount_percent}")
+                    continue
+                
+                product.update({
+                    'asin': asin,
+                    'discount_percent': discount_percent,
+                    'site_name': self.site_name,
+                    'fingerprint': fingerprint
+                })
+                found_products.append(product)
+                self.log_product_found(self.site_name, product['title'], discount_percent, product['current_price'])
+                
+            except Exception as e:
+                self.log_error(self.site_name, f"State ürün {i+1} işleme hatası: {e}")
+                continue
         
-        # Sayıları bul
-        numbers = re.findall(r'[\d.,]+', price_clean)
-        if not numbers:
+        logger.info("🎯 %s sayfa %s (state): %s ürün bulundu", self.site_name, page, len(found_products))
+        return found_products
+    
+    def parse_product_page(self, body: bytes) -> Optional[Dict]:
+        """Ürün detay sayfasının alanları
+        
+        {'current_price', 'list_price', 'category_path', 'seller', 'in_stock'};
+        önce JSON-LD (Product teklifi, BreadcrumbList), eksik kalan alanlar için
+        sitenin `detail_selectors`'ı denenir. Bulunamayan alanlar None, güncel
+        fiyat okunamazsa sonuç None olur.
+        """
+        details = dict.fromkeys(('current_price', 'list_price', 'category_path', 'seller', 'in_stock'))
+        product = find_json_ld(body, 'Product') or {}
+        offers = product.get('offers')
+        offer = offers[0] if isinstance(offers, list) and offers else offers
+        if isinstance(offer, dict):
+            details['current_price'] = to_float(offer.get('price')) or to_float(offer.get('lowPrice'))
+            seller = offer.get('seller')
+            details['seller'] = seller.get('name') if isinstance(seller, dict) else seller or None
+            availability = str(offer.get('availability') or '')
+            if availability:
+                details['in_stock'] = not any(state in availability
+                                              for state in ('OutOfStock', 'SoldOut', 'Discontinued'))
+        
+        breadcrumb = find_json_ld(body, 'BreadcrumbList')
+        if breadcrumb is not None:
+            items = sorted((item for item in breadcrumb.get('itemListElement') or [] if isinstance(item, dict)),
+                           key=lambda item: to_float(item.get('position')) or 0)
+            details['category_path'] = [item.get('name') or dig(item, 'item', 'name') for item in items]
+        elif isinstance(product.get('category'), str):
+            details['category_path'] = re.split(r'\s*[>/]\s*', product['category'])
+        
+        selectors = self.detail_selectors
+        missing = [field for field in ('price', 'list_price', 'breadcrumb', 'seller', 'out_of_stock')
+                   if selectors.get(field) and details[DETAIL_FIELDS[field]] is None]
+        if missing:
+            soup = parse_html(body, self.parser_backend)
+            if 'price' in missing:
+                details['current_price'] = self.extract_first(soup, selectors['price'], "detay fiyat",
+                                                              parse=self.element_price)
+            if 'list_price' in missing:
+                details['list_price'] = self.extract_first(soup, selectors['list_price'], "detay liste fiyatı",
+                                                           parse=self.element_price)
+            if 'breadcrumb' in missing:
+                links = self.extract_multiple_selectors(soup, selectors['breadcrumb'], "kategori yolu")
+                details['category_path'] = [self.extract_text_safe(link) for link in links] or None
+            if 'seller' in missing:
+                details['seller'] = self.extract_first(soup, selectors['seller'], "satıcı",
+                                                       parse=self.extract_text_safe) or None
+            if 'out_of_stock' in missing:
+                # Stok yok işareti çoğu sayfada bulunmaz; selector istatistiklerine katılmaz
+                details['in_stock'] = not any(soup.select_one(selector) for selector in selectors['out_of_stock'])
+        
+        if not details['current_price']:
             return None
+        details['category_path'] = self.clean_category_path(details['category_path'], product.get('name'))
+        return details
+    
+    def clean_category_path(self, path: Optional[List[str]], product_name: str = None) -> Optional[List[str]]:
+        """Kategori yolundan ana sayfa, site adı ve ürün adı öğelerini at"""
+        if not path:
+            return None
+        skip = {'ana sayfa', 'anasayfa', 'home', self.site_name.lower(), (product_name or '').strip().lower()}
+        cleaned = []
+        for name in path:
+            name = ' '.join((name or '').split())
+            if name and name.lower() not in skip and (not cleaned or cleaned[-1] != name):
+                cleaned.append(name)
+        return cleaned or None
+    
+    def scrape_page(self, page: int = 1) -> List[Dict]:
+        """Tek liste sayfasını senkron indir ve parse et"""
+        logger.info("🔎 %s sayfa %s taranıyor...", self.site_name, page)
+        
+        result = self.fetch_page(self.page_url(page), self.site_name.lower(), empty_check=self.is_empty_listing)
+        if not result.ok:
+            return []
+        
+        return self.parse_result(result, page)
+    
+    def scrape(self, max_pages: int = 2) -> List[Dict]:
+        """Siteden tüm indirimleri scrape et"""
+        return asyncio.run(self.scrape_async(max_pages))
+    
+    async def scrape_async(self, max_pages: int = 2, fetcher: AsyncFetcher = None,
+                           dedupe: DedupeIndex = None) -> List[Dict]:
+        """Sayfaları eşzamanlı indir; her sayfa geldikçe thread havuzunda parse et
+        
+        `dedupe` verilirse (ör. tüm siteler için ortak index) o kullanılır,
+        verilmezse scraper'ın kendi index'i yeni tarama için temizlenir.
+        """
+        if fetcher is None:
+            async with AsyncFetcher(rate_limiter=self.rate_limiter, policy=self.fetch_policy) as own_fetcher:
+                return await self.scrape_async(max_pages, own_fetcher, dedupe)
+        
+        logger.info("🚀 %s scraping başlıyor...", self.site_name)
+        if dedupe is not None:
+            self.dedupe = dedupe
+        else:
+            self.dedupe.reset()
+        
+        pages = self.listing_pages(max_pages)
+        page_results = await asyncio.gather(*(self._scrape_page_async(fetcher, page) for page in pages))
+        
+        all_products = [product for products in page_results for product in products]
+        logger.info("✅ %s tamamlandı: %s ürün", self.site_name, len(all_products))
+        return all_products
+    
+    async def _scrape_page_async(self, fetcher: AsyncFetcher, page: int) -> List[Dict]:
+        url = self.page_url(page)
+        result = await fetcher.fetch(url, self.get_headers(self.site_name.lower()), self.is_empty_listing)
+        
+        if result.error:
+            return []
+        if result.verdict != OK:
+            logger.warning("🚫 %s sayfa %s atlandı (%s): %s", self.site_name, page, result.verdict, url)
+            self._capture(result, page, failed=True, reason=result.verdict)
+            return []
+        if result.status != 200:
+            logger.warning("❌ HTTP %s: %s", result.status, url)
+            return []
         
         try:
-            # En uzun sayı string'ini al
-            price_text = max(numbers, key=len)
-            
-            # Türk formatını düzelt
-            if ',' in price_text and '.' in price_text:
-                # 1.299,99 formatı
-                price_text = price_text.replace('.', '').replace(',', '.')
-            elif ',' in price_text:
-                # Virgül kontrol: ondalık mı binlik mi?
-                parts = price_text.split(',')
-                if len(parts) == 2 and len(parts[1]) == 2:
-                    # 1299,99 - ondalık
-                    price_text = price_text.replace(',', '.')
-                else:
-                    # 1,299 - binlik
-                    price_text = price_text.replace(',', '')
-            
-            price = float(price_text)
-            return price if 1 <= price <= 500000 else None
-            
-        except ValueError:
-            return None
+            # Parse CPU işidir; event loop diğer siteleri indirmeye devam etsin
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.parse_result, result, page)
+        except Exception as e:
+            self.log_error(self.site_name, f"Sayfa {page} hatası: {e}")
+            return []
+    
+    def parse_result(self, result: FetchResult, page: int) -> List[Dict]:
+        """İndirilen sayfayı parse et ve ürün ID'lerini HTTP cache'e yaz"""
+        products, ids = self.parse_listing(result, page)
+        if ids is not None:
+            self.remember_page(result.url, ids)
+        return products
+    
+    def parse_listing(self, result: FetchResult, page: int) -> Tuple[List[Dict], Optional[List[str]]]:
+        """Sayfayı parse et; (ürünler, sayfadaki ürün ID'leri) döndür
+        
+        Sayfa HTTP cache'teki kopyayla aynıysa ve son parse'ın ürün ID'leri
+        biliniyorsa parse atlanır; bu ürünler değişmemiş sayılır (last_seen)
+        ve ID yerine None döner. ID'ler cache'e yazılmaz: pipeline bunu ürünler
+        veritabanına yazıldıktan sonra `remember_page` ile yapar.
+        """
+        if result.unchanged and self.fingerprints is not None:
+            ids = self.http_cache.items(result.url) if self.http_cache is not None else None
+            if ids is not None:
+                self.fingerprints.mark_unchanged(ids)
+                logger.info("♻️ %s sayfa %s değişmedi, %s ürün parse edilmeden işaretlendi",
+                            self.site_name, page, len(ids))
+                return [], None
+        
+        try:
+            products = self._parse_body(result.body, page)
+        except Exception:
+            self._capture(result, page, failed=True, reason='error')
+            raise
+        
+        ids = self.page_product_ids()
+        # Hiç ürün kartı tanınmadıysa selector'lar kırılmış olabilir
+        self._capture(result, page, failed=not ids, reason='empty' if not ids else 'sample')
+        return products, ids
+    
+    def remember_page(self, url: str, ids: List[str]):
+        """Sayfanın ürün ID'lerini cache'e yaz; sayfa aynı kalırsa sonraki taramada parse edilmez"""
+        if self.http_cache is not None:
+            self.http_cache.remember_items(url, ids)
+    
+    def _capture(self, result: FetchResult, page, failed: bool, reason: str):
+        if self.debug_capture is not None:
+            self.debug_capture.observe(self.site_key or self.site_name.lower(), page, result.body, failed, reason)
+    
+    def page_product_ids(self) -> List[str]:
+        """Bu thread'de son parse edilen sayfanın (değişen/değişmeyen) ürün ID'leri"""
+        return list(getattr(self._page_ids, 'ids', []))
+    
+    def _parse_body(self, body: bytes, page: int) -> List[Dict]:
+        self._page_ids.ids = []
+        if self.extraction_mode != 'dom':
+            products = self.parse_state(body, page)
+            if products is not None:
+                return products
+        return self.parse_page(parse_html(body, self.parser_backend), page)
+    
+    def is_empty_listing(self, body: bytes) -> bool:
+        """Liste sayfası sonuçsuz mu? "Sonuç yok" metni veya kartsız sonuç kapsayıcısı
+        
+        Parse etmeden byte araması yapılır. Gömülü state içeren sayfalarda
+        kapsayıcı kuralı uygulanmaz (kartlar state'ten çizilebilir); o sayfalar
+        parse'a kalır.
+        """
+        lowered = body.lower()
+        if any(marker in lowered for marker in self.empty_listing_markers):
+            return True
+        if not self.results_container_marker or self.results_container_marker not in lowered:
+            return False
+        if any(marker.lower().encode() in lowered for marker in self.state_markers):
+            return False
+        return not any(marker in lowered for marker in self.card_markers)
+    
+    def is_duplicate(self, product_url: str) -> bool:
+        """Ürün bu taramada (herhangi bir sayfada) görüldü mü? Görülmediyse işaretler."""
+        if not product_url:
+            return False
+        return not self.dedupe.add(dedupe_key(self.site_name, product_url))
+    
+    def is_unchanged(self, asin: str, fingerprint: str) -> bool:
+        """Ürün son taramadakiyle aynı mı? Aynıysa sadece last_seen güncellenecek."""
+        page_ids = getattr(self._page_ids, 'ids', None)
+        if page_ids is not None:
+            page_ids.append(asin)
+        if self.fingerprints is None or not self.fingerprints.is_unchanged(asin, fingerprint):
+            return False
+        self.log_product_skipped(self.site_name, "Son taramadan beri değişmedi")
+        return True
+    
+    def parse_price(self, price_str: str) -> Optional[float]:
+        """Fiyat string'ini sayıya çevir: '1.299,99 TL' → 1299.99 (bkz. price_parser)"""
+        return parse_price(price_str)
     
     def calculate_discount(self, old_price: float, new_price: float) -> int:
         """İndirim yüzdesini hesapla"""
@@ -131,46 +524,44 @@ class BaseScraper:
         else:
             return f"{base_url}/{href}"
     
-    def generate_product_id(self, site_name: str, product_url: str) -> str:
-        """Ürün ID oluştur"""
-        url_hash = hash(product_url) % 100000
-        prefix = site_name[:2].upper()
-        return f"{prefix}{url_hash:05d}"
-    
-    def wait_between_requests(self, min_seconds: int = 2, max_seconds: int = 4):
-        """İstekler arası bekleme (rate limiting)"""
-        wait_time = random.uniform(min_seconds, max_seconds)
-        time.sleep(wait_time)
+    def generate_product_id(self, site_name: str, product_url: str, native_id: str = None) -> str:
+        """Kararlı ürün ID'si (sitenin kendi id'si veya kanonik URL özeti)"""
+        return product_id(site_name, product_url, native_id)
     
     def log_product_found(self, site_name: str, title: str, discount: int, current_price: float):
         """Ürün bulundu logu"""
-        print(f"✅ {site_name}: {title[:50]}... - %{discount} indirim ({current_price}₺)")
+        logger.debug("✅ %s: %s... - %%%s indirim (%s₺)", site_name, title[:50], discount, current_price)
     
     def log_product_skipped(self, site_name: str, reason: str):
         """Ürün atlandı logu"""
-        print(f"⏭️  {site_name}: {reason}")
+        logger.debug("⏭️  %s: %s", site_name, reason)
     
     def log_error(self, site_name: str, error: str):
         """Hata logu"""
-        print(f"❌ {site_name}: {error}")
+        logger.error("❌ %s: %s", site_name, error)
     
-    def save_debug_html(self, html_content: str, site_name: str, page: int = 1):
-        """Debug için HTML kaydet"""
-        try:
-            filename = f"/tmp/{site_name}_page_{page}.html"
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"💾 Debug HTML kaydedildi: {filename}")
-        except Exception as e:
-            print(f"⚠️  HTML kaydetme hatası: {e}")
-    
-    def extract_multiple_selectors(self, soup, selectors: List[str], element_name: str = "element"):
-        """Birden fazla selector dene"""
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                print(f"🎯 {element_name} bulundu: {selector} ({len(elements)} adet)")
-                return elements
-        
-        print(f"❌ {element_name} bulunamadı (denenen: {len(selectors)} selector)")
-        return []
\ No newline at end of file
+    def extract_multiple_selectors(self, soup, selectors: List[str], element_name: str = "element",
+                                   parse: Callable[[List[Any]], Any] = None):
+        """Birden fazla selector dene (önce bu alan için son tutan selector)
+        
+        `parse` verilirse eşleşen eleman listesine uygulanır ve sonucu döner.
+        """
+        found = self.selectors.select(self.site_key or self.site_name, element_name, soup, selectors, parse=parse)
+        if not found:
+            logger.debug("❌ %s bulunamadı (denenen: %s selector)", element_name, len(selectors))
+        return found
+    
+    def extract_first(self, root, selectors: List[str], element_name: str = "element",
+                      parse: Callable[[Any], Any] = None) -> Any:
+        """Alanın ilk eşleşen elemanı (veya `parse` sonucu); bulunamazsa None"""
+        return self.selectors.select(self.site_key or self.site_name, element_name, root, selectors,
+                                     parse=parse, first=True)
+    
+    def element_price(self, element) -> Optional[float]:
+        """Elemanın metnindeki fiyat (okunamayan fiyat → None)"""
+        return parse_price(self.extract_text_safe(element))
+    
+    def first_price(self, elements: List[Any]) -> Optional[float]:
+        """Elemanlardan okunabilen ilk fiyat"""
+        texts = [self.extract_text_safe(element) for element in elements]
+        return next((price for price in parse_prices(texts) if price), None)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import os
+import re
+from typing import Callable, Mapping, Optional
+from urllib.parse import urlparse
+
+# Cevap sınıfları (FetchResult.verdict)
+OK = 'ok'
+CAPTCHA = 'captcha'
+SOFT_BLOCK = 'soft_block'
+LOGIN = 'login'
+EMPTY = 'empty'
+
+# Site engeli sayılan sınıflar: sayfa parse edilmez; oturum havuzu varsa oturum
+# değiştirilir, yoksa host'un devresi hemen açılır (bkz. FetchPolicy.record_verdict)
+BLOCK_VERDICTS = {CAPTCHA, SOFT_BLOCK, LOGIN}
+
+# Bundan kısa 200 cevapları boş sayfadır (liste/detay sayfaları onlarca KB); site
+# işaretleri (BaseScraper.is_empty_listing) tanımayan sayfalar için yedek kontrol
+MIN_BODY_BYTES = int(os.environ.get('FETCH_MIN_BODY_BYTES', 1024))
+
+# Engel sayfaları küçüktür; büyük gövdelerde (gerçek sayfa) işaret aranmaz, böylece
+# normal sayfalardaki reCAPTCHA / bot yönetimi script'leri engel sayılmaz
+_BLOCK_PAGE_MAX_BYTES = 64 * 1024
+_CAPTCHA_MARKERS = (b'captcha', b'robot check', b'are you a robot', b'not a robot', b'robot olmad',
+                    b'cf-chl', b'just a moment', b'checking your browser')
+_SOFT_BLOCK_MARKERS = (b'access denied', 'erişim engellendi'.encode(), b'request blocked', b'unusual traffic',
+                       b'pardon our interruption', b'_incapsula_resource')
+# Giriş sayfası (Trendyol /giris, Hepsiburada giris.hepsiburada.com, Amazon /ap/signin)
+_LOGIN_PATH = re.compile(r'/(giris|login|signin|uyelik)([/.]|$)', re.IGNORECASE)
+_LOGIN_HOSTS = ('giris.', 'login.', 'signin.')
+
+
+def is_login_url(url: Optional[str]) -> bool:
+    if not url:
+        return False
+    parsed = urlparse(url)
+    return parsed.netloc.lower().startswith(_LOGIN_HOSTS) or bool(_LOGIN_PATH.search(parsed.path))
+
+
+def classify_response(status: int, body: bytes = b'', url: str = None, headers: Mapping[str, str] = None,
+                      empty_check: Callable[[bytes], bool] = None) -> str:
+    """Cevabı parse etmeden sınıflandır: ok, captcha, soft_block, login veya empty
+
+    Sadece durum kodu, son URL / Location başlığı ve küçük gövdelerde işaret
+    araması kullanılır. 'ok' engel işareti olmadığı anlamına gelir; 404/5xx
+    gibi durumlar fetch politikasına kalır. `empty_check` liste sayfaları için
+    sitenin sonuçsuz sayfa kontrolüdür (ör. `scraper.is_empty_listing`).
+    """
+    location = (headers or {}).get('Location') or (headers or {}).get('location')
+    if status == 401 or is_login_url(url) or (300 <= status < 400 and is_login_url(location)):
+        return LOGIN
+
+    if status in (200, 403) and body and len(body) <= _BLOCK_PAGE_MAX_BYTES:
+        lowered = body.lower()
+        if any(marker in lowered for marker in _CAPTCHA_MARKERS):
+            return CAPTCHA
+        if any(marker in lowered for marker in _SOFT_BLOCK_MARKERS):
+            return SOFT_BLOCK
+    if status == 403:
+        return SOFT_BLOCK
+
+    if status == 200 and (len(body) < MIN_BODY_BYTES or (empty_check is not None and empty_check(body))):
+        return EMPTY
+    return OK
@@ -0,0 +1,123 @@
+import os
+import gzip
+import time
+import queue
+import atexit
+import threading
+from typing import Dict, Optional
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class DebugCapture:
+    """Örneklenmiş debug sayfa yakalama (varsayılan kapalı)
+
+    Parse hatası veren veya hiç ürün kartı tanınmayan sayfalar her zaman,
+    diğer sayfalar `sample_every`'de bir yakalanır (0 → sadece hatalar).
+    Ham gövde arka plan thread'inde gzip'lenip yazılır; scrape yolu sadece
+    kuyruğa bırakır, kuyruk doluysa yakalama atlanır. Dizindeki dosyaların
+    toplamı `max_bytes`'ı aşınca en eskiler silinir.
+    """
+
+    def __init__(self, directory: str, sample_every: int = None, max_bytes: int = None,
+                 queue_size: int = 16):
+        self.directory = directory
+        self.sample_every = sample_every if sample_every is not None else int(os.environ.get('DEBUG_CAPTURE_SAMPLE', 0))
+        self.max_bytes = max_bytes or int(float(os.environ.get('DEBUG_CAPTURE_MAX_MB', 50)) * 1024 * 1024)
+        self.captured = 0
+        self.dropped = 0
+        self._seen = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+
+        os.makedirs(directory, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, name='debug-capture', daemon=True)
+        self._writer.start()
+
+    def should_capture(self, failed: bool) -> bool:
+        """Hatalı sayfa her zaman, diğerleri 1/N örneklenir"""
+        with self._lock:
+            self._seen += 1
+            if failed:
+                return True
+            return bool(self.sample_every) and self._seen % self.sample_every == 0
+
+    def capture(self, site: str, page, body: bytes, reason: str):
+        """Gövdeyi yazılmak üzere kuyruğa bırak (beklemez)"""
+        name = f"{int(time.time() * 1000)}_{site}_{str(page).replace('/', '-')}_{reason}.html.gz"
+        try:
+            self._queue.put_nowait((name, body))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.debug("🗂️ Debug yakalama kuyruğu dolu, %s atlandı", name)
+
+    def observe(self, site: str, page, body: bytes, failed: bool, reason: str = 'sample'):
+        if self.should_capture(failed):
+            self.capture(site, page, body, reason)
+
+    def flush(self):
+        """Kuyruktaki yazımların bitmesini bekle"""
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def stats(self) -> Dict[str, int]:
+        return {'captured': self.captured, 'dropped': self.dropped, 'seen': self._seen}
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                name, body = item
+                path = os.path.join(self.directory, name)
+                with gzip.open(path, 'wb', compresslevel=6) as f:
+                    f.write(body)
+                self.captured += 1
+                logger.info("🗂️ Debug sayfası yakalandı: %s", path)
+                self._rotate()
+            except Exception as e:
+                logger.warning("⚠️  Debug yakalama yazılamadı: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def _rotate(self):
+        """Toplam boyut sınırı aşıldıysa en eski yakalamaları sil"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith('.html.gz'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        total = sum(size for _, _, size in files)
+        for _, name, size in sorted(files):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+            logger.debug("🗑️ Eski debug yakalaması silindi: %s", name)
+
+
+_shared_capture = None
+_shared_lock = threading.Lock()
+
+
+def get_debug_capture() -> Optional[DebugCapture]:
+    """DEBUG_CAPTURE_DIR tanımlıysa süreç genelinde paylaşılan yakalayıcı, değilse None"""
+    global _shared_capture
+    directory = os.environ.get('DEBUG_CAPTURE_DIR')
+    if not directory:
+        return None
+    with _shared_lock:
+        if _shared_capture is None or _shared_capture.directory != directory:
+            _shared_capture = DebugCapture(directory)
+            atexit.register(_shared_capture.close)
+        return _shared_capture
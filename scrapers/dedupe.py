@@ -0,0 +1,208 @@
+import os
+import re
+import math
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+from logger import get_logger
+from .product_ids import canonical_url, product_id
+
+logger = get_logger(__name__)
+
+AMAZON_ASIN = re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})')
+
+
+def _with_host(url: str, host: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit(('https', host, parts.path, '', ''))
+
+
+def canonical_trendyol(url: str) -> str:
+    """boutiqueId / merchantId gibi parametreler aynı ürünü farklı gösterir"""
+    return _with_host(canonical_url(url), 'www.trendyol.com')
+
+
+def canonical_hepsiburada(url: str) -> str:
+    """magaza / sayfa parametrelerini at"""
+    return _with_host(canonical_url(url), 'www.hepsiburada.com')
+
+
+def canonical_amazon(url: str) -> str:
+    """Başlık slug'ı ve ref=... kuyruğu olmadan /dp/<ASIN>"""
+    match = AMAZON_ASIN.search(url)
+    if match:
+        return f"https://www.amazon.com.tr/dp/{match.group(1)}"
+    return _with_host(canonical_url(url), 'www.amazon.com.tr')
+
+
+CANONICALIZERS: Dict[str, Callable[[str], str]] = {
+    'trendyol': canonical_trendyol,
+    'hepsiburada': canonical_hepsiburada,
+    'amazon': canonical_amazon,
+}
+
+
+def canonicalize(site_name: str, url: str) -> str:
+    """Siteye özel kanonik ürün URL'i"""
+    canonicalizer = CANONICALIZERS.get(site_name.lower(), canonical_url)
+    return canonicalizer(url)
+
+
+def dedupe_key(site_name: str, url: str) -> str:
+    """Aynı ürünün tüm URL varyantları için aynı anahtar (kararlı ürün ID'si)"""
+    return product_id(site_name, canonicalize(site_name, url))
+
+
+class BloomFilter:
+    """Sabit boyutlu, dosyaya yazılabilen Bloom filtresi
+
+    Çok büyük taramalarda hafızayı sınırlar; yanlış pozitif oranı
+    `error_rate` civarındadır (yanlış negatif yoktur).
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def update(self, other: 'BloomFilter'):
+        """Aynı boyuttaki başka filtrenin anahtarlarını ekle (bit OR)"""
+        if (other.size, other.hashes) != (self.size, self.hashes):
+            raise ValueError("Bloom filtre boyutları farklı")
+        merged = int.from_bytes(self.bits, 'little') | int.from_bytes(other.bits, 'little')
+        self.bits = bytearray(merged.to_bytes(len(self.bits), 'little'))
+
+    def save(self, path: str, mtime: float = None):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.size.to_bytes(8, 'little'))
+            f.write(self.hashes.to_bytes(2, 'little'))
+            f.write(self.bits)
+        if mtime is not None:
+            os.utime(tmp_path, (mtime, mtime))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BloomFilter':
+        bloom = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            bloom.size = int.from_bytes(f.read(8), 'little')
+            bloom.hashes = int.from_bytes(f.read(2), 'little')
+            bloom.bits = bytearray(f.read())
+        return bloom
+
+
+class DedupeIndex:
+    """Bir tarama boyunca görülen ürün anahtarları (thread-safe)
+
+    Varsayılan olarak hafızada set tutar. `path` (veya DEDUPE_INDEX_PATH)
+    verilirse Bloom filtresi kullanılır ve dosyaya yazılır; dosya
+    `max_age` saniyeden yeniyse aynı taramanın devamı sayılıp yüklenir
+    (ör. yeniden başlatılan ya da ayrı süreçte koşan tarama). Önceki
+    taramada görülmüş ürünler tekrar işlenmez ama `drain_carried()` ile
+    alınıp "değişmedi" yoluna (last_seen) verilir. Pencere dosyanın ilk
+    yazıldığı taramadan itibaren sayılır; daha eski dosyalar yok sayılır
+    ki her planlı taramada fiyatlar güncellensin. `path=''` dosyasız çalışır.
+    """
+
+    def __init__(self, path: str = None, max_age: int = None, capacity: int = 1_000_000):
+        self.path = os.environ.get('DEDUPE_INDEX_PATH') if path is None else path
+        self.max_age = max_age if max_age is not None else int(os.environ.get('DEDUPE_INDEX_MAX_AGE', 1800))
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.hits = 0
+        self._carried = []
+        self.started_at = time.time()
+        self._previous = self._load()
+        self._keys = self._empty()
+
+    @classmethod
+    def for_site(cls, site_key: str, path: str = None) -> 'DedupeIndex':
+        """Siteye ait index: DEDUPE_INDEX_PATH=/tmp/dedupe.bloom → /tmp/dedupe.trendyol.bloom
+
+        Farklı siteleri tarayan işler (ör. Amazon işi ve tüm siteler) birbirinin dosyasını ezmez.
+        """
+        path = os.environ.get('DEDUPE_INDEX_PATH') if path is None else path
+        if path:
+            root, ext = os.path.splitext(path)
+            path = f"{root}.{site_key}{ext}"
+        return cls(path or '')
+
+    def _empty(self):
+        return BloomFilter(self.capacity) if self.path else set()
+
+    def _load(self) -> Optional[BloomFilter]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+
+        mtime = os.path.getmtime(self.path)
+        if time.time() - mtime >= self.max_age:
+            return None
+        try:
+            previous = BloomFilter.load(self.path)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ Dedupe index okunamadı (%s): %s", self.path, e)
+            return None
+        self.started_at = mtime
+        return previous
+
+    def add(self, key: str) -> bool:
+        """Anahtarı ekle; bu taramada ve önceki (devam edilen) taramada görülmediyse True"""
+        with self._lock:
+            if key in self._keys:
+                self.hits += 1
+                return False
+            self._keys.add(key)
+            if self._previous is not None and key in self._previous:
+                self.hits += 1
+                self._carried.append(key)
+                return False
+            return True
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._keys or (self._previous is not None and key in self._previous)
+
+    def drain_carried(self) -> List[str]:
+        """Önceki taramada görüldüğü için atlanan anahtarlar (ürün ID'leri); listeyi sıfırlar"""
+        with self._lock:
+            carried, self._carried = self._carried, []
+        return carried
+
+    def reset(self):
+        """Yeni tarama için temizle"""
+        with self._lock:
+            self.hits = 0
+            self._carried = []
+            self._previous = None
+            self.started_at = time.time()
+            self._keys = self._empty()
+
+    def save(self):
+        """Bloom modunda dosyaya yaz (set modunda bir şey yapmaz)
+
+        Devam edilen taramanın anahtarları korunur ve dosya zamanı taramanın
+        başlangıcında kalır; böylece ardışık taramalar pencereyi uzatmaz.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if self._previous is not None:
+                self._keys.update(self._previous)
+                self._previous = None
+            self._keys.save(self.path, mtime=self.started_at)
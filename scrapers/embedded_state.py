@@ -0,0 +1,103 @@
+import re
+import json
+from typing import Any, Dict, Iterable, List, Optional, Union
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+_decoder = json.JSONDecoder()
+# <script type="application/ld+json"> açılış etiketi (attribute sırası değişebilir)
+_JSON_LD = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>', re.IGNORECASE)
+
+
+def decode_after(text: str, marker: str) -> Optional[Any]:
+    """`marker`dan sonra gelen ilk JSON değerini çöz
+
+    `window.__STATE__ = {...};` veya `<script id="x" type="application/json">{...}`
+    gibi kalıplarda sadece JSON kısmı raw_decode ile okunur; HTML'in geri
+    kalanı ayrıştırılmaz.
+    """
+    index = text.find(marker)
+    if index == -1:
+        return None
+
+    start = index + len(marker)
+    length = len(text)
+    while start < length and text[start] in ' \t\r\n=:':
+        start += 1
+
+    try:
+        value, _ = _decoder.raw_decode(text, start)
+        return value
+    except ValueError as e:
+        logger.debug("⚠️ Gömülü JSON çözülemedi (%s): %s", marker, e)
+        return None
+
+
+def find_state(content: Union[bytes, str], markers: Iterable[str]) -> Optional[Any]:
+    """Sayfadaki ilk çözülebilen gömülü state'i döndür"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+
+    for marker in markers:
+        state = decode_after(content, marker)
+        if state is not None:
+            return state
+    return None
+
+
+def dig(data: Any, *path, default: Any = None) -> Any:
+    """İç içe dict/list'te güvenli yol takibi: dig(state, 'products', 0, 'id')"""
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+        if data is None:
+            return default
+    return data
+
+
+def to_float(value: Any) -> Optional[float]:
+    """JSON fiyat alanını float'a çevir (sayı veya '1299.99' string'i)"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def first_list(state: Any, paths: List[tuple]) -> Optional[list]:
+    """Verilen yollardan ilk liste olanını döndür"""
+    for path in paths:
+        value = dig(state, *path)
+        if isinstance(value, list):
+            return value
+    return None
+
+
+def find_json_ld(content: Union[bytes, str], type_name: str = 'Product') -> Optional[Dict]:
+    """Sayfadaki JSON-LD bloklarından ilk `@type` eşleşen nesne
+
+    Blok tek nesne, liste veya `@graph` olabilir; çözülemeyen bloklar atlanır.
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+
+    for match in _JSON_LD.finditer(content):
+        start = match.end()
+        while start < len(content) and content[start] in ' \t\r\n':
+            start += 1
+        try:
+            value, _ = _decoder.raw_decode(content, start)
+        except ValueError:
+            continue
+        nodes = value if isinstance(value, list) else [value]
+        for node in nodes:
+            candidates = node.get('@graph', [node]) if isinstance(node, dict) else []
+            for candidate in candidates:
+                types = candidate.get('@type') if isinstance(candidate, dict) else None
+                if types == type_name or (isinstance(types, list) and type_name in types):
+                    return candidate
+    return None
@@ -0,0 +1,240 @@
+import os
+import time
+import queue
+import atexit
+import threading
+from typing import Dict, List, Optional
+from logger import get_logger
+from .base_scraper import DEFAULT_CATEGORY
+from .registry import get_site
+
+logger = get_logger(__name__)
+
+_STOP = object()
+_FLUSH = object()
+
+
+class DetailEnricher:
+    """Yeni ve yüksek indirimli ürünlerin detay sayfasından zenginleştirilmesi
+
+    Liste kartında olmayan kategori yolu, satıcı, stok ve referans (liste)
+    fiyatı detay sayfasından okunur (BaseScraper.parse_product_page).
+    `offer()` beklemeden kuyruğa bırakır; kuyruk doluysa ürün atlanır.
+    `concurrency` kadar worker thread'i detay sayfalarını indirir ve
+    liste taraması sürerken bekler (aynı host bütçesini taramayla
+    paylaşmaz). Sonuçlar yazıcı thread'inde `batch_size`'a ulaşınca veya
+    `flush_interval` saniye dolunca toplu yazılır; `db` sadece bu thread'de
+    kullanılır, pipeline'ın bağlantısıyla paylaşılmamalıdır (bkz.
+    get_detail_enricher).
+    """
+
+    def __init__(self, db, concurrency: int = None, min_discount: int = None, max_age: float = None,
+                 batch_size: int = None, flush_interval: float = None, queue_size: int = None):
+        self.db = db
+        # ENRICH_CONCURRENCY=0 sadece paylaşılan zenginleştiriciyi kapatır; doğrudan oluşturulan en az bir worker alır
+        self.concurrency = max(1, concurrency or int(os.environ.get('ENRICH_CONCURRENCY', 0)))
+        # Bu indirimin üstündeki ürünler yeni olmasalar da zenginleştirilir
+        self.min_discount = (min_discount if min_discount is not None
+                             else int(os.environ.get('ENRICH_MIN_DISCOUNT', 70)))
+        # Aynı ürün bu süre (sn) dolmadan tekrar zenginleştirilmez
+        self.max_age = max_age or float(os.environ.get('ENRICH_MAX_AGE_HOURS', 24)) * 3600
+        self.batch_size = batch_size or int(os.environ.get('ENRICH_BATCH_SIZE', 50))
+        self.flush_interval = flush_interval or float(os.environ.get('ENRICH_FLUSH_INTERVAL', 10))
+
+        self._queue = queue.Queue(maxsize=queue_size or int(os.environ.get('ENRICH_QUEUE_SIZE', 500)))
+        self._results = queue.Queue()
+        self._enriched: Dict[str, float] = {}
+        self._stats = {'queued': 0, 'dropped': 0, 'enriched': 0, 'failed': 0, 'written': 0}
+        self._lock = threading.Lock()
+        # Süren liste taraması sayısı; sıfırdan büyükken worker'lar bekler
+        self._crawls = 0
+        self._idle = threading.Condition(self._lock)
+        self._local = threading.local()
+
+        self._workers = [threading.Thread(target=self._work_loop, name=f'enrich-{i}', daemon=True)
+                         for i in range(self.concurrency)]
+        self._writer = threading.Thread(target=self._write_loop, name='enrich-writer', daemon=True)
+        for thread in self._workers + [self._writer]:
+            thread.start()
+
+    def offer(self, products: List[Dict], known=None) -> int:
+        """Kaydedilen ürünlerden yeni (`known` fingerprint cache'inde olmayan) veya
+        yüksek indirimli olanları kuyruğa bırak; kuyruğa giren sayısını döndür"""
+        now = time.monotonic()
+        queued = 0
+        for product in products:
+            is_new = known is None or product['asin'] not in known.fingerprints
+            if not is_new and product.get('discount_percent', 0) < self.min_discount:
+                continue
+            with self._lock:
+                enriched_at = self._enriched.get(product['asin'])
+                if enriched_at is not None and now - enriched_at < self.max_age:
+                    continue
+                # Kuyruktaki ürün tekrar eklenmesin; başarısız olursa kayıt silinir
+                self._enriched[product['asin']] = now
+            if self.submit(product):
+                queued += 1
+        return queued
+
+    def submit(self, product: Dict) -> bool:
+        """Ürünü beklemeden kuyruğa bırak (kuyruk doluysa False)"""
+        try:
+            self._queue.put_nowait(product)
+        except queue.Full:
+            with self._lock:
+                self._stats['dropped'] += 1
+                self._enriched.pop(product['asin'], None)
+            return False
+        with self._lock:
+            self._stats['queued'] += 1
+        return True
+
+    def crawl_started(self):
+        """Liste taraması başladı; worker'lar yeni istek göndermez"""
+        with self._lock:
+            self._crawls += 1
+
+    def crawl_finished(self):
+        with self._lock:
+            self._crawls = max(0, self._crawls - 1)
+            if not self._crawls:
+                self._idle.notify_all()
+
+    def enrich(self, product: Dict) -> Optional[Dict]:
+        """Tek ürünün detay sayfasını indir; yazılacak satırı döndür (okunamazsa None)"""
+        spec = get_site(product['site'])
+        scraper = self._scraper(spec)
+        result = scraper.fetch_page(product['product_url'], scraper.site_name.lower())
+        if not result.ok:
+            return None
+
+        details = scraper.parse_product_page(result.body)
+        if details is None:
+            return None
+
+        path = details['category_path']
+        return {
+            'asin': product['asin'],
+            # Liste kartından gelen varsayılan kategori detay sayfasındaki en özel kategoriyle değişir
+            'category': path[-1][:100] if path and product.get('category') == DEFAULT_CATEGORY else None,
+            'category_path': ' > '.join(path) if path else None,
+            'seller': (details['seller'] or '')[:200] or None,
+            'in_stock': details['in_stock'],
+            'reference_price': round(details['list_price'], 2) if details['list_price'] else None
+        }
+
+    def _scraper(self, spec):
+        # requests.Session thread'ler arasında paylaşılmaz; worker başına site scraper'ı
+        scrapers = getattr(self._local, 'scrapers', None)
+        if scrapers is None:
+            scrapers = self._local.scrapers = {}
+        if spec.key not in scrapers:
+            scraper = scrapers[spec.key] = spec.create()
+            # HTTP cache liste sayfaları içindir
+            scraper.http_cache = None
+        return scrapers[spec.key]
+
+    def _work_loop(self):
+        while True:
+            product = self._queue.get()
+            try:
+                if product is _STOP:
+                    return
+                with self._idle:
+                    while self._crawls:
+                        self._idle.wait()
+                row = self.enrich(product)
+                with self._lock:
+                    self._stats['enriched' if row else 'failed'] += 1
+                    if row is None:
+                        self._enriched.pop(product['asin'], None)
+                if row is not None:
+                    self._results.put(row)
+            except Exception as e:
+                with self._lock:
+                    self._stats['failed'] += 1
+                    self._enriched.pop(product['asin'], None)
+                logger.warning("⚠️  %s zenginleştirilemedi: %s", product.get('asin'), e)
+            finally:
+                self._queue.task_done()
+
+    def _write_loop(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                row = self._results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                row = None
+
+            if isinstance(row, dict):
+                batch.append(row)
+            if row is _STOP or row is _FLUSH or len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                # Satırlar yazıldıktan sonra tamamlanmış sayılır (flush bunu bekler)
+                for _ in batch:
+                    self._results.task_done()
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+            if row is _STOP or row is _FLUSH:
+                self._results.task_done()
+            if row is _STOP:
+                return
+
+    def _write(self, batch: List[Dict]):
+        if not batch:
+            return
+        try:
+            written = self.db.save_enrichments_batch(batch)
+        except Exception as e:
+            logger.error("❌ Zenginleştirme batch'i yazılamadı: %s", e)
+            return
+        with self._lock:
+            self._stats['written'] += written
+        logger.info("🔬 %s ürün detay sayfasından zenginleştirildi", written)
+
+    def flush(self):
+        """Kuyruktaki ürünlerin işlenmesini ve yazılmasını bekle"""
+        self._queue.join()
+        self._results.put(_FLUSH)
+        self._results.join()
+
+    def close(self):
+        for thread in self._workers:
+            if thread.is_alive():
+                self._queue.put(_STOP)
+        for thread in self._workers:
+            thread.join()
+        if self._writer.is_alive():
+            self._results.put(_STOP)
+            self._writer.join()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'pending': self._queue.qsize()}
+
+
+_shared_enrichers: Dict = {}
+_shared_lock = threading.Lock()
+
+
+def get_detail_enricher(db) -> Optional[DetailEnricher]:
+    """Veritabanı başına paylaşılan zenginleştirici (ENRICH_CONCURRENCY=0 veya db yoksa None)
+
+    Varsayılan olarak kapalıdır: açıldığında her yeni/yüksek indirimli ürün
+    için siteye bir detay sayfası isteği daha gider. psycopg2 bağlantısı
+    thread'ler arasında paylaşılmadığı için zenginleştirici aynı veritabanına
+    kendi bağlantısını açar.
+    """
+    if db is None or int(os.environ.get('ENRICH_CONCURRENCY', 0)) <= 0:
+        return None
+    database_url = getattr(db, 'database_url', None)
+    key = database_url or id(db)
+    with _shared_lock:
+        if key not in _shared_enrichers:
+            if database_url:
+                from database import Database
+                db = Database(database_url)
+            enricher = _shared_enrichers[key] = DetailEnricher(db)
+            atexit.register(enricher.close)
+        return _shared_enrichers[key]
@@ -0,0 +1,248 @@
+import os
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Set
+from urllib.parse import urlparse
+from logger import get_logger
+from .block_detector import BLOCK_VERDICTS, CAPTCHA, EMPTY, LOGIN, OK, SOFT_BLOCK
+
+logger = get_logger(__name__)
+
+# Tekrar denenebilecek durum kodları (throttling ve geçici sunucu hataları)
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After başlığı: saniye ya da HTTP tarihi → saniye"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Host başına devre kesici
+
+    Art arda `failure_threshold` başarısız (tekrarları tükenmiş) istekten
+    sonra açılır ve `reset_timeout` saniye boyunca isteklere izin vermez;
+    süre dolunca tek deneme isteği geçer (half-open), başarılıysa devre kapanır.
+    `trip()` eşiği beklemeden açar (ör. captcha / engel sayfası).
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.cooldown = reset_timeout
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half-open' and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Başarısızlığı say; devre bu çağrıyla açıldıysa True döndür"""
+        self.failures += 1
+        if self._probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            self.trip(self.reset_timeout)
+            return True
+        return False
+
+    def trip(self, cooldown: float):
+        """Devreyi hemen aç; `cooldown` saniye sonra half-open"""
+        self.opened_at = time.monotonic()
+        self.cooldown = cooldown
+        self._probing = False
+
+
+class FetchPolicy:
+    """Tekrar deneme, üstel geri çekilme (jitter'lı), Retry-After ve devre kesici
+
+    Senkron (requests) ve asenkron (aiohttp) fetch yolları aynı örneği
+    paylaşır; host başına sayaçlar `stats()` ile okunur. Engel sayfası
+    (captcha, soft block, login yönlendirmesi) aynı kimlikle tekrar denenmez:
+    oturum havuzu varsa istek yeni oturumla tekrarlanır, havuz yoksa veya
+    `block_sessions` farklı oturum engellendiyse host'un devresi
+    `block_cooldown` saniye için açılır ve kuyruktaki sayfalar istek
+    göndermeden bırakılır.
+    """
+
+    def __init__(self, max_attempts: int = None, base_delay: float = None, max_delay: float = None,
+                 failure_threshold: int = None, reset_timeout: float = None, block_cooldown: float = None,
+                 block_sessions: int = None):
+        self.max_attempts = max_attempts or int(os.environ.get('FETCH_MAX_ATTEMPTS', 3))
+        self.base_delay = base_delay if base_delay is not None else float(os.environ.get('FETCH_BACKOFF_BASE', 1))
+        self.max_delay = max_delay if max_delay is not None else float(os.environ.get('FETCH_BACKOFF_MAX', 30))
+        self.failure_threshold = failure_threshold or int(os.environ.get('FETCH_BREAKER_THRESHOLD', 5))
+        self.reset_timeout = reset_timeout if reset_timeout is not None else float(os.environ.get('FETCH_BREAKER_COOLDOWN', 60))
+        self.block_cooldown = block_cooldown if block_cooldown is not None else float(os.environ.get('FETCH_BLOCK_COOLDOWN', 300))
+        # Devreyi açmadan önce engellenebilecek farklı havuz oturumu sayısı
+        self.block_sessions = block_sessions or int(os.environ.get('FETCH_BLOCK_SESSIONS', 3))
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        # Host'un son başarılı cevaptan beri engellediği oturumlar
+        self._blocked_sessions: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str):
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self._stats[host] = {'requests': 0, 'retries': 0, 'throttled': 0, 'failures': 0,
+                                 'short_circuited': 0, 'breaker_opened': 0, 'rotated': 0,
+                                 **{verdict: 0 for verdict in (CAPTCHA, SOFT_BLOCK, LOGIN, EMPTY)}}
+        return self._breakers[host], self._stats[host]
+
+    def allow(self, url: str) -> bool:
+        """Host'un devresi açıksa isteği hiç gönderme"""
+        host = urlparse(url).netloc or url
+        with self._lock:
+            breaker, stats = self._host_state(host)
+            if breaker.allow():
+                stats['requests'] += 1
+                return True
+            stats['short_circuited'] += 1
+        logger.warning("⛔ %s devresi açık, istek atlandı: %s", host, url)
+        return False
+
+    def is_open(self, url: str) -> bool:
+        """İzin alınmış ama henüz gönderilmemiş istek için son kontrol
+
+        Kuyrukta/rate limiter'da beklerken başka bir sayfa engellendiyse
+        istek gönderilmez (short_circuited sayılır).
+        """
+        host = urlparse(url).netloc or url
+        with self._lock:
+            breaker, stats = self._host_state(host)
+            if breaker.state != 'open':
+                return False
+            # allow() bu isteği saymıştı; gönderilmediği için geri alınır
+            stats['requests'] -= 1
+            stats['short_circuited'] += 1
+        logger.debug("⛔ %s devresi açıldı, bekleyen istek bırakıldı: %s", host, url)
+        return True
+
+    def record_verdict(self, url: str, verdict: str, session: str = None) -> bool:
+        """Cevap sınıfını say; engel devreyi açtıysa True döndür
+
+        `session` engellenen havuz oturumunun kimliğidir: havuz oturumu zaten
+        emekliye ayırdığı için False döner ve istek yeni oturumla tekrar
+        denenir. Devre; havuz yoksa, half-open denemesi engellendiyse veya son
+        başarılı cevaptan beri `block_sessions` farklı oturum engellendiyse açılır.
+        """
+        host = urlparse(url).netloc or url
+        with self._lock:
+            if verdict == OK:
+                self._blocked_sessions.pop(host, None)
+                return False
+            breaker, stats = self._host_state(host)
+            stats[verdict] += 1
+            if verdict not in BLOCK_VERDICTS:
+                return False
+            blocked = self._blocked_sessions.setdefault(host, set())
+            if session is not None:
+                blocked.add(session)
+                if breaker.state == 'closed' and len(blocked) < self.block_sessions:
+                    stats['rotated'] += 1
+                    logger.warning("🪪 %s engelledi (%s), yeni oturumla tekrar denenecek (%s/%s): %s",
+                                   host, verdict, len(blocked), self.block_sessions, url)
+                    return False
+            stats['failures'] += 1
+            # Half-open denemesinde veya aynı anda gelen ikinci engelde sayaç bir kez artar
+            if breaker.state != 'open':
+                stats['breaker_opened'] += 1
+                logger.warning("🚫 %s engelledi (%s), %ss duraklatılıyor: %s",
+                               host, verdict, self.block_cooldown, url)
+            breaker.trip(self.block_cooldown)
+            blocked.clear()
+        return True
+
+    def retry_delay(self, url: str, attempt: int, status: int = 0, error: str = None,
+                    headers: Mapping[str, str] = None) -> Optional[float]:
+        """İstek sonucunu kaydet; tekrar denenecekse beklenecek süreyi, değilse None döndür
+
+        `attempt` 1'den başlar. Başarılı veya tekrar denenemez sonuçlarda None döner.
+        """
+        host = urlparse(url).netloc or url
+        retryable = error is not None or status in RETRYABLE_STATUSES
+
+        with self._lock:
+            breaker, stats = self._host_state(host)
+            if not retryable:
+                breaker.record_success()
+                return None
+
+            if status in THROTTLE_STATUSES:
+                stats['throttled'] += 1
+            # Devre kesici denemeleri değil, tekrarlara rağmen başarısız olan istekleri sayar
+            if attempt >= self.max_attempts or breaker.state != 'closed':
+                stats['failures'] += 1
+                if breaker.record_failure():
+                    stats['breaker_opened'] += 1
+                    logger.warning("⛔ %s için devre açıldı (%s art arda başarısız istek), %ss duraklatılıyor",
+                                   host, breaker.failures, self.reset_timeout)
+                return None
+            stats['retries'] += 1
+
+        retry_after = parse_retry_after((headers or {}).get('Retry-After') or (headers or {}).get('retry-after'))
+        if retry_after is not None:
+            # Sunucunun istediği süre; makul olmayan değerlerde devre kesiciye bırak
+            delay = min(retry_after, self.reset_timeout)
+        else:
+            # Full jitter: [0, base * 2^(deneme-1)] aralığında rastgele
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        logger.info("🔁 %s tekrar denenecek (%s. deneme, %s): %.2fs sonra",
+                    host, attempt + 1, error or f"HTTP {status}", delay)
+        return delay
+
+    def stats(self, host: str = None) -> Dict:
+        """Host bazlı sayaçlar (host verilirse sadece o host)"""
+        with self._lock:
+            if host is not None:
+                breaker, stats = self._host_state(host)
+                return {**stats, 'breaker': breaker.state}
+            return {name: {**stats, 'breaker': self._breakers[name].state} for name, stats in self._stats.items()}
+
+
+_shared_policy = None
+_shared_lock = threading.Lock()
+
+
+def get_fetch_policy() -> FetchPolicy:
+    """Süreç genelinde paylaşılan fetch politikası"""
+    global _shared_policy
+    with _shared_lock:
+        if _shared_policy is None:
+            _shared_policy = FetchPolicy()
+        return _shared_policy
@@ -0,0 +1,203 @@
+import os
+import time
+import asyncio
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+import aiohttp
+from logger import get_logger
+from .rate_limiter import HostRateLimiter, get_rate_limiter
+from .http_cache import HttpCache, get_http_cache
+from .fetch_policy import FetchPolicy, get_fetch_policy
+from .session_pool import SessionPool, get_session_pool
+from .block_detector import BLOCK_VERDICTS, OK, classify_response
+
+logger = get_logger(__name__)
+
+# Devre açıkken gönderilmeyen isteğin hatası (tekrar denenmez)
+CIRCUIT_OPEN = 'circuit open'
+
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+class FetchResult:
+    """Tek bir HTTP isteğinin sonucu
+
+    `unchanged`: gövde HTTP cache'teki kopyayla aynı (304 veya aynı özet).
+    `verdict`: parse öncesi sınıf (bkz. block_detector); 'ok' dışındakiler parse edilmez.
+    `session`: isteği gönderen havuz oturumunun kimliği (havuz yoksa None).
+    """
+
+    __slots__ = ('url', 'status', 'body', 'headers', 'elapsed', 'error', 'unchanged', 'verdict', 'session')
+
+    def __init__(self, url: str, status: int = 0, body: bytes = b'', headers: Dict = None,
+                 elapsed: float = 0.0, error: str = None, unchanged: bool = False, verdict: str = OK,
+                 session: str = None):
+        self.url = url
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        self.error = error
+        self.unchanged = unchanged
+        self.verdict = verdict
+        self.session = session
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status == 200 and self.verdict == OK
+
+
+class AsyncFetcher:
+    """aiohttp tabanlı fetch motoru
+
+    Tek bir ClientSession ile bağlantı havuzu ve keep-alive kullanır; host
+    başına eşzamanlı istek sayısı ve paylaşılan HostRateLimiter (nezaket
+    bütçesi) ile sınırlanır. Farklı host'lar birbirini beklemez.
+    `rate_limiter=None` verilirse istekler hiç bekletilmez. HTTP cache
+    (HTTP_CACHE_PATH) açıksa istekler koşullu gider; cache liste sayfaları
+    içindir, detay sayfası çeken işler `cache=None` verir. Geçici hatalar
+    FetchPolicy ile tekrar denenir; `policy=None` tek deneme yapar. Engel
+    sayfası (captcha, soft block, login) politikaya bildirilir: havuz varsa
+    yeni oturumla tekrar denenir, devre açılırsa host'un kalan istekleri
+    gönderilmeden bırakılır.
+    SessionPool (SESSION_POOL_SIZE) açıksa her deneme havuzdan bir oturumun
+    cookie'leri, User-Agent'ı ve proxy'si ile gider.
+    """
+
+    def __init__(self, per_host_concurrency: int = None, rate_limiter: HostRateLimiter = ...,
+                 timeout: int = 30, total_connections: int = 50, cache: HttpCache = ...,
+                 policy: FetchPolicy = ..., session_pool: SessionPool = ...):
+        self.per_host_concurrency = per_host_concurrency or int(os.environ.get('SCRAPING_CONCURRENCY_PER_HOST', 2))
+        self.rate_limiter = get_rate_limiter() if rate_limiter is ... else rate_limiter
+        self.cache = get_http_cache() if cache is ... else cache
+        self.policy = get_fetch_policy() if policy is ... else policy
+        self.session_pool = get_session_pool() if session_pool is ... else session_pool
+        self.timeout = timeout
+        self.total_connections = total_connections
+
+        self.session = None
+        self._semaphores = {}
+        self._host_concurrency = {}
+
+    async def __aenter__(self) -> 'AsyncFetcher':
+        # Host sınırları semaforlarla uygulanır; connector sadece toplamı sınırlar
+        connector = aiohttp.TCPConnector(limit=self.total_connections, ttl_dns_cache=300)
+        # Havuz varken cookie'ler oturum başına tutulur; ortak jar kimlikleri karıştırırdı
+        cookie_jar = aiohttp.DummyCookieJar() if self.session_pool is not None else None
+        self.session = aiohttp.ClientSession(connector=connector, cookie_jar=cookie_jar,
+                                             timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def configure_host(self, host: str, concurrency: int):
+        """Host'a özel eşzamanlı istek sayısı (ilk istekten önce çağrılmalı)"""
+        self._host_concurrency[host] = concurrency
+        self._semaphores.pop(host, None)
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self._host_concurrency.get(host, self.per_host_concurrency))
+        return self._semaphores[host]
+
+    async def fetch(self, url: str, headers: Dict[str, str] = None,
+                    empty_check: Callable[[bytes], bool] = None) -> FetchResult:
+        """URL'i indir; hata durumunda error alanı dolu sonuç döner
+        
+        Geri çekilme beklemesi host semaforu dışında yapılır; bekleyen
+        tekrar deneme diğer sayfaların indirilmesini engellemez. Engellenen
+        havuz oturumu emekliye ayrılır ve istek beklemeden yeni oturumla
+        tekrarlanır. `empty_check` liste sayfalarının sonuçsuz kontrolüdür
+        (bkz. BaseScraper.is_empty_listing).
+        """
+        if self.policy is None:
+            return await self._fetch_once(url, headers, empty_check)
+
+        attempt = 0
+        while True:
+            if not self.policy.allow(url):
+                return FetchResult(url, error=CIRCUIT_OPEN)
+            attempt += 1
+            result = await self._fetch_once(url, headers, empty_check)
+            if result.error == CIRCUIT_OPEN or self.policy.record_verdict(url, result.verdict, result.session):
+                return result
+            if result.verdict in BLOCK_VERDICTS:
+                # Engellenen oturum emekliye ayrıldı; yeni oturumla beklemeden tekrar dene
+                continue
+            delay = self.policy.retry_delay(url, attempt, result.status, result.error, result.headers)
+            if delay is None:
+                return result
+            await asyncio.sleep(delay)
+
+    async def _fetch_once(self, url: str, headers: Dict[str, str] = None,
+                          empty_check: Callable[[bytes], bool] = None) -> FetchResult:
+        host = urlparse(url).netloc
+        semaphore = self._semaphore(host)
+        headers = dict(headers or {})
+        if not HAS_BROTLI and 'Accept-Encoding' in headers:
+            headers['Accept-Encoding'] = 'gzip, deflate'
+        loop = asyncio.get_running_loop()
+        if self.cache is not None:
+            # SQLite ve zlib işleri event loop'u bekletmesin
+            headers.update(await loop.run_in_executor(None, self.cache.conditional_headers, url))
+        pooled = self.session_pool.acquire(url) if self.session_pool is not None else None
+        options = {}
+        if pooled is not None:
+            headers['User-Agent'] = pooled.user_agent
+            options = {'cookies': pooled.cookies_for(url), 'proxy': pooled.proxy}
+
+        async with semaphore:
+            # Semaforu beklerken host engellendiyse rate limiter beklemesine de girme
+            if self.policy is not None and self.policy.is_open(url):
+                return FetchResult(url, error=CIRCUIT_OPEN)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.wait_async(url)
+            start = time.perf_counter()
+            try:
+                async with self.session.get(url, headers=headers, **options) as response:
+                    body = await response.read()
+                    logger.debug("🌐 %s - Status: %s (%.2fs)", host, response.status, time.perf_counter() - start)
+                    result = self._result(url, response.status, body, dict(response.headers),
+                                          time.perf_counter() - start, str(response.url), empty_check)
+                    if pooled is not None:
+                        result.session = pooled.id
+                        pooled.store_cookies(url, response.cookies)
+                        self.session_pool.record(pooled, url, response.status, result.verdict)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error("❌ Request hatası (%s): %s", host, e)
+                error = str(e) or type(e).__name__
+                if pooled is not None:
+                    self.session_pool.record(pooled, url, error=error)
+                return FetchResult(url, elapsed=time.perf_counter() - start, error=error)
+
+        if self.cache is not None and result.verdict == OK:
+            result = await loop.run_in_executor(None, self._revalidate, result)
+        return result
+
+    def _result(self, url: str, status: int, body: bytes, headers: Dict, elapsed: float,
+                final_url: str = None, empty_check: Callable[[bytes], bool] = None) -> FetchResult:
+        """Cevabı parse etmeden sınıflandır (bkz. block_detector)"""
+        verdict = classify_response(status, body, final_url or url, headers, empty_check)
+        return FetchResult(url, status, body, headers, elapsed, verdict=verdict)
+
+    def _revalidate(self, result: FetchResult) -> FetchResult:
+        """Cevabı cache'le eşleştir: 304 → saklanan gövde, 200 → kaydet ve karşılaştır
+
+        Engel/boş sayfalar buraya gelmez, cache'e yazılmaz.
+        """
+        if result.status == 304:
+            cached = self.cache.body(result.url)
+            if cached is not None:
+                return FetchResult(result.url, 200, cached, result.headers, result.elapsed, unchanged=True)
+        elif result.status == 200:
+            result.unchanged = not self.cache.store(result.url, result.body, result.headers)
+        return result
+
+    async def fetch_all(self, requests: List[Dict]) -> List[FetchResult]:
+        """[{url, headers}] listesini eşzamanlı indir (sıra korunur)"""
+        return await asyncio.gather(*(self.fetch(r['url'], r.get('headers')) for r in requests))
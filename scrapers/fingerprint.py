@@ -0,0 +1,60 @@
+import hashlib
+import threading
+from typing import Dict, List
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def product_fingerprint(title: str, current_price: float, list_price: float) -> str:
+    """Kartın anahtar alanlarının özeti (products.fingerprint, 32 hex)
+
+    Fiyatlar kuruş hassasiyetinde normalize edilir; DOM ve gömülü state
+    yolları aynı ürün için aynı değeri üretir.
+    """
+    normalized = f"{' '.join((title or '').split()).lower()}|{float(current_price):.2f}|{float(list_price):.2f}"
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class FingerprintCache:
+    """Ürün başına son görülen fingerprint (products tablosundan yüklenir)
+
+    Tarama sırasında değişmeyen ürünlerin ID'leri toplanır; bunlar tam
+    upsert yerine toplu `last_seen` güncellemesi alır.
+    """
+
+    def __init__(self, fingerprints: Dict[str, str] = None):
+        self.fingerprints = dict(fingerprints or {})
+        self._unchanged = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_database(cls, db) -> 'FingerprintCache':
+        cache = cls(db.get_fingerprints())
+        logger.info("🧬 %s ürün fingerprint'i yüklendi", len(cache.fingerprints))
+        return cache
+
+    def is_unchanged(self, asin: str, fingerprint: str) -> bool:
+        """Ürün son taramadakiyle aynıysa işaretle ve True döndür"""
+        if self.fingerprints.get(asin) != fingerprint:
+            return False
+        with self._lock:
+            self._unchanged.append(asin)
+        return True
+
+    def mark_unchanged(self, asins: List[str]):
+        """Parse edilmeden değişmediği bilinen ürünleri (ör. aynı kalan sayfa) işaretle"""
+        with self._lock:
+            self._unchanged.extend(asins)
+
+    def update(self, products: List[Dict]):
+        """Kaydedilen ürünlerin yeni fingerprint'lerini hatırla"""
+        for product in products:
+            if product.get('fingerprint'):
+                self.fingerprints[product['asin']] = product['fingerprint']
+
+    def drain_unchanged(self) -> List[str]:
+        """Bu taramada değişmeden görülen ürün ID'lerini al ve listeyi sıfırla"""
+        with self._lock:
+            unchanged, self._unchanged = self._unchanged, []
+        return unchanged
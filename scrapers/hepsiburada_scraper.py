@@ -1,32 +1,64 @@
-from .base_scraper import BaseScraper
-from typing import List, Dict
+from .base_scraper import BaseScraper, DEFAULT_CATEGORY
+from .registry import register_site
+from .embedded_state import dig, first_list, to_float
+from .fingerprint import product_fingerprint
+from typing import Any, List, Dict, Optional
+from logger import get_logger
 
+logger = get_logger(__name__)
+
+@register_site('hepsiburada', max_pages=2)
 class HepsiburadaScraper(BaseScraper):
     """Hepsiburada indirimli ürün scraper'ı"""
     
-    def __init__(self):
-        super().__init__()
-        self.site_name = "Hepsiburada"
-        self.base_url = "https://www.hepsiburada.com"
-        self.found_urls = set()
+    site_name = "Hepsiburada"
+    base_url = "https://www.hepsiburada.com"
+    state_markers = ['<script id="reduxStore" type="application/json">', 'window.__INITIAL_STATE__']
+    empty_listing_markers = ['sonuç bulunamadı'.encode(), 'ürün bulunamadı'.encode()]
+    results_container_marker = b'productlistcontent-wrapper'
+    card_markers = [b'productlistcontent-item', b'data-test-id="product-card"']
+    detail_selectors = {
+        'price': ['[data-test-id="price-current-price"]', '#offering-price', '.product-price'],
+        'list_price': ['[data-test-id="prev-price"]', '#originalPrice', '.price-old'],
+        'breadcrumb': ['[data-test-id="breadcrumb"] a', '.breadcrumbs a'],
+        'seller': ['[data-test-id="merchant-name"]', '.merchant-name'],
+        'out_of_stock': ['[data-test-id="out-of-stock"]', '.out-of-stock']
+    }
     
-    def scrape_page(self, page: int = 1) -> List[Dict]:
-        """Hepsiburada kampanyalar sayfasını scrape et"""
-        print(f"\n🛒 {self.site_name} sayfa {page} taranıyor...")
-        
-        # Kampanyalar sayfası
+    def page_url(self, page: int) -> str:
+        """Kampanyalar sayfası URL'i"""
         if page == 1:
-            url = "https://www.hepsiburada.com/kampanyalar"
-        else:
-            url = f"https://www.hepsiburada.com/kampanyalar?sayfa={page}"
-        
-        soup = self.get_html(url, "hepsiburada")
-        if not soup:
-            return []
-        
-        # Debug HTML kaydet
-        self.save_debug_html(str(soup), "hepsiburada", page)
+            return "https://www.hepsiburada.com/kampanyalar"
+        return f"https://www.hepsiburada.com/kampanyalar?sayfa={page}"
+    
+    def state_items(self, state: Any) -> Optional[List]:
+        """Liste state'indeki ürünler"""
+        return first_list(state, [('productList', 'products'), ('products',)])
+    
+    def product_from_state(self, item: Dict) -> Optional[Dict]:
+        """Hepsiburada state ürününü ürün dict'ine çevir"""
+        title = item.get('name')
+        href = item.get('url')
+        current_price = to_float(dig(item, 'price', 'current'))
+        old_price = to_float(dig(item, 'price', 'original'))
+        if not title or not href or not current_price or not old_price:
+            return None
         
+        return {
+            'title': title,
+            'current_price': current_price,
+            'list_price': old_price,
+            'product_url': href if href.startswith('http') else self.build_full_url(self.base_url, href),
+            'image_url': item.get('image') or '',
+            'category': item.get('categoryName') or DEFAULT_CATEGORY,
+            'brand': item.get('brand'),
+            'site_product_id': item.get('sku'),
+            'rating': to_float(item.get('rating')),
+            'rating_count': item.get('reviewCount')
+        }
+    
+    def parse_page(self, soup, page: int = 1) -> List[Dict]:
+        """Hepsiburada kampanyalar sayfasını parse et"""
         # Ürün kartlarını bul
         product_selectors = [
             'li.productListContent-item',
@@ -43,76 +75,60 @@ class HepsiburadaScraper(BaseScraper):
         
         for i, card in enumerate(product_cards[:20]):  # Max 20 ürün/sayfa
             try:
-                print(f"\n--- {self.site_name} Ürün {i+1} ---")
+                logger.debug("--- %s Ürün %s ---", self.site_name, i + 1)
                 
-                # 1. Başlık
-                title_selectors = [
-                    'h3[data-test-id="product-card-name"]',
-                    '.product-title',
-                    '.product-name',
-                    'h3'
-                ]
-                title_elements = self.extract_multiple_selectors(card, title_selectors, "başlık")
-                if not title_elements:
-                    self.log_product_skipped(self.site_name, "Başlık bulunamadı")
-                    continue
-                
-                title = self.extract_text_safe(title_elements[0])
-                print(f"📝 Başlık: {title[:60]}...")
-                
-                # 2. Link
+                # 1. Link
                 link_selectors = [
                     'a.product-card',
                     'a[data-test-id="product-card-link"]',
                     'a'
                 ]
-                link_elements = self.extract_multiple_selectors(card, link_selectors, "link")
+                link_element = self.extract_first(card, link_selectors, "link")
                 product_url = ""
-                if link_elements:
-                    href = self.extract_attr_safe(link_elements[0], 'href')
+                if link_element is not None:
+                    href = self.extract_attr_safe(link_element, 'href')
                     # Hepsiburada genelde tam URL verir
                     product_url = href if href.startswith('http') else self.build_full_url(self.base_url, href)
                 
-                # Duplicate kontrol
-                if product_url in self.found_urls:
+                # Duplicate kontrol (aynı ürünün diğer URL varyantları dahil, kart daha fazla parse edilmeden)
+                if self.is_duplicate(product_url):
                     self.log_product_skipped(self.site_name, "Duplicate ürün")
                     continue
                 
+                # 2. Başlık
+                title_selectors = [
+                    'h3[data-test-id="product-card-name"]',
+                    '.product-title',
+                    '.product-name',
+                    'h3'
+                ]
+                title_element = self.extract_first(card, title_selectors, "başlık")
+                if title_element is None:
+                    self.log_product_skipped(self.site_name, "Başlık bulunamadı")
+                    continue
+                
+                title = self.extract_text_safe(title_element)
+                logger.debug("📝 Başlık: %s...", title[:60])
+                
                 # 3. Mevcut fiyat
-                current_price = None
                 price_selectors = [
                     'div[data-test-id="price-current-price"]',
                     '.current-price',
                     '.price-current',
                     '.product-price'
                 ]
-                
-                for selector in price_selectors:
-                    price_elements = card.select(selector)
-                    if price_elements:
-                        price_text = self.extract_text_safe(price_elements[0])
-                        current_price = self.parse_price(price_text)
-                        if current_price:
-                            print(f"💰 Mevcut fiyat: {current_price}₺")
-                            break
+                current_price = self.extract_first(card, price_selectors, "mevcut fiyat", parse=self.element_price)
+                logger.debug("💰 Mevcut fiyat: %s₺", current_price)
                 
                 # 4. Eski fiyat
-                old_price = None
                 old_price_selectors = [
                     'div[data-test-id="price-old-price"]',
                     '.old-price',
                     '.price-old',
                     '.original-price'
                 ]
-                
-                for selector in old_price_selectors:
-                    old_price_elements = card.select(selector)
-                    if old_price_elements:
-                        old_price_text = self.extract_text_safe(old_price_elements[0])
-                        old_price = self.parse_price(old_price_text)
-                        if old_price:
-                            print(f"🏷️ Eski fiyat: {old_price}₺")
-                            break
+                old_price = self.extract_first(card, old_price_selectors, "eski fiyat", parse=self.element_price)
+                logger.debug("🏷️ Eski fiyat: %s₺", old_price)
                 
                 # 5. İndirim hesaplama
                 if not current_price:
@@ -123,6 +139,12 @@ class HepsiburadaScraper(BaseScraper):
                     self.log_product_skipped(self.site_name, "Eski fiyat bulunamadı")
                     continue
                 
+                # Son taramadan beri değişmediyse kalan çıkarım ve DB yazımı atlanır
+                asin = self.generate_product_id(self.site_name, product_url)
+                fingerprint = product_fingerprint(title, current_price, old_price)
+                if self.is_unchanged(asin, fingerprint):
+                    continue
+                
                 discount_percent = self.calculate_discount(old_price, current_price)
                 
                 if not self.is_valid_deal(discount_percent, min_discount=40):
@@ -135,58 +157,32 @@ class HepsiburadaScraper(BaseScraper):
                     '.product-image img',
                     'img'
                 ]
-                img_elements = self.extract_multiple_selectors(card, img_selectors, "resim")
+                img_element = self.extract_first(card, img_selectors, "resim")
                 image_url = ""
-                if img_elements:
-                    image_url = self.extract_attr_safe(img_elements[0], 'src') or \
-                               self.extract_attr_safe(img_elements[0], 'data-src')
+                if img_element is not None:
+                    image_url = self.extract_attr_safe(img_element, 'src') or \
+                               self.extract_attr_safe(img_element, 'data-src')
                 
                 # 7. Ürün verisi oluştur
                 product_data = {
-                    'asin': self.generate_product_id(self.site_name, product_url),
+                    'asin': asin,
                     'title': title,
                     'current_price': current_price,
                     'list_price': old_price,
                     'discount_percent': discount_percent,
                     'product_url': product_url,
                     'image_url': image_url,
-                    'category': 'Elektronik',
-                    'site_name': self.site_name
+                    'category': DEFAULT_CATEGORY,
+                    'site_name': self.site_name,
+                    'fingerprint': fingerprint
                 }
                 
                 found_products.append(product_data)
-                self.found_urls.add(product_url)
                 self.log_product_found(self.site_name, title, discount_percent, current_price)
                 
-                # Rate limiting
-                self.wait_between_requests(2, 3)
-                
             except Exception as e:
                 self.log_error(self.site_name, f"Ürün {i+1} işleme hatası: {e}")
                 continue
         
-        print(f"\n🎯 {self.site_name} sayfa {page}: {len(found_products)} ürün bulundu")
+        logger.info("🎯 %s sayfa %s: %s ürün bulundu", self.site_name, page, len(found_products))
         return found_products
-    
-    def scrape(self, max_pages: int = 2) -> List[Dict]:
-        """Hepsiburada'dan tüm indirimleri scrape et"""
-        print(f"\n🚀 {self.site_name} scraping başlıyor...")
-        
-        all_products = []
-        self.found_urls.clear()
-        
-        for page in range(1, max_pages + 1):
-            try:
-                products = self.scrape_page(page)
-                all_products.extend(products)
-                
-                # Sayfalar arası bekleme
-                if page < max_pages:
-                    self.wait_between_requests(3, 5)
-                    
-            except Exception as e:
-                self.log_error(self.site_name, f"Sayfa {page} hatası: {e}")
-                continue
-        
-        print(f"\n✅ {self.site_name} tamamlandı: {len(all_products)} ürün")
-        return all_products
\ No newline at end of file
@@ -0,0 +1,98 @@
+import os
+from functools import lru_cache
+from typing import Any, List, Optional, Union
+from bs4 import BeautifulSoup
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+BACKENDS = ['selectolax', 'lxml', 'html.parser']
+
+
+class SelectolaxNode:
+    """selectolax node'unu scraper'ların kullandığı BeautifulSoup arayüzüyle sar
+
+    Scraper'lar yalnızca select / select_one / get_text / get kullanır;
+    BS4 backend'lerinde Tag nesneleri aynı arayüzü zaten sağlar.
+    """
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector: str) -> List['SelectolaxNode']:
+        return [SelectolaxNode(n) for n in self.node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional['SelectolaxNode']:
+        found = self.node.css_first(selector)
+        return SelectolaxNode(found) if found is not None else None
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        if strip and separator:
+            # BS4 gibi: boşluktan ibaret metin düğümleri ayırıcıyla birleştirilmez
+            pieces = (node.text_content.strip() for node in self.node.traverse(include_text=True) if node.tag == '-text')
+            return separator.join(piece for piece in pieces if piece)
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+    def get(self, attr: str, default: Any = None) -> Any:
+        value = self.node.attributes.get(attr)
+        return default if value is None else value
+
+    def __str__(self) -> str:
+        return self.node.html or ''
+
+
+def available_backends() -> List[str]:
+    """Kurulu parser backend'leri (hızlıdan yavaşa)"""
+    backends = []
+    if LexborHTMLParser is not None:
+        backends.append('selectolax')
+    if HAS_LXML:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+
+def resolve_backend(backend: str = None) -> str:
+    """İstenen backend'i (veya HTML_PARSER env'ini) kurulu olanlara göre çöz"""
+    return _resolve((backend or os.environ.get('HTML_PARSER', 'auto')).lower())
+
+
+@lru_cache(maxsize=None)
+def _resolve(backend: str) -> str:
+    available = available_backends()
+
+    if backend == 'auto':
+        return available[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen HTML parser: {backend}")
+    if backend not in available:
+        logger.warning("⚠️ %s kurulu değil, %s kullanılıyor", backend, available[0])
+        return available[0]
+    return backend
+
+
+def parse_html(content: Union[bytes, str], backend: str = None):
+    """HTML'i seçilen backend ile ayrıştır
+
+    Dönen belge select/select_one/get_text/get destekler.
+    """
+    backend = resolve_backend(backend)
+
+    if backend == 'selectolax':
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
+        return SelectolaxNode(LexborHTMLParser(content).root)
+    return BeautifulSoup(content, backend)
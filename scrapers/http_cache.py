@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Mapping, Optional
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class HttpCache:
+    """Liste sayfaları için disk üzerinde HTTP cache'i (SQLite index, zlib gövde)
+
+    Site ETag/Last-Modified verdiyse sonraki istek koşullu gider; 304 veya
+    aynı gövde özeti sayfanın değişmediğini gösterir. Sayfadan çıkan ürün
+    ID'leri de saklanır ki değişmeyen sayfa parse edilmeden bu ürünler
+    "görüldü" işaretlenebilsin. Sıkıştırılmış gövdelerin toplamı `max_bytes`'ı
+    aşınca en uzun süredir kullanılmayan kayıtlar silinir (LRU).
+    """
+
+    def __init__(self, path: str, max_bytes: int = None):
+        self.path = path
+        self.max_bytes = max_bytes or int(float(os.environ.get('HTTP_CACHE_MAX_MB', 200)) * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                items TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Önceki cevabın doğrulayıcılarından If-None-Match / If-Modified-Since"""
+        with self._lock:
+            row = self.conn.execute("SELECT etag, last_modified FROM responses WHERE url = ?", (url,)).fetchone()
+        if not row:
+            return {}
+
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def body(self, url: str) -> Optional[bytes]:
+        """304 cevabı için saklanan gövde"""
+        with self._lock:
+            row = self.conn.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+            if not row:
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.hits += 1
+        return zlib.decompress(row[0])
+
+    def store(self, url: str, body: bytes, headers: Mapping[str, str] = None) -> bool:
+        """200 cevabını kaydet; gövde öncekiyle aynıysa False döndür"""
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        etag, last_modified = headers.get('etag'), headers.get('last-modified')
+        digest = body_hash(body)
+        now = time.time()
+
+        with self._lock:
+            row = self.conn.execute("SELECT body_hash FROM responses WHERE url = ?", (url,)).fetchone()
+            if row and row[0] == digest:
+                self.conn.execute(
+                    "UPDATE responses SET etag = ?, last_modified = ?, accessed_at = ? WHERE url = ?",
+                    (etag, last_modified, now, url)
+                )
+                self.hits += 1
+                return False
+
+            compressed = zlib.compress(body, 6)
+            self.conn.execute("""
+                INSERT OR REPLACE INTO responses
+                    (url, etag, last_modified, body_hash, body, size, items, stored_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?)
+            """, (url, etag, last_modified, digest, compressed, len(compressed), now, now))
+            self.misses += 1
+            self._evict()
+        return True
+
+    def remember_items(self, url: str, ids: List[str]):
+        """Sayfanın son parse'ında çıkan ürün ID'leri"""
+        with self._lock:
+            self.conn.execute("UPDATE responses SET items = ? WHERE url = ?", (json.dumps(ids), url))
+
+    def items(self, url: str) -> Optional[List[str]]:
+        with self._lock:
+            row = self.conn.execute("SELECT items FROM responses WHERE url = ?", (url,)).fetchone()
+        if not row or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+        self.conn.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        logger.debug("🗑️ HTTP cache: %s kayıt silindi", len(evicted))
+
+    def close(self):
+        self.conn.close()
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """HTTP_CACHE_PATH tanımlıysa süreç genelinde paylaşılan cache, değilse None"""
+    global _shared_cache
+    path = os.environ.get('HTTP_CACHE_PATH')
+    if not path:
+        return None
+    with _shared_lock:
+        if _shared_cache is None or _shared_cache.path != path:
+            _shared_cache = HttpCache(path)
+        return _shared_cache
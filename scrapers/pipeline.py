@@ -0,0 +1,361 @@
+import os
+import time
+import asyncio
+import threading
+from functools import partial
+from typing import Dict, List
+from logger import get_logger
+from .fetcher import AsyncFetcher
+from .dedupe import DedupeIndex
+from .fingerprint import FingerprintCache
+from .rate_limiter import get_rate_limiter
+from .registry import SiteSpec
+from .base_scraper import DEFAULT_CATEGORY
+from .enrichment import get_detail_enricher
+from .block_detector import BLOCK_VERDICTS, OK
+
+logger = get_logger(__name__)
+
+_DONE = object()
+
+# Süren liste taramaları (süreç geneli); yeniden tarama bu sırada istek göndermez
+_active_crawls = 0
+_active_lock = threading.Lock()
+
+
+def crawl_in_progress() -> bool:
+    """Bu süreçte bir liste taraması sürüyor mu?"""
+    with _active_lock:
+        return _active_crawls > 0
+
+
+def _track_crawl(delta: int):
+    global _active_crawls
+    with _active_lock:
+        _active_crawls += delta
+
+
+class _ParsedPage:
+    """Yazma kuyruğunda sayfanın son ürününden sonra gelen işaret
+
+    Sayfanın ürün ID'leri HTTP cache'e ancak ürünleri veritabanına yazılınca
+    kaydedilir; yoksa yazılamayan ürünlerin sayfası sonraki taramada "değişmedi"
+    sayılıp hiç parse edilmezdi.
+    """
+
+    __slots__ = ('scraper', 'url', 'ids')
+
+    def __init__(self, scraper, url: str, ids: List[str]):
+        self.scraper = scraper
+        self.url = url
+        self.ids = ids
+
+
+def normalize_product(product: Dict, site_key: str) -> Dict:
+    """Site bağımsız ürün biçimi: boşlukları sadeleştir, fiyatları yuvarla, site anahtarını ekle"""
+    product['title'] = ' '.join((product.get('title') or '').split())
+    product['current_price'] = round(float(product['current_price']), 2)
+    product['list_price'] = round(float(product['list_price']), 2)
+    product['discount_percent'] = int(product['discount_percent'])
+    product['image_url'] = product.get('image_url') or ''
+    product['category'] = (product.get('category') or DEFAULT_CATEGORY)[:100]
+    product['site'] = site_key
+    return product
+
+
+def apply_site_budgets(fetcher: AsyncFetcher, sites: List[SiteSpec]):
+    """Sitelerin host bütçelerini paylaşılan sınırlayıcıya ve fetcher'a uygula"""
+    limiter = get_rate_limiter()
+    for spec in sites:
+        if spec.min_delay is not None or spec.max_delay is not None or spec.burst:
+            limiter.configure(spec.host, spec.min_delay, spec.max_delay, spec.burst)
+        if spec.concurrency:
+            fetcher.configure_host(spec.host, spec.concurrency)
+
+
+class StageMetrics:
+    """Tek aşamanın sayaçları: işlenen öğe, hata, meşgul süre, kuyruk derinliği"""
+
+    __slots__ = ('name', 'items', 'outputs', 'errors', 'busy', 'max_queue')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.outputs = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.max_queue = 0
+
+    def record(self, elapsed: float, outputs: int = 0, error: bool = False):
+        self.items += 1
+        self.outputs += outputs
+        self.busy += elapsed
+        if error:
+            self.errors += 1
+
+    def observe_queue(self, queue: asyncio.Queue):
+        self.max_queue = max(self.max_queue, queue.qsize())
+
+    def as_dict(self) -> Dict:
+        return {
+            'items': self.items,
+            'outputs': self.outputs,
+            'errors': self.errors,
+            'busy_s': round(self.busy, 3),
+            'max_queue_depth': self.max_queue
+        }
+
+
+class CrawlPipeline:
+    """Kayıtlı siteleri eşzamanlı tarayan akış
+
+    fetch → parse → normalize/dedupe → toplu yazım aşamaları sınırlı
+    kuyruklarla bağlıdır: yazıcı geride kalırsa parse, parse geride kalırsa
+    fetch bekler (backpressure). Ürünler `batch_size`'a ulaşınca veya
+    `flush_interval` saniye dolunca veritabanına yazılır; tarama sonunda
+    bellekte ürün listesi tutulmaz (`keep_products=True` hariç).
+    """
+
+    def __init__(self, db, sites: List[SiteSpec], batch_size: int = None, flush_interval: float = None,
+                 parse_workers: int = None, queue_size: int = None, keep_products: bool = False):
+        self.db = db
+        self.sites = sites
+        self.batch_size = batch_size or int(os.environ.get('PIPELINE_BATCH_SIZE', 100))
+        self.flush_interval = flush_interval or float(os.environ.get('PIPELINE_FLUSH_INTERVAL', 2))
+        self.parse_workers = parse_workers or int(os.environ.get('PIPELINE_PARSE_WORKERS', 2))
+        self.queue_size = queue_size or int(os.environ.get('PIPELINE_QUEUE_SIZE', 8))
+        self.keep_products = keep_products
+
+    def run(self) -> Dict:
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> Dict:
+        results = {spec.key: {'products': [], 'count': 0, 'success': False, 'error': None, 'blocked': None}
+                   for spec in self.sites}
+        results.update({
+            'sites': [spec.key for spec in self.sites],
+            'products': [],
+            'total_products': 0,
+            'total_saved': 0,
+            'total_unchanged': 0,
+            'scrape_time': 0,
+            'errors': []
+        })
+        self.results = results
+        self.metrics = {name: StageMetrics(name) for name in ('fetch', 'parse', 'write')}
+        self._pages_ok = {spec.key: 0 for spec in self.sites}
+        self._write_failed = False
+        start_time = time.time()
+
+        self.fingerprints = FingerprintCache.from_database(self.db) if self.db else None
+        # Site başına index: başka işlerin (ör. saatlik Amazon taraması) dosyasını ezmez
+        self.dedupe = {spec.key: DedupeIndex.for_site(spec.key) for spec in self.sites}
+
+        # Sayfa kuyruğu küçük (gövdeler büyük), ürün kuyruğu bir-iki batch kadar
+        pages = asyncio.Queue(maxsize=self.queue_size)
+        products = asyncio.Queue(maxsize=self.batch_size * 2)
+
+        # Detay sayfası işleri (zenginleştirme, yeniden tarama) tarama sürerken istek göndermez
+        self.enricher = get_detail_enricher(self.db)
+        if self.enricher is not None:
+            self.enricher.crawl_started()
+        _track_crawl(1)
+        try:
+            async with AsyncFetcher() as fetcher:
+                policy, sessions = fetcher.policy, fetcher.session_pool
+                self._apply_budgets(fetcher)
+                scrapers = [(spec, self._create_scraper(spec)) for spec in self.sites]
+
+                writer = asyncio.create_task(self._write_stage(products))
+                parsers = [asyncio.create_task(self._parse_stage(pages, products)) for _ in range(self.parse_workers)]
+                try:
+                    await asyncio.gather(*(
+                        self._fetch_stage(fetcher, spec, scraper, page, pages)
+                        for spec, scraper in scrapers
+                        for page in scraper.listing_pages(spec.max_pages)
+                    ))
+
+                    for _ in parsers:
+                        await pages.put(_DONE)
+                    await asyncio.gather(*parsers)
+                    await products.put(_DONE)
+                    await writer
+                finally:
+                    # Bir aşama hata verirse diğerleri kuyrukta beklemeye devam etmesin
+                    for task in (writer, *parsers):
+                        task.cancel()
+        finally:
+            _track_crawl(-1)
+            if self.enricher is not None:
+                self.enricher.crawl_finished()
+
+        for index in self.dedupe.values():
+            index.save()
+        logger.info("🧹 Dedupe: %s tekrar eden ürün atlandı", sum(index.hits for index in self.dedupe.values()))
+
+        for spec in self.sites:
+            site = results[spec.key]
+            site['success'] = self._pages_ok[spec.key] > 0
+            if policy is not None:
+                # Tekrar deneme, throttling ve devre kesici sayaçları
+                site['fetch'] = policy.stats(spec.host)
+            if sessions is not None:
+                # Oturum başına istek, başarı oranı ve emekliye ayrılanlar
+                site['sessions'] = sessions.stats(spec.host).get(spec.host)
+            if not site['success'] and not site['error'] and site['blocked']:
+                site['error'] = f"{spec.scraper_cls.site_name} scraping hatası: site engelledi ({site['blocked']})"
+            if not site['success'] and not site['error']:
+                site['error'] = f"{spec.scraper_cls.site_name} scraping hatası: hiçbir sayfa indirilemedi"
+            if site['error'] and site['error'] not in results['errors']:
+                results['errors'].append(site['error'])
+
+        results['stages'] = {name: metrics.as_dict() for name, metrics in self.metrics.items()}
+        if self.enricher is not None:
+            results['enrichment'] = self.enricher.stats()
+        results['scrape_time'] = round(time.time() - start_time, 2)
+        for name, metrics in self.metrics.items():
+            logger.info("📊 %s aşaması: %s", name, metrics.as_dict())
+        return results
+
+    def _apply_budgets(self, fetcher: AsyncFetcher):
+        apply_site_budgets(fetcher, self.sites)
+
+    def _create_scraper(self, spec: SiteSpec):
+        scraper = spec.create()
+        scraper.fingerprints = self.fingerprints
+        scraper.dedupe = self.dedupe[spec.key]
+        return scraper
+
+    async def _fetch_stage(self, fetcher: AsyncFetcher, spec: SiteSpec, scraper, page,
+                           pages: asyncio.Queue):
+        """Sayfayı indir ve parse kuyruğuna bırak (kuyruk doluysa bekler)"""
+        url = scraper.page_url(page)
+        site_name = scraper.site_name.lower()
+        logger.info("🔎 %s sayfa %s taranıyor...", scraper.site_name, page)
+
+        start = time.perf_counter()
+        if spec.fetch == 'http':
+            result = await fetcher.fetch(url, scraper.get_headers(site_name), scraper.is_empty_listing)
+            if result.verdict == OK and not result.ok and not result.error:
+                logger.warning("❌ HTTP %s: %s", result.status, url)
+        else:
+            # Senkron fetch (requests) kullanan siteler thread'de indirilir
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, partial(scraper.fetch_page, url, site_name,
+                                                              empty_check=scraper.is_empty_listing))
+        self.metrics['fetch'].record(time.perf_counter() - start, outputs=int(result.ok), error=not result.ok)
+
+        if result.verdict in BLOCK_VERDICTS:
+            # Host'un devresi açıldı (havuz yoksa ilk engelde); sitenin kalan sayfaları istek göndermeden biter
+            self.results[spec.key]['blocked'] = result.verdict
+        if result.verdict != OK:
+            logger.warning("🚫 %s sayfa %s atlandı (%s)", scraper.site_name, page, result.verdict)
+            scraper._capture(result, page, failed=True, reason=result.verdict)
+        if result.ok:
+            await pages.put((spec, scraper, page, result))
+            self.metrics['fetch'].observe_queue(pages)
+
+    async def _parse_stage(self, pages: asyncio.Queue, products: asyncio.Queue):
+        """Sayfaları thread havuzunda parse et, ürünleri yazma kuyruğuna aktar"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await pages.get()
+            if item is _DONE:
+                return
+            spec, scraper, page, result = item
+
+            start = time.perf_counter()
+            try:
+                # Parse CPU işidir; event loop indirmeye devam etsin
+                parsed, ids = await loop.run_in_executor(None, scraper.parse_listing, result, page)
+            except Exception as e:
+                self.metrics['parse'].record(time.perf_counter() - start, error=True)
+                scraper.log_error(scraper.site_name, f"Sayfa {page} hatası: {e}")
+                self.results[spec.key]['error'] = f"{scraper.site_name} scraping hatası: {e}"
+                continue
+            self.metrics['parse'].record(time.perf_counter() - start, outputs=len(parsed))
+            self._pages_ok[spec.key] += 1
+
+            site = self.results[spec.key]
+            for product in parsed:
+                product = normalize_product(product, spec.key)
+                site['count'] += 1
+                if self.keep_products:
+                    site['products'].append(product)
+                    self.results['products'].append(product)
+                await products.put(product)
+                self.metrics['parse'].observe_queue(products)
+            if ids is not None and scraper.http_cache is not None:
+                await products.put(_ParsedPage(scraper, result.url, ids))
+
+    async def _write_stage(self, products: asyncio.Queue):
+        """Ürünleri batch'lere topla; batch dolunca veya süre dolunca yaz"""
+        loop = asyncio.get_running_loop()
+        batch, parsed_pages = [], []
+        deadline = loop.time() + self.flush_interval
+        while True:
+            try:
+                item = await asyncio.wait_for(products.get(), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                item = None
+
+            if isinstance(item, _ParsedPage):
+                parsed_pages.append(item)
+            elif item is not None and item is not _DONE:
+                batch.append(item)
+                self.results['total_products'] += 1
+
+            if item is _DONE or len(batch) >= self.batch_size or loop.time() >= deadline:
+                try:
+                    await self._flush(batch)
+                except Exception as e:
+                    # Yazıcı durursa parse aşaması dolu kuyrukta sonsuza dek bekler; _DONE'a kadar okumaya devam et
+                    logger.error("❌ %s ürünlük batch yazılamadı: %s", len(batch), e)
+                    self.metrics['write'].record(0.0, error=True)
+                    self.results['errors'].append(f"DB kaydetme hatası: {e}")
+                    self._write_failed = True
+                # Bir sayfanın ürünleri önceki batch'lere de düşmüş olabilir; bir yazım
+                # başarısız olduysa bu taramada hiçbir sayfa "değişmedi" için hatırlanmaz
+                if parsed_pages and not self._write_failed:
+                    await loop.run_in_executor(None, self._remember_pages, parsed_pages)
+                batch, parsed_pages = [], []
+                deadline = loop.time() + self.flush_interval
+            if item is _DONE:
+                return
+
+    def _remember_pages(self, parsed_pages: List[_ParsedPage]):
+        for parsed in parsed_pages:
+            parsed.scraper.remember_page(parsed.url, parsed.ids)
+
+    async def _flush(self, batch: List[Dict]):
+        """Değişen ürünleri toplu upsert et, değişmeyenlerin last_seen'ini toplu güncelle"""
+        unchanged = self.fingerprints.drain_unchanged() if self.fingerprints is not None else []
+        # Devam edilen taramada zaten görülmüş ürünler de görüldü sayılır (last_seen)
+        for index in self.dedupe.values():
+            unchanged.extend(index.drain_carried())
+        if not batch and not unchanged:
+            return
+        if self.db is None:
+            self.metrics['write'].record(0.0, outputs=len(batch))
+            return
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        saved_count = await loop.run_in_executor(None, self.db.save_products_batch, batch) if batch else 0
+        failed = bool(batch) and not saved_count
+        if saved_count and self.enricher is not None:
+            # Yeni ürünler fingerprint cache güncellenmeden önce ayırt edilir
+            self.enricher.offer(batch, self.fingerprints)
+        if saved_count and self.fingerprints is not None:
+            self.fingerprints.update(batch)
+        # Yazım başarısızsa değişmeyenler de işaretlenmez (sonraki tarama tekrar dener)
+        unchanged_count = 0 if failed else await loop.run_in_executor(None, self.db.touch_products, unchanged)
+
+        self.metrics['write'].record(time.perf_counter() - start, outputs=saved_count, error=failed)
+        if failed:
+            self._write_failed = True
+            self.results['errors'].append(f"DB kaydetme hatası: {len(batch)} ürünlük batch yazılamadı")
+
+        self.results['total_saved'] += saved_count
+        self.results['total_unchanged'] += unchanged_count
+        logger.info("💾 %s değişen ürün yazıldı, %s değişmeyen ürün sadece işaretlendi", saved_count, unchanged_count)
@@ -0,0 +1,56 @@
+// scrapers/price_parser.py ile aynı kurallar: "1.299,99 TL" → 1299.99, "1.299" → 1299,
+// aralıklarda alt sınır; 1-500000 dışı veya okunamayan fiyat → null
+const PRICE_NUMBER = /\d+(?:(?:[.,]|[ \u00a0\u202f](?=\d{3}(?!\d)))\d+)*/g;
+const PRICE_RANGE = /\d\s*[-–—]\s*(?:₺|TL)?\s*\d/;
+const PRICE_PERCENT = /%\s*\d+|\d+\s*%/g;
+
+function parsePriceToken(token) {
+    token = token.replace(/[ \u00a0\u202f]/g, '');
+    const lastDot = token.lastIndexOf('.');
+    const lastComma = token.lastIndexOf(',');
+
+    if (lastDot >= 0 && lastComma >= 0) {
+        const decimal = lastDot > lastComma ? '.' : ',';
+        const thousands = decimal === '.' ? ',' : '.';
+        token = token.split(thousands).join('').replace(decimal, '.');
+    } else if (lastDot >= 0 || lastComma >= 0) {
+        const separator = lastDot >= 0 ? '.' : ',';
+        const parts = token.split(separator);
+        const fraction = parts[parts.length - 1];
+        token = parts.length === 2 && (fraction.length === 1 || fraction.length === 2)
+            ? `${parts[0]}.${fraction}`
+            : parts.join('');
+    }
+
+    const value = Number(token);
+    return Number.isFinite(value) ? value : null;
+}
+
+function parsePrice(text) {
+    if (!text) return null;
+    const cleaned = text.replace(PRICE_PERCENT, ' ');
+    const tokens = cleaned.match(PRICE_NUMBER);
+    if (!tokens) return null;
+
+    let value;
+    if (tokens.length > 1 && PRICE_RANGE.test(cleaned)) {
+        const values = tokens.map(parsePriceToken).filter(v => v !== null);
+        value = values.length ? Math.min(...values) : null;
+    } else {
+        value = parsePriceToken(tokens.reduce((a, b) => (b.length > a.length ? b : a)));
+    }
+    return value !== null && value >= 1 && value <= 500000 ? value : null;
+}
+
+// Doğrudan çalıştırılırsa: stdin'den JSON metin listesi, stdout'a JSON fiyat listesi
+// (Python parser'ıyla aynı sonuçları verdiği tests/test_price_parser.py'de kontrol edilir)
+if (require.main === module) {
+    let input = '';
+    process.stdin.setEncoding('utf8');
+    process.stdin.on('data', chunk => { input += chunk; });
+    process.stdin.on('end', () => {
+        process.stdout.write(JSON.stringify(JSON.parse(input).map(parsePrice)));
+    });
+}
+
+module.exports = { parsePrice };
@@ -0,0 +1,94 @@
+import re
+from typing import Iterable, List, Optional
+
+# Kabul edilen fiyat aralığı (dışındakiler yanlış parse veya taksit/puan metni sayılır)
+MIN_PRICE = 1.0
+MAX_PRICE = 500000.0
+
+# Hızlı yol: tek fiyat, Türk biçimi ("1.299,99 TL", "₺1.299", "1299,99")
+_FAST_TR = re.compile(r'\s*(?:₺|TL)?\s*(\d{1,3}(?:\.\d{3})+|\d+)(?:,(\d{1,2}))?\s*(?:TL|₺)?\s*')
+# Genel yol: sayı token'ı; boşluk sadece ardından tam 3 rakam geliyorsa binlik ayırıcıdır ("1 299,99")
+_NUMBER = re.compile(r'\d+(?:(?:[.,]|[ \u00a0\u202f](?=\d{3}(?!\d)))\d+)*')
+_SPACES = re.compile(r'[ \u00a0\u202f]')
+_PERCENT = re.compile(r'%\s*\d+|\d+\s*%')
+# İki sayı arasında tire: fiyat aralığı ("1.299 - 1.499 TL")
+_RANGE = re.compile(r'\d\s*[-–—]\s*(?:₺|TL)?\s*\d')
+
+
+def _in_range(price: float) -> Optional[float]:
+    return price if MIN_PRICE <= price <= MAX_PRICE else None
+
+
+def _number(token: str) -> Optional[float]:
+    """Tek sayı token'ını çöz; ondalık ayırıcı sondan belirlenir
+
+    '.' ve ',' birlikteyse sondaki ondalıktır ("1.299,99", "1,299.99").
+    Tek tür ayırıcı bir kez geçip ardından 1-2 rakam geliyorsa ondalık
+    ("1299,99", "12.5"), 3 rakam veya birden çok geçiş binliktir ("1.299", "1,299,000").
+    """
+    token = _SPACES.sub('', token)
+    last_dot, last_comma = token.rfind('.'), token.rfind(',')
+
+    if last_dot >= 0 and last_comma >= 0:
+        decimal = '.' if last_dot > last_comma else ','
+        thousands = ',' if decimal == '.' else '.'
+        token = token.replace(thousands, '').replace(decimal, '.')
+    elif last_dot >= 0 or last_comma >= 0:
+        separator = '.' if last_dot >= 0 else ','
+        whole, _, fraction = token.rpartition(separator)
+        if token.count(separator) == 1 and len(fraction) in (1, 2):
+            token = f"{whole}.{fraction}"
+        else:
+            token = token.replace(separator, '')
+
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+def parse_price(text: Optional[str]) -> Optional[float]:
+    """Fiyat metnini sayıya çevir: '1.299,99 TL' → 1299.99
+
+    TL/₺ öneki veya soneki, binlik ayırıcı (nokta, virgül, boşluk) ve
+    fiyat aralıkları (alt sınır alınır) desteklenir. Aralık dışı veya
+    okunamayan fiyatlar None döner.
+    """
+    if not text:
+        return None
+
+    fast = _FAST_TR.fullmatch(text)
+    if fast:
+        whole, fraction = fast.groups()
+        whole = whole.replace('.', '')
+        return _in_range(float(f"{whole}.{fraction}" if fraction else whole))
+
+    # Yüzde ifadeleri ("%40") fiyat değildir
+    text = _PERCENT.sub(' ', text)
+    tokens = _NUMBER.findall(text)
+    if not tokens:
+        return None
+
+    if len(tokens) > 1 and _RANGE.search(text):
+        values = [value for value in map(_number, tokens) if value is not None]
+        return _in_range(min(values)) if values else None
+
+    # Birden çok sayı varsa en uzunu (asıl fiyat; taksit sayısı vb. değil)
+    value = _number(max(tokens, key=len))
+    return _in_range(value) if value is not None else None
+
+
+def parse_prices(texts: Iterable[Optional[str]]) -> List[Optional[float]]:
+    """Bir sayfanın fiyat metinlerini sırayla çöz (`parse_price` ile aynı sonuçlar)
+
+    Vektörize değildir: metinler tek tek parse edilir, sadece aynı sayfada
+    tekrar eden metinler (aynı fiyat, aynı kampanya etiketi) bir kez
+    parse edilip sonuç tekrar kullanılır.
+    """
+    cache = {}
+    results = []
+    for text in texts:
+        if text not in cache:
+            cache[text] = parse_price(text)
+        results.append(cache[text])
+    return results
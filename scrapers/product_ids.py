@@ -0,0 +1,62 @@
+import os
+import re
+import hashlib
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, unquote
+
+# products.asin VARCHAR(20): "<2 harf önek><native id>" veya "<önek>-<16 hex>"
+MAX_ID_LENGTH = 20
+
+# Sitenin kendi ürün/content id'si (Trendyol/Hepsiburada "-p-<id>", Amazon ASIN)
+NATIVE_ID_PATTERNS = {
+    'trendyol': re.compile(r'-p-(\d+)(?:$|[/?#])'),
+    'hepsiburada': re.compile(r'-p-([A-Za-z0-9]+)(?:$|[/?#])'),
+    'amazon': re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})(?:$|[/?#])'),
+}
+
+# Anahtar değişirse tüm digest tabanlı ID'ler değişir; üretimde sabit tutulmalı
+DEFAULT_ID_KEY = 'amazon-firsat-product-id-v1'
+
+
+def site_prefix(site_name: str) -> str:
+    return site_name[:2].upper()
+
+
+def canonical_url(product_url: str) -> str:
+    """Takip parametrelerinden arındırılmış URL: şema/host küçük harf, query ve fragment yok"""
+    parts = urlsplit(product_url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = unquote(parts.path).rstrip('/') or '/'
+    return urlunsplit(((parts.scheme or 'https').lower(), host, path, '', ''))
+
+
+def native_product_id(site_name: str, product_url: str) -> Optional[str]:
+    """URL'deki sitenin kendi ürün id'si (yoksa None)"""
+    pattern = NATIVE_ID_PATTERNS.get(site_name.lower())
+    if not pattern or not product_url:
+        return None
+    match = pattern.search(urlsplit(product_url).path + '?')
+    return match.group(1).upper() if match else None
+
+
+def url_digest(product_url: str, key: str = None) -> str:
+    """Kanonik URL'in anahtarlı BLAKE2b özeti (16 hex karakter)"""
+    key = (key or os.environ.get('PRODUCT_ID_KEY', DEFAULT_ID_KEY)).encode('utf-8')
+    return hashlib.blake2b(canonical_url(product_url).encode('utf-8'), digest_size=8, key=key).hexdigest()
+
+
+def product_id(site_name: str, product_url: str, native_id: str = None) -> str:
+    """Süreçten bağımsız, kararlı ürün ID'si
+
+    Önce sitenin kendi id'si kullanılır (TR123456789, HEHBCV000...);
+    bulunamazsa veya sütuna sığmazsa kanonik URL'in özeti (TR-1a2b...).
+    """
+    prefix = site_prefix(site_name)
+    native_id = native_id or native_product_id(site_name, product_url)
+    if native_id:
+        candidate = f"{prefix}{str(native_id).upper()}"
+        if len(candidate) <= MAX_ID_LENGTH and candidate.isalnum():
+            return candidate
+    return f"{prefix}-{url_digest(product_url)}"
@@ -1,7 +1,34 @@
 const puppeteer = require('puppeteer');
+const { parsePrice } = require('./price_parser');
 
-async function scrapeTrendyol() {
-    const browser = await puppeteer.launch({
+const DEFAULT_QUERIES = [
+    'elektronik',
+    'telefon',
+    'bilgisayar',
+    'ev-yasam',
+    'moda'
+];
+
+const USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36';
+
+// Aynı tarayıcıda paralel çalışan sekme sayısı
+const DEFAULT_POOL_SIZE = parseInt(process.env.PUPPETEER_PAGE_POOL || '3', 10);
+
+// Ürün kartları için gerekmeyen istekler: görseller, medya, fontlar ve üçüncü parti script'ler
+const BLOCKED_RESOURCE_TYPES = new Set(['image', 'media', 'font']);
+const FIRST_PARTY_HOSTS = ['trendyol.com', 'dsmcdn.com'];
+
+function canonicalUrl(url) {
+    try {
+        const parsed = new URL(url);
+        return `${parsed.hostname.replace(/^www\./, '')}${parsed.pathname.replace(/\/+$/, '')}`.toLowerCase();
+    } catch (error) {
+        return url;
+    }
+}
+
+function launchBrowser() {
+    return puppeteer.launch({
         headless: true,
         args: [
             '--no-sandbox',
@@ -13,96 +40,222 @@ async function scrapeTrendyol() {
             '--disable-gpu'
         ]
     });
+}
 
-    const page = await browser.newPage();
-    
-    await page.setUserAgent('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36');
-    
-    const products = [];
-    
+function isFirstParty(url) {
     try {
-        const searchQueries = [
-            'elektronik',
-            'telefon',
-            'bilgisayar',
-            'ev-yasam',
-            'moda'
-        ];
-
-        for (const query of searchQueries) {
-            const url = `https://www.trendyol.com/sr?q=${query}&pi=1`;
-            
-            await page.goto(url, { waitUntil: 'networkidle2', timeout: 30000 });
-            
-            await page.waitForSelector('.p-card-wrppr', { timeout: 10000 });
-            
-            const pageProducts = await page.evaluate(() => {
-                const productElements = document.querySelectorAll('.p-card-wrppr');
-                const results = [];
-                
-                productElements.forEach((element, index) => {
-                    if (index >= 20) return; // Limit to 20 products per query
-                    
-                    try {
-                        const titleElement = element.querySelector('.prdct-desc-cntnr-name');
-                        const priceElement = element.querySelector('.prc-box-dscntd');
-                        const originalPriceElement = element.querySelector('.prc-box-orgnl');
-                        const linkElement = element.querySelector('a');
-                        const imageElement = element.querySelector('.p-card-img');
-                        const discountElement = element.querySelector('.dsct-prcntg');
-                        
-                        if (!titleElement || !priceElement || !originalPriceElement || !linkElement) return;
-                        
-                        const title = titleElement.textContent.trim();
-                        const currentPrice = parseFloat(priceElement.textContent.replace(/[^\d,]/g, '').replace(',', '.'));
-                        const originalPrice = parseFloat(originalPriceElement.textContent.replace(/[^\d,]/g, '').replace(',', '.'));
-                        const discountText = discountElement ? discountElement.textContent.trim() : '';
-                        const discountPercent = discountText ? parseInt(discountText.replace('%', '')) : 0;
-                        
-                        if (discountPercent >= 40 && currentPrice > 0 && originalPrice > 0) {
-                            results.push({
-                                title: title,
-                                current_price: currentPrice,
-                                original_price: originalPrice,
-                                discount_percent: discountPercent,
-                                url: 'https://www.trendyol.com' + linkElement.getAttribute('href'),
-                                image_url: imageElement ? imageElement.getAttribute('src') : '',
-                                site: 'Trendyol'
-                            });
-                        }
-                    } catch (error) {
-                        console.error('Error processing product element:', error);
-                    }
+        const hostname = new URL(url).hostname;
+        return FIRST_PARTY_HOSTS.some(host => hostname === host || hostname.endsWith(`.${host}`));
+    } catch (error) {
+        return false;
+    }
+}
+
+function shouldBlock(request) {
+    const type = request.resourceType();
+    return BLOCKED_RESOURCE_TYPES.has(type) || (type === 'script' && !isFirstParty(request.url()));
+}
+
+async function newPage(browser) {
+    const page = await browser.newPage();
+    await page.setUserAgent(USER_AGENT);
+
+    await page.setRequestInterception(true);
+    page.on('request', request => {
+        if (request.isInterceptResolutionHandled()) return;
+        if (shouldBlock(request)) {
+            request.abort();
+        } else {
+            request.continue();
+        }
+    });
+
+    return page;
+}
+
+function createPagePool(browser, size = DEFAULT_POOL_SIZE) {
+    return Promise.all(Array.from({ length: Math.max(1, size) }, () => newPage(browser)));
+}
+
+// Arama sorgusunun bir sayfasındaki indirimli ürünler
+async function scrapeQuery(page, query, pageNumber = 1) {
+    const url = `https://www.trendyol.com/sr?q=${query}&pi=${pageNumber}`;
+
+    // Ağın susmasını değil, ürün kartlarının DOM'a gelmesini bekle
+    await page.goto(url, { waitUntil: 'domcontentloaded', timeout: 30000 });
+
+    await page.waitForSelector('.p-card-wrppr', { timeout: 10000 });
+
+    const cards = await page.evaluate(() => {
+        const productElements = document.querySelectorAll('.p-card-wrppr');
+        const results = [];
+
+        productElements.forEach((element, index) => {
+            if (index >= 20) return; // Limit to 20 products per query
+
+            try {
+                const titleElement = element.querySelector('.prdct-desc-cntnr-name');
+                const priceElement = element.querySelector('.prc-box-dscntd');
+                const originalPriceElement = element.querySelector('.prc-box-orgnl');
+                const linkElement = element.querySelector('a');
+                const imageElement = element.querySelector('.p-card-img');
+                const discountElement = element.querySelector('.dsct-prcntg');
+
+                if (!titleElement || !priceElement || !originalPriceElement || !linkElement) return;
+
+                // Fiyat metinleri Node tarafında tek parser'la çözülür
+                results.push({
+                    title: titleElement.textContent.trim(),
+                    price_text: priceElement.textContent,
+                    original_price_text: originalPriceElement.textContent,
+                    discount_text: discountElement ? discountElement.textContent.trim() : '',
+                    href: linkElement.getAttribute('href'),
+                    image_url: imageElement ? imageElement.getAttribute('src') : ''
                 });
-                
-                return results;
+            } catch (error) {
+                console.error('Error processing product element:', error);
+            }
+        });
+
+        return results;
+    });
+
+    const results = [];
+    for (const card of cards) {
+        const currentPrice = parsePrice(card.price_text);
+        const originalPrice = parsePrice(card.original_price_text);
+        const discountPercent = card.discount_text ? parseInt(card.discount_text.replace('%', ''), 10) : 0;
+
+        if (discountPercent >= 40 && currentPrice && originalPrice) {
+            results.push({
+                title: card.title,
+                current_price: currentPrice,
+                original_price: originalPrice,
+                discount_percent: discountPercent,
+                url: 'https://www.trendyol.com' + card.href,
+                image_url: card.image_url,
+                site: 'Trendyol'
             });
-            
-            products.push(...pageProducts);
-            
-            await new Promise(resolve => setTimeout(resolve, 2000));
         }
-        
+    }
+    return results;
+}
+
+function toMb(bytes) {
+    return Math.round(bytes / 1024 / 1024 * 10) / 10;
+}
+
+// Başarısız sayfayı üstel geri çekilme + jitter ile tekrar dener
+async function scrapeQueryWithRetry(page, query, pageNumber, { retries, delayMs, stats }) {
+    for (let attempt = 0; ; attempt++) {
+        try {
+            return await scrapeQuery(page, query, pageNumber);
+        } catch (error) {
+            if (attempt >= retries) throw error;
+            stats.retries += 1;
+            const backoff = Math.random() * delayMs * 2 ** (attempt + 1);
+            console.error(`Query ${query} (page ${pageNumber}) failed, retrying in ${Math.round(backoff)}ms:`, error.message);
+            await new Promise(resolve => setTimeout(resolve, backoff));
+        }
+    }
+}
+
+// Sorgu × sayfa işlerini havuzdaki sekmeler arasında paylaştırır; her yeni
+// (kanonik URL'i görülmemiş) ürün için onProduct çağrılır. Her sekme kendi
+// işleri arasında delayMs bekler. Art arda breakerThreshold sayfa başarısız
+// olursa (site engelliyor/çökük) kalan işler bırakılır.
+async function scrapeQueries(pool, queries, {
+    maxPages = 1, limit = 50, delayMs = 2000, retries = 2, breakerThreshold = 5, onProduct = () => {}
+} = {}) {
+    const pages = Array.isArray(pool) ? pool : [pool];
+    const tasks = queries.flatMap(query => Array.from({ length: maxPages }, (_, index) => ({ query, pageNumber: index + 1 })));
+    const seen = new Set();
+    const products = [];
+    const stats = { pages: 0, failed: 0, retries: 0, circuit_open: false, peak_js_heap_mb: 0, peak_rss_mb: 0 };
+    const started = Date.now();
+    let next = 0;
+    let done = false;
+    let consecutiveFailures = 0;
+
+    async function sampleMemory(page) {
+        const metrics = await page.metrics().catch(() => ({}));
+        stats.peak_js_heap_mb = Math.max(stats.peak_js_heap_mb, toMb(metrics.JSHeapUsedSize || 0));
+        stats.peak_rss_mb = Math.max(stats.peak_rss_mb, toMb(process.memoryUsage().rss));
+    }
+
+    async function crawl(page) {
+        let first = true;
+        while (!done && next < tasks.length) {
+            const { query, pageNumber } = tasks[next++];
+            if (!first) await new Promise(resolve => setTimeout(resolve, delayMs));
+            first = false;
+
+            let pageProducts;
+            try {
+                pageProducts = await scrapeQueryWithRetry(page, query, pageNumber, { retries, delayMs, stats });
+                stats.pages += 1;
+                consecutiveFailures = 0;
+            } catch (error) {
+                stats.failed += 1;
+                consecutiveFailures += 1;
+                console.error(`Query ${query} (page ${pageNumber}) failed:`, error.message);
+                if (consecutiveFailures >= breakerThreshold && !done) {
+                    done = true;
+                    stats.circuit_open = true;
+                    console.error(`${consecutiveFailures} consecutive failures, skipping remaining queries`);
+                }
+                continue;
+            }
+            await sampleMemory(page);
+
+            for (const product of pageProducts) {
+                const key = canonicalUrl(product.url);
+                if (seen.has(key)) continue;
+                seen.add(key);
+
+                products.push(product);
+                onProduct(product);
+                if (products.length >= limit) {
+                    done = true;
+                    break;
+                }
+            }
+        }
+    }
+
+    await Promise.all(pages.map(crawl));
+
+    stats.elapsed_ms = Date.now() - started;
+    stats.pages_per_minute = stats.elapsed_ms ? Math.round(stats.pages * 60000 / stats.elapsed_ms * 10) / 10 : 0;
+    stats.pool_size = pages.length;
+    return { products, stats };
+}
+
+async function scrapeTrendyol(queries = DEFAULT_QUERIES, options = {}) {
+    const browser = await launchBrowser();
+    const products = [];
+    let stats = {};
+
+    try {
+        const pool = await createPagePool(browser, options.poolSize);
+        ({ stats } = await scrapeQueries(pool, queries, { ...options, onProduct: product => products.push(product) }));
     } catch (error) {
         console.error('Scraping error:', error);
     } finally {
         await browser.close();
     }
-    
-    const uniqueProducts = products.filter((product, index, self) => 
-        index === self.findIndex(p => p.url === product.url)
-    );
-    
-    return uniqueProducts.slice(0, 50);
+
+    return { products, stats };
 }
 
 async function main() {
     try {
-        const products = await scrapeTrendyol();
+        const { products, stats } = await scrapeTrendyol();
         console.log(JSON.stringify({
             success: true,
             products: products,
-            count: products.length
+            count: products.length,
+            stats: stats
         }));
     } catch (error) {
         console.log(JSON.stringify({
@@ -118,4 +271,4 @@ if (require.main === module) {
     main();
 }
 
-module.exports = { scrapeTrendyol };
\ No newline at end of file
+module.exports = { DEFAULT_QUERIES, canonicalUrl, parsePrice, launchBrowser, newPage, createPagePool, scrapeQuery, scrapeQueries, scrapeTrendyol };
@@ -0,0 +1,87 @@
+// Uzun ömürlü Puppeteer worker'ı: tarayıcı bir kez açılır, işler stdin'den gelir.
+//
+// Protokol (satır başına bir JSON):
+//   stdin:  {"id": "1", "type": "scrape", "queries": ["telefon"], "max_pages": 2, "limit": 50}
+//           {"id": "2", "type": "ping"}
+//           {"type": "shutdown"}
+//   stdout: {"type": "ready"}
+//           {"id": "1", "type": "product", "product": {...}}   (ürün çıkarıldıkça)
+//           {"id": "1", "type": "done", "count": 12, "stats": {...}}
+//           {"id": "1", "type": "error", "error": "..."}
+//           {"id": "2", "type": "pong"}
+// Loglar stderr'e yazılır; stdout sadece protokol satırlarını taşır.
+const readline = require('readline');
+const { DEFAULT_QUERIES, launchBrowser, createPagePool, scrapeQueries } = require('./puppeteer_scraper');
+
+function send(message) {
+    process.stdout.write(JSON.stringify(message) + '\n');
+}
+
+async function main() {
+    const browser = await launchBrowser();
+    const pool = await createPagePool(browser);
+
+    // Tarayıcı çökerse süreç biter; Python tarafı yeniden başlatır
+    browser.on('disconnected', () => {
+        console.error('Browser disconnected, exiting');
+        process.exit(1);
+    });
+
+    let queue = Promise.resolve();
+
+    async function handle(job) {
+        if (job.type === 'ping') {
+            send({ id: job.id, type: 'pong' });
+            return;
+        }
+        if (job.type === 'shutdown') {
+            await browser.close().catch(() => {});
+            process.exit(0);
+        }
+        if (job.type !== 'scrape') {
+            send({ id: job.id, type: 'error', error: `Unknown job type: ${job.type}` });
+            return;
+        }
+
+        try {
+            const { products, stats } = await scrapeQueries(pool, job.queries || DEFAULT_QUERIES, {
+                maxPages: job.max_pages || 1,
+                limit: job.limit || 50,
+                delayMs: job.delay_ms === undefined ? 2000 : job.delay_ms,
+                retries: job.retries === undefined ? 2 : job.retries,
+                onProduct: product => send({ id: job.id, type: 'product', product })
+            });
+            send({ id: job.id, type: 'done', count: products.length, stats });
+        } catch (error) {
+            send({ id: job.id, type: 'error', error: error.message });
+        }
+    }
+
+    const input = readline.createInterface({ input: process.stdin });
+    input.on('line', line => {
+        if (!line.trim()) return;
+
+        let job;
+        try {
+            job = JSON.parse(line);
+        } catch (error) {
+            send({ type: 'error', error: `Invalid JSON: ${error.message}` });
+            return;
+        }
+
+        // Sekme havuzu iş başına paylaşıldığı için işler sırayla çalışır
+        queue = queue.then(() => handle(job));
+    });
+    input.on('close', async () => {
+        await queue;
+        await browser.close().catch(() => {});
+        process.exit(0);
+    });
+
+    send({ type: 'ready' });
+}
+
+main().catch(error => {
+    console.error('Worker startup failed:', error);
+    process.exit(1);
+});
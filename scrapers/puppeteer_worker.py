@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import queue
+import atexit
+import itertools
+import threading
+import subprocess
+from typing import Dict, Iterator, List, Optional, Set
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'puppeteer_worker.js')
+
+# Worker süreci iş ortasında kapanırsa bekleyen işe gönderilir
+_EXIT = object()
+
+
+class PuppeteerWorker:
+    """Sıcak tarayıcıyı tutan Node worker'ının Python tarafı (supervisor)
+
+    Worker satır başına bir JSON konuşur (bkz. puppeteer_worker.js). İşler
+    sırayla gönderilir, ürünler worker çıkardıkça akar. Worker kapanır veya
+    takılırsa bir sonraki işte üstel beklemeyle yeniden başlatılır; art arda
+    `max_restarts` başarısız başlatmadan sonra vazgeçilir.
+    """
+
+    def __init__(self, script_path: str = WORKER_SCRIPT, startup_timeout: float = None,
+                 max_restarts: int = None):
+        self.script_path = script_path
+        self.startup_timeout = startup_timeout or float(os.environ.get('PUPPETEER_STARTUP_TIMEOUT', 60))
+        self.max_restarts = max_restarts if max_restarts is not None else int(os.environ.get('PUPPETEER_MAX_RESTARTS', 5))
+
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self.last_stats: Dict = {}
+        self._jobs: Dict[str, queue.Queue] = {}
+        # Çağıranın okumayı bıraktığı, worker'da hâlâ süren işler
+        self._abandoned: Set[str] = set()
+        self._ids = itertools.count(1)
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None and self._ready.is_set()
+
+    def start(self):
+        """Node worker'ını başlat ve tarayıcının hazır olmasını bekle"""
+        self._ready.clear()
+        start = time.perf_counter()
+        self.process = subprocess.Popen(
+            ['node', self.script_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            bufsize=1
+        )
+        threading.Thread(target=self._read_stdout, args=(self.process,), daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(self.process,), daemon=True).start()
+
+        if not self._ready.wait(self.startup_timeout) or self.process.poll() is not None:
+            self.kill()
+            raise RuntimeError(f"Puppeteer worker {self.startup_timeout:.0f}s içinde hazır olmadı")
+        logger.info("🧭 Puppeteer worker hazır (pid %s, %.2fs)", self.process.pid, time.perf_counter() - start)
+
+    def ensure_running(self):
+        """Worker çalışmıyorsa (yeniden) başlat"""
+        if self.alive:
+            return
+
+        if self.process is not None:
+            self.restarts += 1
+            if self.restarts > self.max_restarts:
+                raise RuntimeError(f"Puppeteer worker {self.max_restarts} kez yeniden başlatıldı, vazgeçiliyor")
+            backoff = min(2 ** (self.restarts - 1), 30)
+            logger.warning("🔁 Puppeteer worker kapanmış (çıkış kodu %s), %ss sonra yeniden başlatılıyor",
+                           self.process.poll(), backoff)
+            self.kill()
+            time.sleep(backoff)
+
+        self.start()
+
+    def request(self, message: Dict, timeout: float = 300) -> Iterator[Dict]:
+        """İşi gönder; worker'ın bu işe ait satırlarını iş bitene kadar döndür
+
+        Kilit yalnızca başlatma ve gönderim sırasında tutulur; işler worker'ın
+        kendi kuyruğunda sırayla çalışır. Çağıran okumayı erken bırakırsa işin
+        kalan satırları sessizce atılır.
+        """
+        with self._lock:
+            self.ensure_running()
+            job_id = str(next(self._ids))
+            replies = self._jobs[job_id] = queue.Queue()
+            try:
+                self._send({**message, 'id': job_id})
+            except Exception:
+                self._jobs.pop(job_id, None)
+                raise
+
+        finished = False
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    reply = replies.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # Takılan worker'ı öldür; sonraki iş temiz bir süreçle başlar
+                    finished = True
+                    self.kill()
+                    raise TimeoutError(f"Puppeteer işi {timeout:.0f}s içinde bitmedi")
+
+                if reply is _EXIT:
+                    finished = True
+                    raise RuntimeError("Puppeteer worker iş sırasında kapandı")
+
+                if reply.get('type') in ('done', 'error', 'pong'):
+                    finished = True
+                    self.restarts = 0
+                    yield reply
+                    return
+                yield reply
+        finally:
+            self._jobs.pop(job_id, None)
+            if not finished:
+                self._abandoned.add(job_id)
+
+    def scrape(self, queries: List[str] = None, limit: int = 50, max_pages: int = 1,
+               timeout: float = 300) -> Iterator[Dict]:
+        """Trendyol arama sorgularını (her biri `max_pages` sayfa) tara; ürünleri çıkarıldıkça döndür"""
+        message = {'type': 'scrape', 'limit': limit, 'max_pages': max_pages}
+        if queries:
+            message['queries'] = queries
+
+        for reply in self.request(message, timeout):
+            if reply['type'] == 'product':
+                yield reply['product']
+            elif reply['type'] == 'done':
+                # Sekme havuzu metrikleri: sayfa/dk, başarısız sayfa, tepe bellek
+                self.last_stats = reply.get('stats') or {}
+                logger.info("🧭 Puppeteer işi bitti: %s ürün, %s", reply.get('count'), self.last_stats)
+            elif reply['type'] == 'error':
+                raise RuntimeError(reply.get('error') or 'Puppeteer işi başarısız')
+
+    def ping(self, timeout: float = 5) -> bool:
+        try:
+            return any(reply['type'] == 'pong' for reply in self.request({'type': 'ping'}, timeout))
+        except Exception as e:
+            logger.warning("Puppeteer worker ping hatası: %s", e)
+            return False
+
+    def stop(self, timeout: float = 10):
+        """Worker'a kapanmasını söyle, gerekirse öldür"""
+        if self.process is None or self.process.poll() is not None:
+            return
+        try:
+            self._send({'type': 'shutdown'})
+            self.process.stdin.close()
+            self.process.wait(timeout)
+        except (OSError, RuntimeError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self._ready.clear()
+
+    def _send(self, message: Dict):
+        try:
+            self.process.stdin.write(json.dumps(message) + '\n')
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f"Puppeteer worker'a yazılamadı: {e}")
+
+    def _read_stdout(self, process: subprocess.Popen):
+        for line in process.stdout:
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                logger.warning("Puppeteer worker geçersiz satır: %s", line[:200])
+                continue
+
+            if reply.get('type') == 'ready':
+                self._ready.set()
+                continue
+
+            replies = self._jobs.get(reply.get('id'))
+            if replies is not None:
+                replies.put(reply)
+            elif reply.get('id') in self._abandoned:
+                if reply.get('type') in ('done', 'error'):
+                    self._abandoned.discard(reply.get('id'))
+            else:
+                logger.warning("Puppeteer worker sahipsiz mesaj: %s", reply)
+
+        # EOF: süreç kapandı; bekleyen işleri uyandır
+        if process is self.process:
+            self._ready.clear()
+            self._abandoned.clear()
+        for replies in list(self._jobs.values()):
+            replies.put(_EXIT)
+
+    def _read_stderr(self, process: subprocess.Popen):
+        for line in process.stderr:
+            logger.debug("🟡 puppeteer: %s", line.rstrip())
+
+
+_shared_worker = None
+_shared_lock = threading.Lock()
+
+
+def get_puppeteer_worker() -> PuppeteerWorker:
+    """Süreç genelinde paylaşılan worker (ilk işte başlatılır, çıkışta kapatılır)"""
+    global _shared_worker
+    with _shared_lock:
+        if _shared_worker is None:
+            _shared_worker = PuppeteerWorker()
+            atexit.register(_shared_worker.stop)
+        return _shared_worker
@@ -0,0 +1,117 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Callable, Dict
+from urllib.parse import urlparse
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Tek host için token bucket
+
+    Ortalama aralık (min_delay + max_delay) / 2 saniyede bir token üretilir,
+    en fazla `burst` token birikir. Token yoksa istek sıradaki boş zamana
+    rezerve edilir; bekleme süresine [min_delay, max_delay] aralığı kadar
+    jitter eklenir ki istekler sabit ritimle gitmesin. `clock` testlerde
+    sahte saat vermek içindir.
+    """
+
+    def __init__(self, min_delay: float, max_delay: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_delay = min_delay
+        self.max_delay = max(max_delay, min_delay)
+        self.interval = (self.min_delay + self.max_delay) / 2
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.clock = clock
+        self.updated = clock()
+
+    def reserve(self) -> float:
+        """Bir token ayır; isteğin başlaması için beklenmesi gereken süreyi döndür"""
+        now = self.clock()
+        if self.interval > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.interval)
+        else:
+            self.tokens = float(self.burst)
+        self.updated = now
+
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+
+        delay = -self.tokens * self.interval
+        jitter = (self.max_delay - self.min_delay) / 2
+        return max(0.0, delay + random.uniform(-jitter, jitter))
+
+
+class HostRateLimiter:
+    """Host bazlı giden istek sınırlayıcı
+
+    Yalnızca ağ isteklerinden önce çağrılır; senkron (requests) ve asenkron
+    (aiohttp) fetch yolları aynı örneği paylaşabilir.
+    """
+
+    def __init__(self, min_delay: float = None, max_delay: float = None, burst: int = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_delay = min_delay if min_delay is not None else float(os.environ.get('SCRAPING_DELAY_MIN', 1))
+        self.max_delay = max_delay if max_delay is not None else float(os.environ.get('SCRAPING_DELAY_MAX', 3))
+        self.burst = burst or int(os.environ.get('SCRAPING_BURST', 2))
+        self.clock = clock
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._budgets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, min_delay: float = None, max_delay: float = None, burst: int = None):
+        """Host'a özel bütçe (verilmeyen değerler varsayılandan gelir)"""
+        budget = (
+            self.min_delay if min_delay is None else min_delay,
+            self.max_delay if max_delay is None else max_delay,
+            burst or self.burst
+        )
+        with self._lock:
+            if self._budgets.get(host) != budget:
+                self._budgets[host] = budget
+                self._buckets.pop(host, None)
+
+    def reserve(self, url: str) -> float:
+        host = urlparse(url).netloc or url
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                min_delay, max_delay, burst = self._budgets.get(host, (self.min_delay, self.max_delay, self.burst))
+                bucket = self._buckets[host] = TokenBucket(min_delay, max_delay, burst, self.clock)
+            delay = bucket.reserve()
+
+        if delay:
+            logger.debug("⏳ %s için %.2fs bekleniyor", host, delay)
+        return delay
+
+    def wait(self, url: str):
+        """Senkron istekten önce sırayı bekle"""
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        """Asenkron istekten önce sırayı bekle"""
+        delay = self.reserve(url)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Süreç genelinde paylaşılan sınırlayıcı"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter()
+        return _shared_limiter
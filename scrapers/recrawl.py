@@ -0,0 +1,321 @@
+import os
+import math
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from collections import deque
+from typing import Dict, List
+from logger import get_logger
+from .fetcher import AsyncFetcher, FetchResult
+from .fingerprint import product_fingerprint
+from .pipeline import apply_site_budgets, crawl_in_progress, normalize_product
+from .registry import SiteSpec, get_site
+
+logger = get_logger(__name__)
+
+# Ürün kaldırılmış; süreç boyunca tekrar denenmez
+GONE_STATUSES = {404, 410}
+
+
+class RecrawlEntry:
+    """Takvimdeki tek ürün: son bilinen satırı, değişim aralığı tahmini ve sıradaki zamanı"""
+
+    __slots__ = ('product', 'gap', 'weight', 'factor', 'last_checked', 'next_due')
+
+    def __init__(self, product: Dict, gap: float, weight: float, last_checked: float):
+        self.product = product
+        # Gözlenen iki fiyat değişimi arası ortalama süre (sn)
+        self.gap = gap
+        # Volatilite ve indirim ağırlığı (1..4); yüksekse daha sık bakılır
+        self.weight = weight
+        # Yeniden taramalardan öğrenilen çarpan: değişim görüldükçe küçülür
+        self.factor = 1.0
+        self.last_checked = last_checked
+        self.next_due = 0.0
+
+    def change_probability(self, now: float) -> float:
+        """Son kontrolden beri fiyatın değişmiş olma olasılığı (Poisson varsayımı)"""
+        return 1 - math.exp(-max(0.0, now - self.last_checked) / (self.gap * self.factor))
+
+
+class RecrawlScheduler:
+    """Bilinen ürünleri fiyat oynaklığına göre detay sayfasından yeniden tarar
+
+    Her ürünün sıradaki tarama zamanı, fiyat geçmişindeki değişim sıklığından
+    (PriceTracker analizi) ve volatilite/indirim ağırlığından hesaplanır;
+    [min_interval, max_interval] aralığına sıkıştırılır. Site başına bir öncelik
+    kuyruğu (heap) tutulur. Her çalıştırmada site başına saatlik
+    `budget_per_hour` istek bütçesinin bu dilime düşen payı, zamanı gelmiş
+    ürünlerden değişmiş olma olasılığı × ağırlığı en yüksek olanlara harcanır.
+
+    Varsayılan olarak kapalıdır (RECRAWL_BUDGET_PER_HOUR=0): detay sayfası
+    istekleri liste taramasının host bütçesine eklenir. Liste taraması
+    sürerken çalıştırma atlanır. Takvim durumu bir
+    kilitle korunur; `stats()` (API'deki /scheduler/status) çalışan bir
+    yeniden taramayla aynı anda okunabilir.
+    """
+
+    def __init__(self, db, tracker=None, budget_per_hour: int = None, run_every: float = None,
+                 min_interval: float = None, max_interval: float = None, history_days: int = None,
+                 reload_every: float = None):
+        self.db = db
+        self.tracker = tracker
+        # 0 → yeniden tarama kapalı (varsayılan)
+        self.budget_per_hour = (budget_per_hour if budget_per_hour is not None
+                                else int(os.environ.get('RECRAWL_BUDGET_PER_HOUR', 0)))
+        # Saniye; zamanlayıcının çalıştırma aralığı (bütçe dilimlere bölünür)
+        self.run_every = run_every or float(os.environ.get('RECRAWL_INTERVAL_MIN', 5)) * 60
+        self.min_interval = min_interval or float(os.environ.get('RECRAWL_MIN_INTERVAL_MIN', 30)) * 60
+        self.max_interval = max_interval or float(os.environ.get('RECRAWL_MAX_INTERVAL_HOURS', 24)) * 3600
+        self.history_days = history_days or int(os.environ.get('RECRAWL_HISTORY_DAYS', 14))
+        self.reload_every = reload_every or 3600.0
+
+        self._entries: Dict[str, Dict[str, RecrawlEntry]] = {}
+        self._queues: Dict[str, List] = {}
+        self._requests: Dict[str, deque] = {}
+        self._gone = set()
+        self._sequence = itertools.count()
+        self._loaded_at = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, now: float = None) -> int:
+        """Adayları ve fiyat analizlerini DB'den oku; bilinen ürünlerin öğrenilmiş durumu korunur"""
+        now = now or time.time()
+        if self.tracker is None:
+            from price_tracker import PriceTracker
+            self.tracker = PriceTracker()
+
+        candidates = [row for row in self.db.get_recrawl_candidates() if row['asin'] not in self._gone]
+        analyses = self.tracker.analyze_price_patterns([row['asin'] for row in candidates], self.history_days)
+
+        with self._lock:
+            total = self._apply_candidates(candidates, analyses, now)
+
+        logger.info("🗓️ Yeniden tarama takvimi yüklendi: %s ürün (%s)", total,
+                    ', '.join(f"{site}: {len(site_entries)}" for site, site_entries in self._entries.items()))
+        return total
+
+    def _apply_candidates(self, candidates: List[Dict], analyses: Dict, now: float) -> int:
+        """Aday satırlarından takvimi yeniden kur (kilit tutulurken çağrılır)"""
+        entries = {}
+        for row in candidates:
+            try:
+                spec = get_site(row['site'])
+            except ValueError:
+                continue
+            first_seen = row['first_seen'].timestamp() if row.get('first_seen') else None
+            gap, weight = self.estimate(analyses.get(row['asin']) or {}, row['discount_percent'] or 0,
+                                        now - first_seen if first_seen else None)
+            known = self._entries.get(spec.key, {}).get(row['asin'])
+            last_seen = row['last_seen'].timestamp() if row.get('last_seen') else now
+            if known is not None:
+                known.product, known.gap, known.weight = row, gap, weight
+                # Liste taraması ürünü daha yakın zamanda gördüyse oradan say
+                known.last_checked = max(known.last_checked, last_seen)
+                entries.setdefault(spec.key, {})[row['asin']] = known
+            else:
+                entries.setdefault(spec.key, {})[row['asin']] = RecrawlEntry(row, gap, weight, last_seen)
+
+        self._entries = entries
+        self._queues = {}
+        for site, site_entries in entries.items():
+            for entry in site_entries.values():
+                self._schedule(site, entry, entry.last_checked + self.interval(entry))
+        self._loaded_at = now
+        return sum(len(site_entries) for site_entries in entries.values())
+
+    def estimate(self, analysis: Dict, discount_percent: int, observed: float = None) -> tuple:
+        """Analizden (değişimler arası ortalama süre, ağırlık)
+
+        `observed`: ürünün ne kadar süredir takip edildiği (sn); analiz penceresinden
+        kısaysa değişim sıklığı bu süreye göre hesaplanır. Değişim görülmemiş
+        ürünler max_interval'de bir değişiyor sayılır. Volatilite (std/ortalama)
+        ve indirim yüzdesi ağırlığı 1..2 arası çarpanlardır.
+        """
+        changes = analysis.get('price_changes') or 0
+        window = self.history_days * 86400
+        if observed:
+            window = max(3600.0, min(window, observed))
+        gap = window / changes if changes else self.max_interval
+        volatility = float(analysis.get('volatility') or 0)
+        weight = (1 + min(volatility, 0.5) * 2) * (1 + min(max(discount_percent, 0), 100) / 100)
+        return gap, weight
+
+    def interval(self, entry: RecrawlEntry) -> float:
+        """Ürünün iki taraması arası süre (sn)"""
+        return min(self.max_interval, max(self.min_interval, entry.gap * entry.factor / entry.weight))
+
+    def _schedule(self, site: str, entry: RecrawlEntry, due: float):
+        entry.next_due = due
+        heapq.heappush(self._queues.setdefault(site, []), (due, next(self._sequence), entry.product['asin']))
+
+    def budget_left(self, site: str, now: float) -> int:
+        """Site için son bir saatte harcanmamış istek sayısı (kilit tutulurken çağrılır)"""
+        window = self._requests.setdefault(site, deque())
+        while window and window[0] <= now - 3600:
+            window.popleft()
+        return max(0, self.budget_per_hour - len(window))
+
+    def pick(self, site: str, now: float) -> List[RecrawlEntry]:
+        """Bu çalıştırmada taranacak ürünler; bütçe payı kadar, en olası değişenler önce
+
+        Kilit tutulurken çağrılır (bkz. run_async).
+        """
+        share = max(1, math.ceil(self.budget_per_hour * self.run_every / 3600))
+        limit = min(share, self.budget_left(site, now))
+        queue = self._queues.get(site, [])
+        entries = self._entries.get(site, {})
+
+        due = []
+        while queue and queue[0][0] <= now:
+            due_at, _, asin = heapq.heappop(queue)
+            entry = entries.get(asin)
+            # Yeniden planlanmış ürünlerin eski kayıtları atlanır
+            if entry is not None and entry.next_due == due_at:
+                due.append(entry)
+
+        due.sort(key=lambda entry: entry.change_probability(now) * entry.weight, reverse=True)
+        picked, waiting = due[:limit], due[limit:]
+        for entry in waiting:
+            heapq.heappush(queue, (entry.next_due, next(self._sequence), entry.product['asin']))
+        if waiting:
+            logger.info("⏳ %s: %s ürünün zamanı geldi ama bütçe dışında kaldı", site, len(waiting))
+
+        self._requests[site].extend([now] * len(picked))
+        return picked
+
+    def run(self) -> Dict:
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> Dict:
+        """Zamanı gelen ürünleri tara, değişen fiyatları kaydet; site bazlı sayaçları döndür"""
+        if crawl_in_progress():
+            # Host bütçesini liste taraması kullanıyor; zamanı gelen ürünler sonraki çalıştırmaya kalır
+            logger.info("⏸️ Liste taraması sürüyor, yeniden tarama bu çalıştırmada atlandı")
+            return {}
+
+        now = time.time()
+        loop = asyncio.get_running_loop()
+        if self._loaded_at is None or now - self._loaded_at >= self.reload_every:
+            await loop.run_in_executor(None, self.load, now)
+
+        with self._lock:
+            picks = {site: self.pick(site, now) for site in self._queues}
+        picks = {site: entries for site, entries in picks.items() if entries}
+        results = {site: {'checked': 0, 'changed': 0, 'unchanged': 0, 'failed': 0, 'gone': 0}
+                   for site in picks}
+        if not picks:
+            return results
+
+        specs = [get_site(site) for site in picks]
+        # HTTP cache liste sayfaları içindir; detay sayfaları her seferinde tam indirilir
+        async with AsyncFetcher(cache=None) as fetcher:
+            apply_site_budgets(fetcher, specs)
+            outcomes = await asyncio.gather(*(
+                self._recrawl_site(fetcher, spec, picks[spec.key]) for spec in specs
+            ))
+
+        changed, unchanged = [], []
+        with self._lock:
+            for spec, site_outcomes in zip(specs, outcomes):
+                for entry, outcome, product in site_outcomes:
+                    results[spec.key]['checked'] += 1
+                    results[spec.key][outcome] += 1
+                    self._reschedule(spec.key, entry, outcome, now)
+                    if outcome == 'changed':
+                        # Sonraki karşılaştırmalar yeni fiyatla yapılır
+                        entry.product = product
+                        changed.append(product)
+                    elif outcome == 'unchanged':
+                        unchanged.append(entry.product['asin'])
+
+        if changed:
+            await loop.run_in_executor(None, self.db.save_products_batch, changed)
+        if unchanged:
+            await loop.run_in_executor(None, self.db.touch_products, unchanged)
+
+        for site, counts in results.items():
+            with self._lock:
+                totals = self._stats.setdefault(site, dict.fromkeys(counts, 0))
+                for key, value in counts.items():
+                    totals[key] += value
+            logger.info("🗓️ %s yeniden tarama: %s", site, counts)
+        return results
+
+    async def _recrawl_site(self, fetcher: AsyncFetcher, spec: SiteSpec, entries: List[RecrawlEntry]) -> List:
+        scraper = spec.create()
+        scraper.http_cache = None
+        headers = scraper.get_headers(scraper.site_name.lower())
+        loop = asyncio.get_running_loop()
+
+        async def check(entry: RecrawlEntry):
+            url = entry.product['product_url']
+            if spec.fetch == 'http':
+                result = await fetcher.fetch(url, headers)
+            else:
+                result = await loop.run_in_executor(None, scraper.fetch_page, url, scraper.site_name.lower())
+            try:
+                outcome, product = await loop.run_in_executor(None, self._apply, scraper, spec, entry, result)
+            except Exception as e:
+                scraper.log_error(scraper.site_name, f"Yeniden tarama hatası ({url}): {e}")
+                outcome, product = 'failed', None
+            return entry, outcome, product
+
+        return await asyncio.gather(*(check(entry) for entry in entries))
+
+    def _apply(self, scraper, spec: SiteSpec, entry: RecrawlEntry, result: FetchResult) -> tuple:
+        """Detay sayfası sonucunu (sonuç, güncellenmiş ürün) çiftine çevir"""
+        if result.status in GONE_STATUSES:
+            return 'gone', None
+        if not result.ok:
+            return 'failed', None
+
+        prices = scraper.parse_product_page(result.body)
+        if prices is None:
+            logger.debug("⚠️ %s detay sayfasında fiyat bulunamadı: %s", scraper.site_name, result.url)
+            return 'failed', None
+
+        stored = entry.product
+        current_price = round(prices['current_price'], 2)
+        list_price = round(prices['list_price'] or float(stored['list_price'] or 0), 2)
+        if (abs(current_price - float(stored['current_price'] or 0)) < 0.01
+                and abs(list_price - float(stored['list_price'] or 0)) < 0.01):
+            return 'unchanged', None
+
+        product = dict(stored)
+        product.update({
+            'current_price': current_price,
+            'list_price': list_price,
+            'discount_percent': scraper.calculate_discount(list_price, current_price),
+            'fingerprint': product_fingerprint(stored['title'], current_price, list_price)
+        })
+        logger.info("💱 %s fiyatı değişti: %s → %s (%s)", spec.key, stored['current_price'], current_price,
+                    stored['asin'])
+        return 'changed', normalize_product(product, spec.key)
+
+    def _reschedule(self, site: str, entry: RecrawlEntry, outcome: str, now: float):
+        """Sonuca göre aralığı uyarla ve ürünü kuyruğa geri koy"""
+        if outcome == 'gone':
+            self._gone.add(entry.product['asin'])
+            self._entries[site].pop(entry.product['asin'], None)
+            return
+
+        if outcome == 'changed':
+            entry.factor = max(0.25, entry.factor * 0.5)
+        elif outcome == 'unchanged':
+            entry.factor = min(4.0, entry.factor * 1.25)
+        if outcome != 'failed':
+            entry.last_checked = now
+        self._schedule(site, entry, now + self.interval(entry))
+
+    def stats(self) -> Dict:
+        """Site bazlı toplam sayaçlar, kuyruk boyu ve kalan saatlik bütçe"""
+        now = time.time()
+        with self._lock:
+            return {site: {**self._stats.get(site, {}), 'queued': len(entries),
+                           'due': sum(1 for entry in entries.values() if entry.next_due <= now),
+                           'budget_left': self.budget_left(site, now)}
+                    for site, entries in self._entries.items()}
@@ -0,0 +1,85 @@
+import importlib
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Kayıtlı siteleri tanımlayan modüller; import edildiklerinde @register_site çalışır
+SITE_MODULES = [
+    'scrapers.trendyol_scraper',
+    'scrapers.hepsiburada_scraper',
+    'scrapers.amazon_scraper',
+]
+
+_sites: Dict[str, 'SiteSpec'] = {}
+_loaded = False
+
+
+class SiteSpec:
+    """Bir sitenin tarama tanımı
+
+    key: kalıcı site anahtarı (products.site)
+    scraper_cls: page_url / parse_state / parse_page sağlayan BaseScraper alt sınıfı
+    fetch: 'http' (paylaşılan AsyncFetcher) veya 'sync' (sayfalar scraper.fetch_page ile thread'de
+           indirilir, parse ve yazma yine pipeline'da)
+    max_pages: liste başına taranacak sayfa sayısı (bkz. BaseScraper.listing_pages)
+    min_delay / max_delay / burst: host'a özel rate limiter bütçesi (None → env varsayılanı)
+    concurrency: host'a eşzamanlı istek sayısı (None → SCRAPING_CONCURRENCY_PER_HOST)
+    default: MainScraper'ın varsayılan taramasına dahil mi
+    """
+
+    def __init__(self, key: str, scraper_cls, fetch: str = 'http', max_pages: int = 2,
+                 min_delay: float = None, max_delay: float = None, burst: int = None,
+                 concurrency: int = None, default: bool = True):
+        self.key = key
+        self.scraper_cls = scraper_cls
+        self.fetch = fetch
+        self.max_pages = max_pages
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.burst = burst
+        self.concurrency = concurrency
+        self.default = default
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.scraper_cls.base_url).netloc
+
+    def create(self):
+        return self.scraper_cls()
+
+    def listing_urls(self) -> List[str]:
+        scraper = self.create()
+        return [scraper.page_url(page) for page in scraper.listing_pages(self.max_pages)]
+
+
+def register_site(key: str, **options):
+    """Scraper sınıfını registry'ye ekleyen dekoratör"""
+    def decorator(scraper_cls):
+        _sites[key] = SiteSpec(key, scraper_cls, **options)
+        scraper_cls.site_key = key
+        return scraper_cls
+    return decorator
+
+
+def load_sites():
+    """Yerleşik site modüllerini bir kez import et"""
+    global _loaded
+    if not _loaded:
+        for module in SITE_MODULES:
+            importlib.import_module(module)
+        _loaded = True
+
+
+def get_site(key: str) -> SiteSpec:
+    load_sites()
+    try:
+        return _sites[key.lower()]
+    except KeyError:
+        raise ValueError(f"Bilinmeyen site: {key}")
+
+
+def registered_sites(keys: Optional[List[str]] = None, include_optional: bool = False) -> List[SiteSpec]:
+    """Kayıtlı siteler; `keys` verilirse o sırayla, verilmezse varsayılanlar"""
+    load_sites()
+    if keys:
+        return [get_site(key) for key in keys]
+    return [spec for spec in _sites.values() if spec.default or include_optional]
@@ -0,0 +1,202 @@
+import os
+import json
+import asyncio
+import argparse
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+import requests
+from logger import get_logger
+from .fetcher import AsyncFetcher, FetchResult
+
+logger = get_logger(__name__)
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'benchmarks', 'fixtures')
+
+
+class FixtureStore:
+    """Kaydedilmiş liste sayfaları (URL → HTML dosyası) deposu"""
+
+    def __init__(self, root: str = DEFAULT_FIXTURE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.json')
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """URL için kayıt ve gövdeyi döndür"""
+        entry = self.index.get(url)
+        if not entry:
+            return None
+
+        with open(os.path.join(self.root, entry['file']), 'rb') as f:
+            body = f.read()
+        return {**entry, 'body': body}
+
+    def put(self, url: str, site: str, body: bytes, status: int = 200, name: str = None):
+        """Sayfayı depoya yaz ve index'i güncelle"""
+        if not name:
+            name = f"page_{len(self.urls(site)) + 1}.html"
+
+        relative = os.path.join(site, name)
+        os.makedirs(os.path.join(self.root, site), exist_ok=True)
+        with open(os.path.join(self.root, relative), 'wb') as f:
+            f.write(body)
+
+        self.index[url] = {'site': site, 'file': relative, 'status': status}
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+    def urls(self, site: str = None) -> List[str]:
+        """Depodaki URL'ler (isteğe bağlı site filtresi)"""
+        return [url for url, entry in self.index.items() if site is None or entry['site'] == site]
+
+
+def site_of(url: str) -> str:
+    """Fixture klasörü: www.trendyol.com → trendyol"""
+    return urlparse(url).netloc.replace('www.', '').split('.')[0]
+
+
+def build_response(url: str, body: bytes, status: int = 200) -> requests.Response:
+    """Ağ olmadan requests.Response oluştur"""
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response._content = body
+    response.encoding = 'utf-8'
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    return response
+
+
+class ReplaySession:
+    """requests.Session yerine geçen, cevapları FixtureStore'dan veren transport
+
+    `ReplaySession(store).attach(scraper)` ile senkron yol (fetch_page,
+    scrape_page, get_html) aynen çalışır; bilinmeyen URL'ler 404 döner.
+    Asenkron yol (scrape_async, CrawlPipeline) için ReplayFetcher kullanılır.
+    """
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        self.requests_served = 0
+        self.misses = []
+
+    def attach(self, scraper):
+        """Scraper'ın senkron transport'u yap; oturum havuzu ve rate limiter devre dışı kalır"""
+        scraper.session = self
+        scraper.session_pool = None
+        scraper.rate_limiter = None
+        return scraper
+
+    def get(self, url: str, headers: Dict = None, timeout: float = None, **kwargs) -> requests.Response:
+        entry = self.store.get(url)
+        self.requests_served += 1
+
+        if entry is None:
+            self.misses.append(url)
+            return build_response(url, b'', 404)
+        return build_response(url, entry['body'], entry.get('status', 200))
+
+    def close(self):
+        pass
+
+
+class RecordingSession:
+    """Gerçek isteği yapıp 200 cevapları FixtureStore'a kaydeden transport"""
+
+    def __init__(self, store: FixtureStore, session: requests.Session = None):
+        self.store = store
+        self.session = session or requests.Session()
+
+    def attach(self, scraper):
+        """Scraper'ın senkron transport'u yap (oturum havuzu istekleri bu transport'u atlardı)"""
+        scraper.session = self
+        scraper.session_pool = None
+        return scraper
+
+    def get(self, url: str, headers: Dict = None, timeout: float = None, **kwargs) -> requests.Response:
+        response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+        if response.status_code == 200:
+            self.store.put(url, site_of(url), response.content)
+            logger.info("💾 Fixture kaydedildi: %s", url)
+        return response
+
+    def close(self):
+        self.session.close()
+
+
+class ReplayFetcher(AsyncFetcher):
+    """Ağ yerine FixtureStore'dan cevap veren AsyncFetcher
+
+    `scraper.scrape_async(pages, fetcher=ReplayFetcher(store))` asenkron
+    yolu çevrimdışı çalıştırır; bilinmeyen URL'ler 404 döner. Rate limiter,
+    HTTP cache, fetch politikası ve oturum havuzu kullanılmaz.
+    """
+
+    def __init__(self, store: FixtureStore):
+        super().__init__(rate_limiter=None, cache=None, policy=None, session_pool=None)
+        self.store = store
+        self.requests_served = 0
+        self.misses = []
+
+    async def __aenter__(self) -> 'ReplayFetcher':
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def _fetch_once(self, url: str, headers: Dict[str, str] = None,
+                          empty_check: Callable[[bytes], bool] = None) -> FetchResult:
+        entry = self.store.get(url)
+        self.requests_served += 1
+        if entry is None:
+            self.misses.append(url)
+            return FetchResult(url, 404)
+        return self._result(url, entry.get('status', 200), entry['body'], {}, 0.0, empty_check=empty_check)
+
+
+class RecordingFetcher(AsyncFetcher):
+    """Gerçek isteği yapıp 200 cevapları FixtureStore'a kaydeden AsyncFetcher
+
+    HTTP cache kullanılmaz (304 cevabında kaydedilecek gövde olmaz).
+    """
+
+    def __init__(self, store: FixtureStore, **options):
+        super().__init__(cache=None, **options)
+        self.store = store
+
+    async def fetch(self, url: str, headers: Dict[str, str] = None,
+                    empty_check: Callable[[bytes], bool] = None) -> FetchResult:
+        result = await super().fetch(url, headers, empty_check)
+        if result.ok:
+            self.store.put(url, site_of(url), result.body)
+            logger.info("💾 Fixture kaydedildi: %s", url)
+        return result
+
+
+async def record(store: FixtureStore, scrapers: List, pages: int):
+    """Scraper'ların liste sayfalarını asenkron fetch yoluyla depoya kaydet"""
+    async with RecordingFetcher(store) as fetcher:
+        for scraper in scrapers:
+            await scraper.scrape_async(pages, fetcher)
+
+
+# Gerçek sayfaları yakalamak için
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Liste sayfalarını fixture olarak kaydet')
+    parser.add_argument('--root', default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument('--pages', type=int, default=2)
+    args = parser.parse_args()
+
+    from scrapers.trendyol_scraper import TrendyolScraper
+    from scrapers.hepsiburada_scraper import HepsiburadaScraper
+    from scrapers.amazon_scraper import AmazonScraper
+
+    # Benchmark'ın kullandığı kategori × sayfa fırsat listeleri
+    from benchmarks.make_fixtures import AMAZON_CATEGORIES
+
+    amazon = AmazonScraper()
+    amazon.categories = AMAZON_CATEGORIES
+    asyncio.run(record(FixtureStore(args.root), [TrendyolScraper(), HepsiburadaScraper(), amazon], args.pages))
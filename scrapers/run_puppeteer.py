@@ -1,65 +1,55 @@
-import subprocess
-import json
-import os
-import sys
 from datetime import datetime
+from typing import Dict, Iterator, List
+from logger import get_logger
+from scrapers.dedupe import DedupeIndex, dedupe_key
+from scrapers.fingerprint import product_fingerprint
+from scrapers.pipeline import normalize_product
+from scrapers.product_ids import product_id
+from scrapers.puppeteer_worker import PuppeteerWorker, get_puppeteer_worker
+
+logger = get_logger(__name__)
 
 class PuppeteerScraper:
-    def __init__(self):
-        self.script_path = os.path.join(os.path.dirname(__file__), 'puppeteer_scraper.js')
+    def __init__(self, worker: PuppeteerWorker = None):
+        # Tarayıcı her çağrıda açılmaz; paylaşılan worker sıcak tutar
+        self.worker = worker or get_puppeteer_worker()
+    
+    def stream_trendyol(self, queries: List[str] = None, limit: int = 50, max_pages: int = 1,
+                        timeout: int = 300) -> Iterator[Dict]:
+        """Yield products as the Puppeteer worker extracts them"""
+        # Sorgular arası aynı ürün farklı query parametreleriyle gelebilir (sadece bu akış için, dosyasız)
+        dedupe = DedupeIndex(path='')
         
+        for product in self.worker.scrape(queries, limit=limit, max_pages=max_pages, timeout=timeout):
+            if not dedupe.add(dedupe_key(product.get('site', 'Trendyol'), product['url'])):
+                continue
+            
+            product['scraped_at'] = datetime.now().isoformat()
+            product['source'] = 'puppeteer'
+            yield product
+    
     def scrape_trendyol(self):
-        """Run Puppeteer scraper and return parsed results"""
+        """Run a scrape job on the Puppeteer worker and return parsed results"""
         try:
-            result = subprocess.run(
-                ['node', self.script_path],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            if result.returncode != 0:
-                print(f"Puppeteer script error: {result.stderr}", file=sys.stderr)
-                return {
-                    'success': False,
-                    'error': f'Script execution failed: {result.stderr}',
-                    'products': [],
-                    'count': 0
-                }
+            products = list(self.stream_trendyol())
             
-            response = json.loads(result.stdout)
-            
-            if response.get('success', False):
-                products = response.get('products', [])
-                
-                for product in products:
-                    product['scraped_at'] = datetime.now().isoformat()
-                    product['source'] = 'puppeteer'
-                
-                return {
-                    'success': True,
-                    'products': products,
-                    'count': len(products),
-                    'scraped_at': datetime.now().isoformat()
-                }
-            else:
-                return response
-                
-        except subprocess.TimeoutExpired:
             return {
-                'success': False,
-                'error': 'Scraping timeout after 5 minutes',
-                'products': [],
-                'count': 0
+                'success': True,
+                'products': products,
+                'count': len(products),
+                'stats': self.worker.last_stats,
+                'scraped_at': datetime.now().isoformat()
             }
-        except json.JSONDecodeError as e:
+                
+        except TimeoutError:
             return {
                 'success': False,
-                'error': f'Failed to parse JSON response: {str(e)}',
+                'error': 'Scraping timeout after 5 minutes',
                 'products': [],
                 'count': 0
             }
         except Exception as e:
+            logger.error("Puppeteer worker error: %s", e)
             return {
                 'success': False,
                 'error': f'Unexpected error: {str(e)}',
@@ -73,25 +63,27 @@ class PuppeteerScraper:
             from database import Database
             
             db = Database()
-            saved_count = 0
+            rows = []
             
             for product in products:
                 try:
-                    success = db.save_product(
-                        title=product['title'],
-                        current_price=product['current_price'],
-                        original_price=product['original_price'],
-                        discount_percent=product['discount_percent'],
-                        url=product['url'],
-                        image_url=product.get('image_url', ''),
-                        site=product['site']
-                    )
-                    if success:
-                        saved_count += 1
+                    row = normalize_product({
+                        'asin': product_id(product['site'], product['url']),
+                        'title': product['title'],
+                        'current_price': product['current_price'],
+                        'list_price': product['original_price'],
+                        'discount_percent': product['discount_percent'],
+                        'product_url': product['url'],
+                        'image_url': product.get('image_url', '')
+                    }, product['site'].lower())
+                    row['fingerprint'] = product_fingerprint(row['title'], row['current_price'], row['list_price'])
+                    rows.append(row)
                 except Exception as e:
-                    print(f"Error saving product {product['title']}: {str(e)}", file=sys.stderr)
+                    logger.error("Error preparing product %s: %s", product.get('title'), e)
                     continue
             
+            saved_count = db.save_products_batch(rows)
+            
             return {
                 'success': True,
                 'saved_count': saved_count,
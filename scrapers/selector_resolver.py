@@ -0,0 +1,195 @@
+import os
+import json
+import atexit
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _found(value: Any) -> bool:
+    # Boş Tag'ler falsy olabildiği için truthiness yerine None/boş liste kontrolü
+    if isinstance(value, list):
+        return bool(value)
+    return value is not None
+
+
+class FieldState:
+    """Tek (site, alan) çiftinin öğrenilmiş selector'ı ve isabet sayaçları"""
+
+    __slots__ = ('selector', 'lookups', 'hits', 'fallbacks', 'window_lookups', 'window_hits',
+                 'hit_rate', 'alerts')
+
+    def __init__(self, selector: Optional[str] = None, hit_rate: Optional[float] = None):
+        self.selector = selector
+        self.lookups = 0
+        self.hits = 0
+        self.fallbacks = 0
+        self.window_lookups = 0
+        self.window_hits = 0
+        # Son tamamlanan pencerenin isabet oranı (önceki taramadan da gelebilir)
+        self.hit_rate = hit_rate
+        self.alerts = 0
+
+    def as_dict(self) -> Dict:
+        return {
+            'selector': self.selector,
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'fallbacks': self.fallbacks,
+            'hit_rate': self.hit_rate,
+            'alerts': self.alerts
+        }
+
+
+class SelectorResolver:
+    """Site ve alan başına kazanan selector'ı öğrenen çözümleyici
+
+    Kararlı durumda kart başına sadece öğrenilmiş selector denenir; eşleşmezse
+    yedekler sırayla denenir ve eşleşen yeni kazanan olur. Her
+    `revalidate_every` aramada bir liste baştan taranır ki site eski düzene
+    dönerse öncelikli selector geri alınsın. Alanın `window` aramalık isabet
+    oranı bir önceki pencereye göre `alert_drop` kadar düşerse uyarı loglanır.
+    Kazananlar ve son isabet oranları `path` verildiyse JSON olarak saklanır.
+    """
+
+    def __init__(self, path: str = None, revalidate_every: int = None, window: int = None,
+                 alert_drop: float = None):
+        self.path = path
+        self.revalidate_every = revalidate_every or int(os.environ.get('SELECTOR_REVALIDATE_EVERY', 500))
+        self.window = window or int(os.environ.get('SELECTOR_ALERT_WINDOW', 100))
+        self.alert_drop = alert_drop if alert_drop is not None else float(os.environ.get('SELECTOR_ALERT_DROP', 0.2))
+
+        self._fields: Dict[str, Dict[str, FieldState]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def select(self, site: str, field: str, root, selectors: List[str],
+               parse: Callable[[Any], Any] = None, first: bool = False) -> Any:
+        """`root` içinde alanı çıkar
+
+        first=True ise select_one ile tek eleman, değilse select ile liste aranır.
+        `parse` verilirse eşleşmeye uygulanır; None dönerse selector ıskalamış sayılır.
+        Hiçbiri tutmazsa None (first/parse) veya boş liste döner.
+        """
+        # Okuma kilitsiz; sayaçlar _record'da tek kilitle güncellenir
+        state = self._fields.get(site, {}).get(field) or self._state(site, field)
+        learned = state.selector if state.selector in selectors else None
+        revalidate = (state.lookups + 1) % self.revalidate_every == 0
+
+        if learned and not revalidate:
+            value = self._try(root, learned, parse, first)
+            if _found(value):
+                self._record(site, field, state, learned, hit=True)
+                return value
+
+        # Öğrenilmiş selector ıskaladı (veya periyodik kontrol): listeyi sırayla dene
+        for selector in selectors:
+            if selector == learned and not revalidate:
+                continue
+            value = self._try(root, selector, parse, first)
+            if _found(value):
+                self._record(site, field, state, selector, hit=True)
+                return value
+
+        self._record(site, field, state, None, hit=False)
+        return None if (first or parse) else []
+
+    def _try(self, root, selector: str, parse, first: bool) -> Any:
+        found = root.select_one(selector) if first else root.select(selector)
+        if not _found(found):
+            return None
+        return parse(found) if parse else found
+
+    def _record(self, site: str, field: str, state: FieldState, selector: Optional[str], hit: bool):
+        with self._lock:
+            state.lookups += 1
+            if hit:
+                state.hits += 1
+                state.window_hits += 1
+                if selector != state.selector:
+                    if state.selector is not None:
+                        state.fallbacks += 1
+                        logger.warning("🧩 %s/%s selector değişti: %s → %s", site, field, state.selector, selector)
+                    state.selector = selector
+                    self._dirty = True
+
+            state.window_lookups += 1
+            if state.window_lookups < self.window:
+                return
+
+            rate = state.window_hits / state.window_lookups
+            if state.hit_rate is not None and rate < state.hit_rate - self.alert_drop:
+                state.alerts += 1
+                logger.warning("🚨 %s/%s isabet oranı düştü: %%%.0f → %%%.0f (selector: %s)",
+                               site, field, state.hit_rate * 100, rate * 100, state.selector)
+            if state.hit_rate is None or abs(rate - state.hit_rate) >= 0.01:
+                self._dirty = True
+            state.hit_rate = round(rate, 4)
+            state.window_lookups = state.window_hits = 0
+            dirty, self._dirty = self._dirty, False
+
+        if dirty:
+            self.save()
+
+    def _state(self, site: str, field: str) -> FieldState:
+        with self._lock:
+            fields = self._fields.setdefault(site, {})
+            if field not in fields:
+                fields[field] = FieldState()
+            return fields[field]
+
+    def stats(self, site: str = None) -> Dict:
+        with self._lock:
+            sites = [site] if site else list(self._fields)
+            return {name: {field: state.as_dict() for field, state in self._fields.get(name, {}).items()}
+                    for name in sites}
+
+    def save(self):
+        """Kazanan selector'ları ve isabet oranlarını diske yaz"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {site: {field: {'selector': state.selector, 'hit_rate': state.hit_rate}
+                           for field, state in fields.items() if state.selector}
+                    for site, fields in self._fields.items()}
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("⚠️  Selector cache yazılamadı: %s", e)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️  Selector cache okunamadı: %s", e)
+            return
+        for site, fields in data.items():
+            for field, entry in fields.items():
+                self._fields.setdefault(site, {})[field] = FieldState(entry.get('selector'), entry.get('hit_rate'))
+        logger.info("🧩 Selector cache yüklendi: %s site", len(data))
+
+
+_shared_resolver = None
+_shared_lock = threading.Lock()
+
+
+def get_selector_resolver() -> SelectorResolver:
+    """Süreç genelinde paylaşılan çözümleyici (SELECTOR_CACHE_PATH tanımlıysa kalıcı)"""
+    global _shared_resolver
+    with _shared_lock:
+        if _shared_resolver is None:
+            _shared_resolver = SelectorResolver(os.environ.get('SELECTOR_CACHE_PATH'))
+            atexit.register(_shared_resolver.save)
+        return _shared_resolver
@@ -5,6 +5,7 @@ from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
 import time
 import os
+from scrapers.price_parser import parse_price
 
 def scrape_trendyol_with_selenium():
     options = Options()
@@ -41,11 +42,11 @@ def scrape_trendyol_with_selenium():
                 link = product.find_element(By.CSS_SELECTOR, 'a').get_attribute('href')
                 image = product.find_element(By.CSS_SELECTOR, 'img').get_attribute('src')
                 
-                current = float(current_price.replace('.', '').replace(',', '.').replace('TL', '').strip())
-                old = float(old_price.replace('.', '').replace(',', '.').replace('TL', '').strip())
+                current = parse_price(current_price)
+                old = parse_price(old_price)
                 disc_pct = int(discount.replace('%', '').strip())
                 
-                if disc_pct >= 20:
+                if disc_pct >= 20 and current and old:
                     results.append({
                         'title': title,
                         'current_price': current,
@@ -0,0 +1,198 @@
+import os
+import threading
+from collections import deque
+from http.cookies import SimpleCookie
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import requests
+from logger import get_logger
+from .block_detector import BLOCK_VERDICTS, OK
+
+logger = get_logger(__name__)
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0'
+]
+
+def _mask(proxy: Optional[str]) -> Optional[str]:
+    # Proxy kullanıcı adı/şifresi loglara ve istatistiklere yazılmaz
+    if not proxy:
+        return None
+    parsed = urlparse(proxy)
+    return f"{parsed.scheme}://{parsed.hostname}:{parsed.port}" if parsed.hostname else proxy
+
+
+class PooledSession:
+    """Tek istemci kimliği: kendi cookie jar'ı, User-Agent'ı ve (varsa) upstream proxy'si
+
+    Senkron yol `session` (requests) ile, asenkron yol `cookies_for` /
+    `store_cookies` ile aynı jar'ı kullanır.
+    """
+
+    def __init__(self, session_id: str, user_agent: str, proxy: str = None):
+        self.id = session_id
+        self.user_agent = user_agent
+        self.proxy = proxy
+        self.session = requests.Session()
+        if proxy:
+            self.session.proxies = {'http': proxy, 'https': proxy}
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.blocks = 0
+        # Başarı oranının üstel ortalaması (1 → sağlıklı)
+        self.health = 1.0
+        self.retired = None
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        return round(self.successes / self.requests, 3) if self.requests else None
+
+    def cookies_for(self, url: str) -> Dict[str, str]:
+        """Jar'daki, URL'in host'una uyan cookie'ler"""
+        host = urlparse(url).hostname or ''
+        cookies = {}
+        for cookie in self.session.cookies:
+            domain = cookie.domain.lstrip('.')
+            if not domain or host == domain or host.endswith('.' + domain):
+                cookies[cookie.name] = cookie.value
+        return cookies
+
+    def store_cookies(self, url: str, cookies: SimpleCookie):
+        """Asenkron cevabın Set-Cookie'lerini jar'a yaz"""
+        host = urlparse(url).hostname or ''
+        for name, morsel in cookies.items():
+            self.session.cookies.set(name, morsel.value, domain=morsel['domain'] or host, path=morsel['path'] or '/')
+
+    def as_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'proxy': _mask(self.proxy),
+            'user_agent': self.user_agent,
+            'requests': self.requests,
+            'successes': self.successes,
+            'failures': self.failures,
+            'blocks': self.blocks,
+            'success_rate': self.success_rate,
+            'health': round(self.health, 3),
+            'retired': self.retired
+        }
+
+
+class SessionPool:
+    """Host başına N istemci kimliğinden oluşan havuz
+
+    İstekler host'un aktif oturumlarına sırayla (round-robin) dağıtılır.
+    Engel sayfası (captcha, soft block, login; bkz. block_detector) alan
+    oturum hemen, sağlık puanı `min_health`'in altına düşen oturum
+    (proxy/ağ hataları) `min_requests` istekten sonra emekliye ayrılır ve
+    yerine yeni cookie jar'lı, sıradaki UA/proxy'li bir oturum açılır.
+    Proxy'ler (SESSION_PROXIES) oturumlara sırayla dağıtılır.
+    """
+
+    def __init__(self, size: int = None, proxies: List[str] = None, user_agents: List[str] = None,
+                 min_health: float = None, min_requests: int = 5):
+        # SESSION_POOL_SIZE varsayılanı 0 (havuz kapalı, bkz. get_session_pool); doğrudan oluşturulan havuz en az 1 oturum
+        self.size = max(1, size or int(os.environ.get('SESSION_POOL_SIZE', 0)))
+        if proxies is None:
+            proxies = [p.strip() for p in os.environ.get('SESSION_PROXIES', '').split(',') if p.strip()]
+        self.proxies = proxies
+        self.user_agents = user_agents or USER_AGENTS
+        self.min_health = (min_health if min_health is not None
+                           else float(os.environ.get('SESSION_MIN_HEALTH', 0.3)))
+        self.min_requests = min_requests
+
+        self._sessions: Dict[str, List[PooledSession]] = {}
+        self._retired: Dict[str, deque] = {}
+        self._cursor: Dict[str, int] = {}
+        self._created: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _new_session(self, host: str) -> PooledSession:
+        number = self._created.get(host, 0)
+        self._created[host] = number + 1
+        proxy = self.proxies[number % len(self.proxies)] if self.proxies else None
+        return PooledSession(f"{host}#{number + 1}", self.user_agents[number % len(self.user_agents)], proxy)
+
+    def _host_sessions(self, host: str) -> List[PooledSession]:
+        if host not in self._sessions:
+            self._sessions[host] = [self._new_session(host) for _ in range(self.size)]
+            self._retired[host] = deque(maxlen=20)
+            self._cursor[host] = 0
+        return self._sessions[host]
+
+    def acquire(self, url: str) -> PooledSession:
+        """URL'in host'u için sıradaki oturum"""
+        host = urlparse(url).netloc or url
+        with self._lock:
+            sessions = self._host_sessions(host)
+            index = self._cursor[host] % len(sessions)
+            self._cursor[host] = index + 1
+            return sessions[index]
+
+    def record(self, pooled: PooledSession, url: str, status: int = 0, verdict: str = OK,
+               error: str = None) -> bool:
+        """İstek sonucunu (durum kodu ve cevap sınıfı) oturuma işle; oturum emekliye ayrıldıysa True döndür"""
+        host = urlparse(url).netloc or url
+        blocked = error is None and verdict in BLOCK_VERDICTS
+        # 5xx ve 429 kimliğin sağlığını düşürür; 404 gibi sayfa hataları düşürmez
+        success = error is None and not blocked and status < 500 and status != 429
+
+        with self._lock:
+            pooled.requests += 1
+            if success:
+                pooled.successes += 1
+            elif blocked:
+                pooled.blocks += 1
+            else:
+                pooled.failures += 1
+            pooled.health = pooled.health * 0.8 + (0.2 if success else 0.0)
+
+            if pooled.retired:
+                return False
+            if blocked:
+                reason = verdict
+            elif pooled.requests >= self.min_requests and pooled.health < self.min_health:
+                reason = 'health'
+            else:
+                return False
+            self._retire(host, pooled, reason)
+            return True
+
+    def _retire(self, host: str, pooled: PooledSession, reason: str):
+        sessions = self._host_sessions(host)
+        if pooled not in sessions:
+            return
+        pooled.retired = reason
+        replacement = self._new_session(host)
+        sessions[sessions.index(pooled)] = replacement
+        self._retired[host].append(pooled)
+        logger.warning("🪪 %s oturumu emekliye ayrıldı (%s, başarı %s), yerine %s açıldı",
+                       pooled.id, reason, pooled.success_rate, replacement.id)
+
+    def stats(self, host: str = None) -> Dict:
+        """Host bazlı oturum istatistikleri (aktif ve son emekliye ayrılanlar)"""
+        with self._lock:
+            hosts = [host] if host is not None else list(self._sessions)
+            return {name: {
+                'active': [pooled.as_dict() for pooled in self._sessions.get(name, [])],
+                'retired': [pooled.as_dict() for pooled in self._retired.get(name, [])]
+            } for name in hosts}
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_session_pool() -> Optional[SessionPool]:
+    """SESSION_POOL_SIZE > 0 ise süreç genelinde paylaşılan oturum havuzu, değilse None"""
+    global _shared_pool
+    if int(os.environ.get('SESSION_POOL_SIZE', 0)) <= 0:
+        return None
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = SessionPool()
+        return _shared_pool
@@ -1,29 +1,67 @@
-from .base_scraper import BaseScraper
-from typing import List, Dict
+from .base_scraper import BaseScraper, DEFAULT_CATEGORY
+from .registry import register_site
+from .embedded_state import dig, first_list, to_float
+from .fingerprint import product_fingerprint
+from typing import Any, List, Dict, Optional
+from logger import get_logger
 
+logger = get_logger(__name__)
+
+@register_site('trendyol', max_pages=2)
 class TrendyolScraper(BaseScraper):
     """Trendyol indirimli ürün scraper'ı"""
     
-    def __init__(self):
-        super().__init__()
-        self.site_name = "Trendyol"
-        self.base_url = "https://www.trendyol.com"
-        self.found_urls = set()
+    site_name = "Trendyol"
+    base_url = "https://www.trendyol.com"
+    state_markers = ['window.__SEARCH_APP_INITIAL_STATE__']
+    empty_listing_markers = ['sonuç bulunamadı'.encode(), 'ürün bulunamadı'.encode()]
+    results_container_marker = b'prdct-cntnr-wrppr'
+    card_markers = [b'p-card-wrppr']
+    image_cdn = "https://cdn.dsmcdn.com"
+    detail_selectors = {
+        'price': ['.product-price-container .prc-dsc', '.prc-dsc', '.featured-prices .discounted'],
+        'list_price': ['.product-price-container .prc-org', '.prc-org'],
+        'breadcrumb': ['.product-detail-breadcrumb a', '.breadcrumb-wrapper a'],
+        'seller': ['.merchant-name', '.seller-name-text'],
+        'out_of_stock': ['.sold-out', '.out-of-stock']
+    }
     
-    def scrape_page(self, page: int = 1) -> List[Dict]:
-        """Trendyol indirimli ürünler sayfasını scrape et"""
-        print(f"\n🛍️ {self.site_name} sayfa {page} taranıyor...")
-        
-        # İndirimli ürünler URL'i
-        url = f"https://www.trendyol.com/sr?pi={page}&sst=DISCOUNTED"
-        
-        soup = self.get_html(url, "trendyol")
-        if not soup:
-            return []
+    def page_url(self, page: int) -> str:
+        """İndirimli ürünler URL'i"""
+        return f"https://www.trendyol.com/sr?pi={page}&sst=DISCOUNTED"
+    
+    def state_items(self, state: Any) -> Optional[List]:
+        """Arama sonucu state'indeki ürünler"""
+        return first_list(state, [('products',), ('searchResult', 'products')])
+    
+    def product_from_state(self, item: Dict) -> Optional[Dict]:
+        """Trendyol state ürününü ürün dict'ine çevir"""
+        title = item.get('name')
+        href = item.get('url')
+        current_price = to_float(dig(item, 'price', 'discountedPrice')) or to_float(dig(item, 'price', 'sellingPrice'))
+        old_price = to_float(dig(item, 'price', 'originalPrice'))
+        if not title or not href or not current_price or not old_price:
+            return None
         
-        # Debug HTML kaydet
-        self.save_debug_html(str(soup), "trendyol", page)
+        image = dig(item, 'images', 0, default='')
+        if image and not image.startswith('http'):
+            image = self.image_cdn + image
         
+        return {
+            'title': title,
+            'current_price': current_price,
+            'list_price': old_price,
+            'product_url': self.build_full_url(self.base_url, href),
+            'image_url': image,
+            'category': item.get('categoryName') or DEFAULT_CATEGORY,
+            'brand': dig(item, 'brand', 'name'),
+            'site_product_id': str(item['id']) if item.get('id') is not None else None,
+            'rating': to_float(dig(item, 'ratingScore', 'averageRating')),
+            'rating_count': dig(item, 'ratingScore', 'totalCount')
+        }
+    
+    def parse_page(self, soup, page: int = 1) -> List[Dict]:
+        """Trendyol indirimli ürünler sayfasını parse et"""
         # Ürün kartlarını bul
         product_selectors = [
             'div.p-card-wrppr',
@@ -39,71 +77,55 @@ class TrendyolScraper(BaseScraper):
         
         for i, card in enumerate(product_cards[:20]):  # Max 20 ürün/sayfa
             try:
-                print(f"\n--- {self.site_name} Ürün {i+1} ---")
+                logger.debug("--- %s Ürün %s ---", self.site_name, i + 1)
                 
-                # 1. Başlık
-                title_selectors = [
-                    'span.prdct-desc-cntnr-name',
-                    '.product-name',
-                    '.p-card-chldrn-cntnr span'
-                ]
-                title_elements = self.extract_multiple_selectors(card, title_selectors, "başlık")
-                if not title_elements:
-                    self.log_product_skipped(self.site_name, "Başlık bulunamadı")
-                    continue
-                
-                title = self.extract_text_safe(title_elements[0])
-                print(f"📝 Başlık: {title[:60]}...")
-                
-                # 2. Link
+                # 1. Link
                 link_selectors = [
                     'a.p-card-chldrn-cntnr',
                     'a'
                 ]
-                link_elements = self.extract_multiple_selectors(card, link_selectors, "link")
+                link_element = self.extract_first(card, link_selectors, "link")
                 product_url = ""
-                if link_elements:
-                    href = self.extract_attr_safe(link_elements[0], 'href')
+                if link_element is not None:
+                    href = self.extract_attr_safe(link_element, 'href')
                     product_url = self.build_full_url(self.base_url, href)
                 
-                # Duplicate kontrol
-                if product_url in self.found_urls:
+                # Duplicate kontrol (aynı ürünün diğer URL varyantları dahil, kart daha fazla parse edilmeden)
+                if self.is_duplicate(product_url):
                     self.log_product_skipped(self.site_name, "Duplicate ürün")
                     continue
                 
+                # 2. Başlık
+                title_selectors = [
+                    'span.prdct-desc-cntnr-name',
+                    '.product-name',
+                    '.p-card-chldrn-cntnr span'
+                ]
+                title_element = self.extract_first(card, title_selectors, "başlık")
+                if title_element is None:
+                    self.log_product_skipped(self.site_name, "Başlık bulunamadı")
+                    continue
+                
+                title = self.extract_text_safe(title_element)
+                logger.debug("📝 Başlık: %s...", title[:60])
+                
                 # 3. Mevcut fiyat
-                current_price = None
                 price_selectors = [
                     'div.prc-box-dscntd',
                     '.discounted-price',
                     '.current-price'
                 ]
-                
-                for selector in price_selectors:
-                    price_elements = card.select(selector)
-                    if price_elements:
-                        price_text = self.extract_text_safe(price_elements[0])
-                        current_price = self.parse_price(price_text)
-                        if current_price:
-                            print(f"💰 Mevcut fiyat: {current_price}₺")
-                            break
+                current_price = self.extract_first(card, price_selectors, "mevcut fiyat", parse=self.element_price)
+                logger.debug("💰 Mevcut fiyat: %s₺", current_price)
                 
                 # 4. Eski fiyat
-                old_price = None
                 old_price_selectors = [
                     'div.prc-box-orgnl',
                     '.original-price',
                     '.old-price'
                 ]
-                
-                for selector in old_price_selectors:
-                    old_price_elements = card.select(selector)
-                    if old_price_elements:
-                        old_price_text = self.extract_text_safe(old_price_elements[0])
-                        old_price = self.parse_price(old_price_text)
-                        if old_price:
-                            print(f"🏷️ Eski fiyat: {old_price}₺")
-                            break
+                old_price = self.extract_first(card, old_price_selectors, "eski fiyat", parse=self.element_price)
+                logger.debug("🏷️ Eski fiyat: %s₺", old_price)
                 
                 # 5. İndirim hesaplama
                 if not current_price:
@@ -114,6 +136,12 @@ class TrendyolScraper(BaseScraper):
                     self.log_product_skipped(self.site_name, "Eski fiyat bulunamadı")
                     continue
                 
+                # Son taramadan beri değişmediyse kalan çıkarım ve DB yazımı atlanır
+                asin = self.generate_product_id(self.site_name, product_url)
+                fingerprint = product_fingerprint(title, current_price, old_price)
+                if self.is_unchanged(asin, fingerprint):
+                    continue
+                
                 discount_percent = self.calculate_discount(old_price, current_price)
                 
                 if not self.is_valid_deal(discount_percent, min_discount=40):
@@ -125,58 +153,32 @@ class TrendyolScraper(BaseScraper):
                     'img.p-card-img',
                     'img'
                 ]
-                img_elements = self.extract_multiple_selectors(card, img_selectors, "resim")
+                img_element = self.extract_first(card, img_selectors, "resim")
                 image_url = ""
-                if img_elements:
-                    image_url = self.extract_attr_safe(img_elements[0], 'src') or \
-                               self.extract_attr_safe(img_elements[0], 'data-src')
+                if img_element is not None:
+                    image_url = self.extract_attr_safe(img_element, 'src') or \
+                               self.extract_attr_safe(img_element, 'data-src')
                 
                 # 7. Ürün verisi oluştur
                 product_data = {
-                    'asin': self.generate_product_id(self.site_name, product_url),
+                    'asin': asin,
                     'title': title,
                     'current_price': current_price,
                     'list_price': old_price,
                     'discount_percent': discount_percent,
                     'product_url': product_url,
                     'image_url': image_url,
-                    'category': 'Elektronik',
-                    'site_name': self.site_name
+                    'category': DEFAULT_CATEGORY,
+                    'site_name': self.site_name,
+                    'fingerprint': fingerprint
                 }
                 
                 found_products.append(product_data)
-                self.found_urls.add(product_url)
                 self.log_product_found(self.site_name, title, discount_percent, current_price)
                 
-                # Rate limiting
-                self.wait_between_requests(2, 3)
-                
             except Exception as e:
                 self.log_error(self.site_name, f"Ürün {i+1} işleme hatası: {e}")
                 continue
         
-        print(f"\n🎯 {self.site_name} sayfa {page}: {len(found_products)} ürün bulundu")
+        logger.info("🎯 %s sayfa %s: %s ürün bulundu", self.site_name, page, len(found_products))
         return found_products
-    
-    def scrape(self, max_pages: int = 2) -> List[Dict]:
-        """Trendyol'dan tüm indirimleri scrape et"""
-        print(f"\n🚀 {self.site_name} scraping başlıyor...")
-        
-        all_products = []
-        self.found_urls.clear()
-        
-        for page in range(1, max_pages + 1):
-            try:
-                products = self.scrape_page(page)
-                all_products.extend(products)
-                
-                # Sayfalar arası bekleme
-                if page < max_pages:
-                    self.wait_between_requests(3, 5)
-                    
-            except Exception as e:
-                self.log_error(self.site_name, f"Sayfa {page} hatası: {e}")
-                continue
-        
-        print(f"\n✅ {self.site_name} tamamlandı: {len(all_products)} ürün")
-        return all_products
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+import pytest
+from aiohttp import web
+
+# Testler ağdan, veritabanından ve paylaşılan ayarlardan bağımsız çalışır
+for name in ('HTTP_CACHE_PATH', 'DEDUPE_INDEX_PATH', 'DEBUG_CAPTURE_DIR', 'SESSION_POOL_SIZE', 'SESSION_PROXIES'):
+    os.environ.pop(name, None)
+os.environ['ENRICH_CONCURRENCY'] = '0'
+os.environ['RECRAWL_BUDGET_PER_HOUR'] = '0'
+os.environ['SCRAPING_DELAY_MIN'] = os.environ['SCRAPING_DELAY_MAX'] = '0'
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+@contextmanager
+def serve(app: web.Application):
+    """aiohttp uygulamasını ayrı thread'de, rastgele portta çalıştır; kök URL'i ver"""
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app, access_log=None)
+    started = threading.Event()
+    holder = {}
+
+    async def start():
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        holder['port'] = site._server.sockets[0].getsockname()[1]
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(10)
+    try:
+        yield f"http://127.0.0.1:{holder['port']}"
+    finally:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(10)
+
+
+def listing_app(fixture_store) -> web.Application:
+    """Trendyol liste fixture'larını /sr?pi=<sayfa> altında sunan uygulama"""
+    async def listing(request):
+        entry = fixture_store.get(f"https://www.trendyol.com/sr?pi={request.query['pi']}&sst=DISCOUNTED")
+        return web.Response(body=entry['body'], content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/sr', listing)
+    return app
+
+
+def local_site(base_url: str, max_pages: int = 2):
+    """Liste sayfalarını yerel sunucudan çeken Trendyol SiteSpec'i"""
+    from scrapers.registry import SiteSpec
+    from scrapers.trendyol_scraper import TrendyolScraper
+
+    class LocalTrendyolScraper(TrendyolScraper):
+        site_key = 'trendyol'
+
+        def page_url(self, page: int) -> str:
+            return f"{base_url}/sr?pi={page}&sst=DISCOUNTED"
+
+    return SiteSpec('trendyol', LocalTrendyolScraper, max_pages=max_pages)
+
+
+class FakeDatabase:
+    """Pipeline testleri için yazılanları bellekte tutan Database yerine geçen nesne"""
+
+    def __init__(self, fingerprints: dict = None, fail: bool = False):
+        self.fingerprints = fingerprints or {}
+        self.fail = fail
+        self.saved = []
+        self.touched = []
+
+    def get_fingerprints(self):
+        return dict(self.fingerprints)
+
+    def save_products_batch(self, batch):
+        if self.fail:
+            return 0
+        self.saved.extend(batch)
+        return len(batch)
+
+    def touch_products(self, asins):
+        self.touched.extend(asins)
+        return len(asins)
+
+
+@pytest.fixture
+def fixture_store():
+    from scrapers.replay import FixtureStore
+    return FixtureStore(FIXTURE_DIR)
+
+
+@pytest.fixture(scope='session')
+def database_url(tmp_path_factory):
+    """TEST_DATABASE_URL (boş test veritabanı) veya pgserver ile geçici PostgreSQL; ikisi de yoksa skip"""
+    url = os.environ.get('TEST_DATABASE_URL')
+    if url:
+        yield url
+        return
+    pgserver = pytest.importorskip('pgserver', reason='PostgreSQL testleri için TEST_DATABASE_URL veya pgserver gerekli')
+    # Sunucu süreci pytest çıktıyı kapattıktan sonra da log yazar
+    logging.getLogger('pgserver').setLevel(logging.WARNING)
+    server = pgserver.get_server(str(tmp_path_factory.mktemp('postgres')), cleanup_mode='stop')
+    yield server.get_uri()
+    server.cleanup()
+
+
+@pytest.fixture
+def db(database_url, monkeypatch):
+    """Her test için tabloları sıfırdan oluşturulmuş Database"""
+    import psycopg2
+    conn = psycopg2.connect(database_url)
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS price_history, products, user_preferences CASCADE")
+    conn.close()
+
+    monkeypatch.setenv('DATABASE_URL', database_url)
+    from database import Database
+    database = Database()
+    yield database
+    database.close()
@@ -0,0 +1,127 @@
+from datetime import datetime
+import pytest
+from scrapers.amazon_scraper import AmazonListing, AmazonScraper
+from scrapers.dedupe import DedupeIndex, dedupe_key
+from scrapers.fetcher import FetchResult
+from scrapers.html_parser import parse_html
+from scrapers.pipeline import normalize_product
+from scrapers.registry import get_site
+
+LISTING = AmazonListing('Bilgisayar', 'mouse', 1)
+
+
+def card(asin='B0TEST0001', title='Kablosuz Mouse', price='599,90 TL', strike='1.199,00 TL', href=None,
+         component='s-search-result'):
+    href = href if href is not None else f'/Kablosuz-Mouse/dp/{asin}/ref=sr_1_1'
+    strike_html = (f'<span class="a-price a-text-price" data-a-strike="true"><span class="a-offscreen">{strike}</span>'
+                   f'</span>') if strike else ''
+    return (f'<div data-asin="{asin}" data-component-type="{component}" class="s-result-item s-asin">'
+            f'<h2><a href="{href}"><span>{title}</span></a></h2>'
+            f'<span class="a-price"><span class="a-offscreen">{price}</span></span>{strike_html}'
+            f'<img class="s-image" src="https://m.media-amazon.com/images/I/{asin}.jpg"></div>')
+
+
+def parse(scraper, *cards):
+    body = f'<html><body><div class="s-main-slot">{"".join(cards)}</div></body></html>'
+    return scraper.parse_page(parse_html(body.encode()), LISTING)
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.setenv('AMAZON_CATEGORIES', 'Bilgisayar:mouse,Oyun:/s?i=videogames')
+    monkeypatch.delenv('AMAZON_DEAL_DISCOUNT', raising=False)
+    scraper = AmazonScraper()
+    scraper.dedupe = DedupeIndex(path='')
+    return scraper
+
+
+def test_page_urls_and_paging(scraper):
+    assert scraper.page_url(LISTING) == 'https://www.amazon.com.tr/s?k=mouse&rh=p_8%3A40-'
+    assert scraper.page_url(AmazonListing('Bilgisayar', 'mouse', 3)).endswith('&page=3')
+    assert scraper.page_url(AmazonListing('Oyun', '/s?i=videogames', 1)) == 'https://www.amazon.com.tr/s?i=videogames'
+    assert scraper.page_url(AmazonListing('Oyun', '/s?i=videogames', 2)) == (
+        'https://www.amazon.com.tr/s?i=videogames&page=2')
+    # Sayı verilirse ilk kategori
+    assert scraper.page_url(2) == scraper.page_url(AmazonListing('Bilgisayar', 'mouse', 2))
+
+    scraper.deal_discount = 0
+    assert scraper.page_url(LISTING) == 'https://www.amazon.com.tr/s?k=mouse'
+
+
+def test_listing_pages_follow_max_pages(scraper):
+    assert [str(listing) for listing in scraper.listing_pages(2)] == [
+        'Bilgisayar/1', 'Bilgisayar/2', 'Oyun/1', 'Oyun/2']
+
+    spec = get_site('amazon')
+    urls = spec.listing_urls()
+    assert len(urls) == len(AmazonScraper().categories) * spec.max_pages == len(set(urls))
+
+
+def test_prices_discount_and_stable_ids(scraper):
+    products = parse(scraper, card())
+    assert products == [{
+        'asin': 'AMB0TEST0001', 'title': 'Kablosuz Mouse', 'current_price': 599.9, 'list_price': 1199.0,
+        'discount_percent': 49, 'product_url': 'https://www.amazon.com.tr/Kablosuz-Mouse/dp/B0TEST0001/ref=sr_1_1',
+        'image_url': 'https://m.media-amazon.com/images/I/B0TEST0001.jpg', 'category': 'Bilgisayar',
+        'site_name': 'Amazon', 'fingerprint': products[0]['fingerprint']}]
+    assert products[0]['asin'] == dedupe_key('Amazon', products[0]['product_url'])
+
+
+def test_sponsored_placeholder_and_weak_cards_are_skipped(scraper):
+    products = parse(
+        scraper,
+        '<div data-asin="" data-component-type="s-search-result" class="s-result-item AdHolder"></div>',
+        card('B0TEST0001'),
+        # Sponsorlu kopya: aynı ASIN, farklı ref kuyruğu
+        card('B0TEST0001', href='/Kablosuz-Mouse/dp/B0TEST0001/ref=sxin_sspa'),
+        card('B0TEST0002', strike=None),
+        card('B0TEST0003', price='1.100,00 TL', strike='1.199,00 TL'),
+        card('B0TEST0004', title=''),
+    )
+    assert [product['asin'] for product in products] == ['AMB0TEST0001']
+    assert scraper.dedupe.hits == 1
+
+
+def test_asin_falls_back_to_product_url(scraper):
+    products = parse(scraper, card(asin='', href='/Oyun-Kumandasi/gp/product/B0URLASIN1?psc=1'),
+                     card(asin='', href='/kampanya/ozel-sayfa'))
+    assert [product['asin'] for product in products] == ['AMB0URLASIN1']
+
+
+def test_fixture_pages_use_prefixed_ids(fixture_store):
+    scraper = AmazonScraper()
+    for listing in scraper.listing_pages(2):
+        scraper.categories = [(listing.category, listing.query)]
+        url = scraper.page_url(listing)
+        if fixture_store.get(url) is None:
+            continue
+        products = scraper.parse_result(FetchResult(url, 200, fixture_store.get(url)['body']), listing)
+        assert products
+        assert all(product['asin'].startswith('AM') and len(product['asin']) == 12 for product in products)
+        assert all(product['asin'] == dedupe_key('Amazon', product['product_url']) for product in products)
+
+
+def test_touching_carried_keys_updates_amazon_rows(db, fixture_store, tmp_path):
+    url = 'https://www.amazon.com.tr/s?k=mouse&rh=p_8%3A40-'
+    result = FetchResult(url, 200, fixture_store.get(url)['body'])
+    path = str(tmp_path / 'dedupe.amazon.bloom')
+
+    first = AmazonScraper()
+    first.dedupe = DedupeIndex(path, capacity=1000)
+    products = [normalize_product(product, 'amazon') for product in first.parse_result(result, 1)]
+    assert db.save_products_batch(products) == len(products)
+    first.dedupe.save()
+    with db.conn.cursor() as cursor:
+        cursor.execute("UPDATE products SET last_seen = %s", (datetime(2024, 1, 1),))
+
+    # Yarıda kalan tarama devam ediyor: ürünler zaten görülmüş, sadece last_seen güncellenmeli
+    resumed = AmazonScraper()
+    resumed.dedupe = DedupeIndex(path, capacity=1000)
+    assert resumed.parse_result(result, 1) == []
+    carried = resumed.dedupe.drain_carried()
+
+    assert set(product['asin'] for product in products) <= set(carried)
+    assert db.touch_products(carried) == len(products)
+    with db.conn.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM products WHERE last_seen > %s", (datetime(2024, 1, 1),))
+        assert cursor.fetchone()[0] == len(products)
@@ -0,0 +1,103 @@
+import os
+import asyncio
+import pytest
+from aiohttp import web
+from scrapers.amazon_scraper import AmazonScraper
+from scrapers.block_detector import CAPTCHA, EMPTY, LOGIN, OK, SOFT_BLOCK, classify_response, is_login_url
+from scrapers.fetcher import AsyncFetcher
+from scrapers.hepsiburada_scraper import HepsiburadaScraper
+from scrapers.trendyol_scraper import TrendyolScraper
+from tests.conftest import FIXTURE_DIR, serve
+
+PAGE = b'<html>' + b'x' * 4096 + b'</html>'
+PADDING = '<p>' + 'x' * 4096 + '</p>'
+SCRAPERS = {'trendyol': TrendyolScraper, 'hepsiburada': HepsiburadaScraper, 'amazon': AmazonScraper}
+
+
+def fixture_body(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('url', ['https://www.trendyol.com/giris?cb=/sr', 'https://giris.hepsiburada.com/',
+                                 'https://www.amazon.com.tr/ap/signin?openid=x'])
+def test_login_urls(url):
+    assert is_login_url(url)
+    assert classify_response(200, PAGE, url) == LOGIN
+
+
+def test_login_redirect_and_401():
+    assert classify_response(302, b'', 'https://www.trendyol.com/sr', {'Location': '/giris'}) == LOGIN
+    assert classify_response(302, b'', 'https://www.trendyol.com/sr', {'location': '/sr?pi=2'}) == OK
+    assert classify_response(401, b'') == LOGIN
+    assert not is_login_url('https://www.trendyol.com/sr?q=login')
+
+
+@pytest.mark.parametrize('status, body, expected', [
+    (200, b'<html><title>Robot Check</title>' + b' ' * 2048 + b'</html>', CAPTCHA),
+    (200, '<html>Lütfen captcha doğrulamasını tamamlayın</html>'.encode(), CAPTCHA),
+    (403, b'<html>Access Denied</html>', SOFT_BLOCK),
+    (200, b'<html>Pardon Our Interruption' + b' ' * 2048 + b'</html>', SOFT_BLOCK),
+    (403, b'', SOFT_BLOCK),
+    (200, b'<html></html>', EMPTY),
+    (200, PAGE, OK),
+    (404, b'Not Found', OK),
+    (503, b'<html>Service Unavailable</html>', OK),
+])
+def test_verdicts(status, body, expected):
+    assert classify_response(status, body, 'https://www.trendyol.com/sr') == expected
+
+
+def test_large_pages_with_captcha_scripts_are_ok():
+    body = b'<script src="https://www.google.com/recaptcha/api.js"></script>' + b'x' * (70 * 1024)
+    assert classify_response(200, body) == OK
+
+
+@pytest.mark.parametrize('site, fixture', [('trendyol', 'trendyol/page_1.html'),
+                                           ('hepsiburada', 'hepsiburada/page_1.html'),
+                                           ('amazon', 'amazon/bilgisayar_page_1.html')])
+def test_fixture_listings_are_not_empty(site, fixture):
+    scraper = SCRAPERS[site]()
+    assert not scraper.is_empty_listing(fixture_body(fixture))
+    assert classify_response(200, fixture_body(fixture), empty_check=scraper.is_empty_listing) == OK
+
+
+@pytest.mark.parametrize('site, body', [
+    ('trendyol', f'<div class="prdct-cntnr-wrppr"></div>{PADDING}'),
+    ('trendyol', f'<div>Aradığınız kriterlere uygun sonuç bulunamadı</div>{PADDING}'),
+    ('hepsiburada', f'<ul class="productListContent-wrapper"></ul>{PADDING}'),
+    ('amazon', f'<div class="s-main-slot s-result-list"><div class="s-result-item AdHolder"></div></div>{PADDING}'),
+    ('amazon', f'<span>"kumanda" için sonuç bulunamadı.</span>{PADDING}'),
+])
+def test_site_empty_listings(site, body):
+    scraper = SCRAPERS[site]()
+    assert scraper.is_empty_listing(body.encode())
+    assert classify_response(200, body.encode(), empty_check=scraper.is_empty_listing) == EMPTY
+    # Site kontrolü verilmezse sadece boyut kontrolü kalır
+    assert classify_response(200, body.encode()) == OK
+
+
+def test_container_rule_skips_pages_with_embedded_state():
+    body = (f'<ul class="productListContent-wrapper"></ul>'
+            f'<script id="reduxStore" type="application/json">{{"products": []}}</script>{PADDING}')
+    assert not HepsiburadaScraper().is_empty_listing(body.encode())
+
+
+def test_fetcher_marks_empty_listing():
+    empty = f'<div class="prdct-cntnr-wrppr"></div>{PADDING}'
+
+    async def page(request):
+        return web.Response(text=empty if request.query['pi'] == '9' else fixture_body('trendyol/page_1.html').decode(),
+                            content_type='text/html')
+
+    async def fetch_pages(base_url, check):
+        async with AsyncFetcher(rate_limiter=None, cache=None, policy=None, session_pool=None) as fetcher:
+            return [await fetcher.fetch(f'{base_url}/sr?pi={page}', empty_check=check) for page in (1, 9)]
+
+    app = web.Application()
+    app.router.add_get('/sr', page)
+    with serve(app) as base_url:
+        results = asyncio.run(fetch_pages(base_url, TrendyolScraper().is_empty_listing))
+
+    assert [result.verdict for result in results] == [OK, EMPTY]
+    assert not results[1].ok
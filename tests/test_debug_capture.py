@@ -0,0 +1,101 @@
+import gzip
+import os
+import threading
+import pytest
+from scrapers import debug_capture
+from scrapers.debug_capture import DebugCapture, get_debug_capture
+
+
+@pytest.fixture
+def make_capture(tmp_path):
+    captures = []
+
+    def make(**kwargs):
+        kwargs.setdefault('sample_every', 0)
+        kwargs.setdefault('max_bytes', 64 * 1024)
+        capture = DebugCapture(str(tmp_path / 'captures'), **kwargs)
+        captures.append(capture)
+        return capture
+
+    yield make
+    for capture in captures:
+        capture.close()
+
+
+def captured_files(capture):
+    """Yakalama dosyaları, yazılış sırasıyla"""
+    names = [name for name in os.listdir(capture.directory) if name.endswith('.html.gz')]
+    return sorted(names, key=lambda name: os.stat(os.path.join(capture.directory, name)).st_mtime_ns)
+
+
+def test_failed_pages_always_and_others_one_in_n(make_capture):
+    capture = make_capture(sample_every=3)
+    decisions = [capture.should_capture(failed=False) for _ in range(9)]
+    assert decisions == [False, False, True] * 3
+    assert capture.should_capture(failed=True)
+
+    only_errors = make_capture(sample_every=0)
+    assert not any(only_errors.should_capture(failed=False) for _ in range(10))
+    assert only_errors.should_capture(failed=True)
+
+
+def test_captured_pages_are_gzipped_html(make_capture):
+    capture = make_capture(sample_every=2)
+    for page in range(1, 5):
+        capture.observe('trendyol', f'Elektronik/{page}', f'<html>sayfa {page}</html>'.encode(), failed=False)
+    capture.observe('amazon', 7, b'<html>bozuk</html>', failed=True, reason='error')
+    capture.flush()
+
+    names = captured_files(capture)
+    assert capture.stats() == {'captured': 3, 'dropped': 0, 'seen': 5}
+    assert [name.split('_', 1)[1] for name in names] == [
+        'trendyol_Elektronik-2_sample.html.gz', 'trendyol_Elektronik-4_sample.html.gz', 'amazon_7_error.html.gz']
+    with gzip.open(os.path.join(capture.directory, names[-1])) as f:
+        assert f.read() == b'<html>bozuk</html>'
+
+
+def test_oldest_captures_are_removed_over_size_cap(make_capture):
+    # Rastgele gövde sıkışmaz: her dosya ~1 KB, sınır iki dosyaya yeter
+    capture = make_capture(max_bytes=2500)
+    for page in range(1, 6):
+        capture.capture('hepsiburada', page, os.urandom(1000), 'error')
+        capture.flush()
+
+    names = captured_files(capture)
+    assert [name.split('_', 2)[2] for name in names] == ['4_error.html.gz', '5_error.html.gz']
+    assert sum(os.path.getsize(os.path.join(capture.directory, name)) for name in names) <= 2500
+    assert capture.captured == 5
+
+
+def test_full_queue_drops_instead_of_blocking(make_capture, monkeypatch):
+    release = threading.Event()
+    real_open = gzip.open
+
+    def slow_open(*args, **kwargs):
+        release.wait(5)
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(debug_capture.gzip, 'open', slow_open)
+    capture = make_capture(queue_size=1)
+    for page in range(1, 5):
+        capture.capture('trendyol', page, b'<html></html>', 'error')
+
+    # Biri yazılırken biri kuyrukta bekler, kalanlar atlanır
+    assert capture.dropped >= 2
+    release.set()
+    capture.flush()
+    assert capture.captured + capture.dropped == 4
+
+
+def test_shared_capture_follows_env(monkeypatch, tmp_path):
+    monkeypatch.delenv('DEBUG_CAPTURE_DIR', raising=False)
+    assert get_debug_capture() is None
+
+    monkeypatch.setattr(debug_capture, '_shared_capture', None)
+    monkeypatch.setenv('DEBUG_CAPTURE_DIR', str(tmp_path / 'debug'))
+    shared = get_debug_capture()
+    try:
+        assert shared is get_debug_capture()
+        assert shared.directory == str(tmp_path / 'debug') and os.path.isdir(shared.directory)
+    finally:
+        shared.close()
@@ -0,0 +1,87 @@
+import os
+import time
+from scrapers.dedupe import DedupeIndex, dedupe_key
+from scrapers.pipeline import CrawlPipeline
+from tests.conftest import FakeDatabase, listing_app, local_site, serve
+
+
+def test_url_variants_share_key():
+    plain = dedupe_key('Trendyol', 'https://www.trendyol.com/marka/urun-p-123456')
+    tracked = dedupe_key('Trendyol', 'https://m.trendyol.com/marka/urun-p-123456?boutiqueId=1&merchantId=2#yorum')
+    assert plain == tracked
+
+
+def test_set_mode_without_path():
+    index = DedupeIndex(path='')
+    assert index.add('a')
+    assert not index.add('a')
+    assert index.hits == 1
+    index.save()
+    assert index.drain_carried() == []
+
+
+def test_resumed_index_carries_previous_keys(tmp_path):
+    path = str(tmp_path / 'dedupe.bloom')
+    first = DedupeIndex(path, capacity=1000)
+    assert first.add('TR-1') and first.add('TR-2')
+    first.save()
+
+    resumed = DedupeIndex(path, capacity=1000)
+    assert resumed.started_at == first.started_at
+    assert not resumed.add('TR-1')
+    assert resumed.add('TR-3')
+    assert resumed.drain_carried() == ['TR-1']
+    assert resumed.drain_carried() == []
+
+    # Devam eden tarama pencereyi uzatmaz ve önceki anahtarları korur
+    resumed.save()
+    assert os.path.getmtime(path) == first.started_at
+    again = DedupeIndex(path, capacity=1000)
+    assert 'TR-2' in again and 'TR-3' in again
+
+
+def test_expired_index_starts_fresh(tmp_path):
+    path = str(tmp_path / 'dedupe.bloom')
+    first = DedupeIndex(path, capacity=1000)
+    first.add('TR-1')
+    first.save()
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+
+    fresh = DedupeIndex(path, max_age=1800, capacity=1000)
+    assert fresh.add('TR-1')
+    assert fresh.drain_carried() == []
+
+
+def test_for_site_uses_one_file_per_site(tmp_path, monkeypatch):
+    monkeypatch.setenv('DEDUPE_INDEX_PATH', str(tmp_path / 'dedupe.bloom'))
+    trendyol, amazon = DedupeIndex.for_site('trendyol'), DedupeIndex.for_site('amazon')
+    assert trendyol.path == str(tmp_path / 'dedupe.trendyol.bloom')
+    assert amazon.path == str(tmp_path / 'dedupe.amazon.bloom')
+
+    trendyol.add('TR-1')
+    trendyol.save()
+    amazon.save()
+    assert DedupeIndex.for_site('amazon').add('TR-1')
+    assert not DedupeIndex.for_site('trendyol').add('TR-1')
+
+    monkeypatch.delenv('DEDUPE_INDEX_PATH')
+    assert DedupeIndex.for_site('trendyol').path == ''
+
+
+def test_resumed_crawl_touches_carried_products(tmp_path, monkeypatch, fixture_store):
+    monkeypatch.setenv('DEDUPE_INDEX_PATH', str(tmp_path / 'dedupe.bloom'))
+    with serve(listing_app(fixture_store)) as base_url:
+        spec = local_site(base_url)
+        first_db = FakeDatabase()
+        CrawlPipeline(first_db, [spec]).run()
+        second_db = FakeDatabase()
+        results = CrawlPipeline(second_db, [spec]).run()
+
+    saved = {product['asin'] for product in first_db.saved}
+    assert saved
+    # İkinci tarama hiçbir ürünü yeniden yazmaz ama hepsini görüldü olarak işaretler
+    assert second_db.saved == []
+    # Filtrelenen kartlar da taşınır; touch_products var olmayan ID'leri yok sayar
+    assert saved <= set(second_db.touched)
+    assert results['total_unchanged'] == len(second_db.touched)
@@ -0,0 +1,62 @@
+import pytest
+from scrapers.embedded_state import decode_after, find_state
+from scrapers.hepsiburada_scraper import HepsiburadaScraper
+from scrapers.trendyol_scraper import TrendyolScraper
+
+SITES = [(TrendyolScraper, 'trendyol'), (HepsiburadaScraper, 'hepsiburada')]
+# İki yolun da çıkardığı alanlar (state ayrıca marka, puan vb. verir)
+SHARED_FIELDS = ('asin', 'title', 'current_price', 'list_price', 'discount_percent', 'product_url', 'image_url',
+                 'fingerprint', 'site_name')
+
+
+def fixture_body(fixture_store, site):
+    return fixture_store.get(sorted(fixture_store.urls(site))[0])['body']
+
+
+def shared(products):
+    return [{field: product.get(field) for field in SHARED_FIELDS} for product in products]
+
+
+def dom_products(scraper_cls, body):
+    scraper = scraper_cls()
+    scraper.extraction_mode = 'dom'
+    return scraper._parse_body(body, 1)
+
+
+def test_decode_after_reads_only_the_json_value():
+    text = 'x <script>window.__S__ = {"a": [1, 2]};var y = {"b": 1};</script>'
+    assert decode_after(text, 'window.__S__') == {'a': [1, 2]}
+    assert decode_after(text, 'window.__YOK__') is None
+    assert decode_after('window.__S__ = {"a": ', 'window.__S__') is None
+    assert find_state(b'<p>bozuk = {</p><i>iyi = [1]</i>', ['bozuk', 'iyi']) == [1]
+
+
+@pytest.mark.parametrize('scraper_cls, site', SITES)
+def test_state_path_is_used_and_matches_dom(scraper_cls, site, fixture_store):
+    body = fixture_body(fixture_store, site)
+    scraper = scraper_cls()
+
+    def no_dom(soup, page=1):
+        raise AssertionError('state varken DOM parse edilmemeli')
+
+    scraper.parse_page = no_dom
+    state = scraper._parse_body(body, 1)
+
+    assert state
+    assert all(product.get('site_product_id') for product in state)
+    assert shared(state) == shared(dom_products(scraper_cls, body))
+
+
+@pytest.mark.parametrize('scraper_cls, site', SITES)
+@pytest.mark.parametrize('breakage', ['missing', 'malformed'])
+def test_falls_back_to_dom_without_usable_state(scraper_cls, site, breakage, fixture_store):
+    body = fixture_body(fixture_store, site)
+    marker = next(marker for marker in scraper_cls.state_markers if marker.encode() in body).encode()
+    broken = body.replace(marker, b'<!-- -->' if breakage == 'missing' else marker + b'{"kesik": ')
+
+    scraper = scraper_cls()
+    assert scraper.parse_state(broken, 1) is None
+    products = scraper._parse_body(broken, 1)
+
+    assert products and not any(product.get('site_product_id') for product in products)
+    assert shared(products) == shared(dom_products(scraper_cls, body))
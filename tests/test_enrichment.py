@@ -0,0 +1,110 @@
+import json
+import asyncio
+import threading
+from aiohttp import web
+import scrapers.enrichment as enrichment
+import scrapers.pipeline as pipeline
+from scrapers.base_scraper import DEFAULT_CATEGORY
+from scrapers.enrichment import DetailEnricher, get_detail_enricher
+from scrapers.recrawl import RecrawlScheduler
+from tests.conftest import FakeDatabase, serve
+
+
+class EnrichmentDatabase(FakeDatabase):
+    def __init__(self):
+        super().__init__()
+        self.enrichments = []
+        self.writer_threads = set()
+
+    def save_enrichments_batch(self, rows):
+        self.writer_threads.add(threading.current_thread().name)
+        self.enrichments.extend(rows)
+        return len(rows)
+
+
+def detail_app(requests):
+    async def detail(request):
+        requests.append(request.match_info['asin'])
+        product = {'@context': 'https://schema.org', '@type': 'Product',
+                   'category': 'Elektronik > Bilgisayar > Mouse',
+                   'offers': {'@type': 'Offer', 'price': 150.0, 'availability': 'https://schema.org/InStock',
+                              'seller': {'@type': 'Organization', 'name': 'Örnek Mağaza'}}}
+        body = (f'<html><head><script type="application/ld+json">{json.dumps(product)}</script></head>'
+                f'<body>{"<p>detay</p>" * 200}</body></html>')
+        return web.Response(text=body, content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/p/{asin}', detail)
+    return app
+
+
+def product(base_url, asin, discount=50):
+    return {'asin': asin, 'site': 'trendyol', 'product_url': f'{base_url}/p/{asin}', 'category': DEFAULT_CATEGORY,
+            'discount_percent': discount}
+
+
+def test_enrichment_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('ENRICH_CONCURRENCY', raising=False)
+    assert get_detail_enricher(FakeDatabase()) is None
+
+
+def test_shared_enricher_is_kept_per_database(monkeypatch):
+    monkeypatch.setenv('ENRICH_CONCURRENCY', '1')
+    monkeypatch.setattr(enrichment, '_shared_enrichers', {})
+    first_db, second_db = FakeDatabase(), FakeDatabase()
+    first = get_detail_enricher(first_db)
+    try:
+        assert get_detail_enricher(first_db) is first
+        second = get_detail_enricher(second_db)
+        assert second is not first and second.db is second_db
+        second.close()
+    finally:
+        first.close()
+
+
+def test_enricher_opens_its_own_connection(db, monkeypatch):
+    monkeypatch.setenv('ENRICH_CONCURRENCY', '1')
+    monkeypatch.setattr(enrichment, '_shared_enrichers', {})
+    enricher = get_detail_enricher(db)
+    try:
+        assert enricher.db is not db
+        assert enricher.db.database_url == db.database_url
+        assert enricher.db.conn is not db.conn
+    finally:
+        enricher.close()
+        enricher.db.close()
+
+
+def test_enricher_waits_for_crawl_and_writes_from_its_thread():
+    requests = []
+    db = EnrichmentDatabase()
+    with serve(detail_app(requests)) as base_url:
+        enricher = DetailEnricher(db, concurrency=1, min_discount=70, flush_interval=0.05)
+        try:
+            enricher.crawl_started()
+            known = type('Known', (), {'fingerprints': {'TR2': 'x', 'TR3': 'y'}})()
+            # TR1 yeni, TR2 bilinen ama indirimi yüksek, TR3 bilinen ve sıradan
+            queued = enricher.offer([product(base_url, 'TR1'), product(base_url, 'TR2', discount=80),
+                                     product(base_url, 'TR3')], known)
+            assert queued == 2
+            threading.Event().wait(0.1)
+            assert requests == []
+
+            enricher.crawl_finished()
+            enricher.flush()
+        finally:
+            enricher.close()
+
+    assert sorted(requests) == ['TR1', 'TR2']
+    assert sorted(row['asin'] for row in db.enrichments) == ['TR1', 'TR2']
+    row = db.enrichments[0]
+    assert row['category'] == 'Mouse' and row['category_path'] == 'Elektronik > Bilgisayar > Mouse'
+    assert row['seller'] == 'Örnek Mağaza' and row['in_stock'] is True
+    assert db.writer_threads == {'enrich-writer'}
+
+
+def test_recrawl_skips_while_listing_crawl_runs(monkeypatch):
+    monkeypatch.setattr(pipeline, '_active_crawls', 1)
+    recrawler = RecrawlScheduler(FakeDatabase(), budget_per_hour=60)
+    assert asyncio.run(recrawler.run_async()) == {}
+    assert recrawler._loaded_at is None
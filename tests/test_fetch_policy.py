@@ -0,0 +1,243 @@
+import asyncio
+import time
+from email.utils import formatdate
+import pytest
+from aiohttp import web
+from scrapers.block_detector import CAPTCHA, OK, SOFT_BLOCK
+from scrapers.fetch_policy import CircuitBreaker, FetchPolicy, parse_retry_after
+from scrapers.fetcher import CIRCUIT_OPEN, AsyncFetcher
+from scrapers.session_pool import SessionPool
+from scrapers.trendyol_scraper import TrendyolScraper
+from tests.conftest import serve
+
+URL = 'https://www.trendyol.com/sr?pi=1'
+PAGE = b'<html>' + b'x' * 2048 + b'</html>'
+
+
+def flaky_app(statuses, headers=None):
+    """Sırayla verilen durum kodlarını, tükenince 200 dönen uygulama"""
+    statuses = list(statuses)
+    hits = []
+
+    async def handler(request):
+        hits.append(request.path)
+        status = statuses.pop(0) if statuses else 200
+        return web.Response(status=status, body=PAGE, content_type='text/html', headers=headers if status != 200 else None)
+
+    app = web.Application()
+    app.router.add_get('/sr', handler)
+    return app, hits
+
+
+def blocking_app(blocks):
+    """İlk `blocks` isteğe captcha sayfası, sonrakilere normal sayfa dönen uygulama"""
+    hits = []
+
+    async def handler(request):
+        hits.append(request.headers.get('User-Agent'))
+        if len(hits) <= blocks:
+            return web.Response(text='<html>Lütfen captcha doğrulamasını tamamlayın</html>', content_type='text/html')
+        return web.Response(body=PAGE, content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/sr', handler)
+    return app, hits
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('7') == 7
+    assert 0 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0
+    assert parse_retry_after('yarın') is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_is_jittered_and_bounded():
+    policy = FetchPolicy(max_attempts=5, base_delay=1, max_delay=3)
+    for attempt, bound in ((1, 1), (2, 2), (3, 3), (4, 3)):
+        delay = policy.retry_delay(URL, attempt, status=503)
+        assert 0 <= delay <= bound
+    assert policy.retry_delay(URL, 5, status=503) is None
+    stats = policy.stats('www.trendyol.com')
+    assert stats['retries'] == 4 and stats['throttled'] == 5 and stats['failures'] == 1
+
+
+def test_retry_after_is_capped_by_breaker_cooldown():
+    policy = FetchPolicy(max_attempts=3, reset_timeout=10)
+    assert policy.retry_delay(URL, 1, status=429, headers={'Retry-After': '4'}) == 4
+    assert policy.retry_delay(URL, 1, status=429, headers={'retry-after': '3600'}) == 10
+
+
+def test_non_retryable_results_are_not_retried():
+    policy = FetchPolicy(max_attempts=3)
+    assert policy.retry_delay(URL, 1, status=200) is None
+    assert policy.retry_delay(URL, 1, status=404) is None
+    assert policy.retry_delay(URL, 1, error='Connection reset') is not None
+    assert policy.stats('www.trendyol.com')['retries'] == 1
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes():
+    policy = FetchPolicy(max_attempts=1, failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        assert policy.allow(URL)
+        assert policy.retry_delay(URL, 1, status=500) is None
+    assert policy.stats('www.trendyol.com')['breaker'] == 'open'
+    assert not policy.allow(URL)
+
+    time.sleep(0.06)
+    # Half-open: tek deneme geçer, başarılı olursa devre kapanır
+    assert policy.allow(URL)
+    assert not policy.allow(URL)
+    assert policy.retry_delay(URL, 1, status=200) is None
+    stats = policy.stats('www.trendyol.com')
+    assert stats['breaker'] == 'closed' and stats['breaker_opened'] == 1 and stats['short_circuited'] == 2
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+    breaker.trip(0.01)
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert breaker.record_failure()
+    assert breaker.state == 'open' and breaker.cooldown == 0.05
+
+
+def test_success_resets_failure_count():
+    policy = FetchPolicy(max_attempts=1, failure_threshold=2)
+    policy.retry_delay(URL, 1, status=500)
+    policy.retry_delay(URL, 1, status=200)
+    policy.retry_delay(URL, 1, status=500)
+    assert policy.stats('www.trendyol.com')['breaker'] == 'closed'
+
+
+def test_block_trips_breaker_without_pool():
+    policy = FetchPolicy(block_cooldown=60)
+    assert policy.record_verdict(URL, CAPTCHA)
+    stats = policy.stats('www.trendyol.com')
+    assert stats['breaker'] == 'open' and stats['breaker_opened'] == 1 and stats['rotated'] == 0
+
+
+def test_blocks_rotate_sessions_until_threshold():
+    policy = FetchPolicy(block_sessions=3)
+    assert not policy.record_verdict(URL, CAPTCHA, 'host#1')
+    # Aynı oturumun ikinci engeli ayrı sayılmaz
+    assert not policy.record_verdict(URL, SOFT_BLOCK, 'host#1')
+    assert not policy.record_verdict(URL, CAPTCHA, 'host#2')
+    assert policy.stats('www.trendyol.com')['breaker'] == 'closed'
+    assert policy.record_verdict(URL, CAPTCHA, 'host#3')
+    stats = policy.stats('www.trendyol.com')
+    assert stats['breaker'] == 'open' and stats['rotated'] == 3 and stats['captcha'] == 3
+
+
+def test_successful_answer_resets_blocked_sessions():
+    policy = FetchPolicy(block_sessions=2)
+    assert not policy.record_verdict(URL, CAPTCHA, 'host#1')
+    assert not policy.record_verdict(URL, OK, 'host#2')
+    assert not policy.record_verdict(URL, CAPTCHA, 'host#3')
+    assert policy.stats('www.trendyol.com')['breaker'] == 'closed'
+
+
+def test_blocked_half_open_probe_trips_with_pool():
+    policy = FetchPolicy(block_sessions=3, block_cooldown=0.01)
+    policy.record_verdict(URL, CAPTCHA)
+    time.sleep(0.02)
+    assert policy.allow(URL)
+    assert policy.record_verdict(URL, CAPTCHA, 'host#1')
+    assert policy.stats('www.trendyol.com')['breaker_opened'] == 2
+
+
+async def fetch(url, policy, pool=None):
+    async with AsyncFetcher(rate_limiter=None, cache=None, policy=policy, session_pool=pool) as fetcher:
+        return await fetcher.fetch(url)
+
+
+def test_async_fetch_retries_throttled_responses():
+    app, hits = flaky_app([503, 429], headers={'Retry-After': '0'})
+    policy = FetchPolicy(max_attempts=3, base_delay=0)
+    with serve(app) as base_url:
+        result = asyncio.run(fetch(f"{base_url}/sr", policy))
+        host = base_url.split('//')[1]
+
+    assert result.ok
+    assert len(hits) == 3
+    assert policy.stats(host)['retries'] == 2 and policy.stats(host)['throttled'] == 2
+
+
+def test_async_fetch_gives_up_and_short_circuits():
+    app, hits = flaky_app([500] * 10)
+    policy = FetchPolicy(max_attempts=2, base_delay=0, failure_threshold=1, reset_timeout=60)
+    with serve(app) as base_url:
+        first = asyncio.run(fetch(f"{base_url}/sr", policy))
+        second = asyncio.run(fetch(f"{base_url}/sr", policy))
+
+    assert first.status == 500 and not first.ok
+    assert second.error == CIRCUIT_OPEN
+    assert len(hits) == 2
+
+
+@pytest.mark.parametrize('statuses, expected_hits', [([503], 2), ([404], 1)])
+def test_sync_fetch_page_uses_policy(statuses, expected_hits):
+    app, hits = flaky_app(statuses)
+    scraper = TrendyolScraper()
+    scraper.rate_limiter = scraper.session_pool = scraper.http_cache = None
+    scraper.fetch_policy = FetchPolicy(max_attempts=3, base_delay=0)
+    with serve(app) as base_url:
+        result = scraper.fetch_page(f"{base_url}/sr", 'trendyol', timeout=5)
+
+    assert len(hits) == expected_hits
+    assert result.ok == (expected_hits == 2)
+
+
+def test_async_fetch_retries_block_with_new_session():
+    app, hits = blocking_app(1)
+    policy = FetchPolicy(max_attempts=1, block_sessions=3)
+    pool = SessionPool(size=2, proxies=[])
+    with serve(app) as base_url:
+        result = asyncio.run(fetch(f"{base_url}/sr", policy, pool))
+        host = base_url.split('//')[1]
+
+    assert result.ok and len(hits) == 2 and hits[0] != hits[1]
+    stats = policy.stats(host)
+    assert stats['breaker'] == 'closed' and stats['breaker_opened'] == 0 and stats['rotated'] == 1
+    assert [session['retired'] for session in pool.stats(host)[host]['retired']] == ['captcha']
+
+
+def test_async_fetch_trips_breaker_after_distinct_sessions():
+    app, hits = blocking_app(10)
+    policy = FetchPolicy(block_sessions=3, block_cooldown=60)
+    pool = SessionPool(size=2, proxies=[])
+    with serve(app) as base_url:
+        first = asyncio.run(fetch(f"{base_url}/sr", policy, pool))
+        second = asyncio.run(fetch(f"{base_url}/sr", policy, pool))
+        host = base_url.split('//')[1]
+
+    assert first.verdict == CAPTCHA and second.error == CIRCUIT_OPEN
+    assert len(hits) == 3
+    stats = policy.stats(host)
+    assert stats['breaker'] == 'open' and stats['breaker_opened'] == 1 and stats['rotated'] == 2
+    assert len(pool.stats(host)[host]['retired']) == 3
+
+
+def test_async_fetch_without_pool_trips_on_first_block():
+    app, hits = blocking_app(1)
+    policy = FetchPolicy(block_sessions=3, block_cooldown=60)
+    with serve(app) as base_url:
+        result = asyncio.run(fetch(f"{base_url}/sr", policy))
+        host = base_url.split('//')[1]
+
+    assert result.verdict == CAPTCHA and len(hits) == 1
+    assert policy.stats(host)['breaker'] == 'open'
+
+
+def test_sync_fetch_page_retries_block_with_new_session():
+    app, hits = blocking_app(1)
+    scraper = TrendyolScraper()
+    scraper.rate_limiter = scraper.http_cache = None
+    scraper.session_pool = SessionPool(size=2, proxies=[])
+    scraper.fetch_policy = FetchPolicy(max_attempts=1, block_sessions=3)
+    with serve(app) as base_url:
+        result = scraper.fetch_page(f"{base_url}/sr", 'trendyol', timeout=5)
+        host = base_url.split('//')[1]
+
+    assert result.ok and len(hits) == 2
+    assert scraper.fetch_policy.stats(host)['breaker'] == 'closed'
@@ -0,0 +1,62 @@
+import pytest
+from scrapers.amazon_scraper import AmazonScraper
+from scrapers.fetcher import FetchResult
+from scrapers.fingerprint import FingerprintCache, product_fingerprint
+from scrapers.hepsiburada_scraper import HepsiburadaScraper
+from scrapers.pipeline import CrawlPipeline
+from scrapers.trendyol_scraper import TrendyolScraper
+from tests.conftest import FakeDatabase, listing_app, local_site, serve
+
+SITES = [(TrendyolScraper, 'trendyol'), (HepsiburadaScraper, 'hepsiburada'), (AmazonScraper, 'amazon')]
+
+
+def parse_fixture(scraper, fixture_store, site: str):
+    url = sorted(fixture_store.urls(site))[0]
+    result = FetchResult(url, 200, fixture_store.get(url)['body'])
+    return scraper.parse_result(result, 1)
+
+
+def test_fingerprint_normalizes_title_and_prices():
+    assert product_fingerprint('  Kablosuz   Mouse ', 199.9, 400) == product_fingerprint('kablosuz mouse', 199.90, 400.0)
+    assert product_fingerprint('Kablosuz Mouse', 199.9, 400) != product_fingerprint('Kablosuz Mouse', 189.9, 400)
+
+
+@pytest.mark.parametrize('scraper_cls, site', SITES)
+def test_unchanged_cards_are_skipped(scraper_cls, site, fixture_store):
+    products = parse_fixture(scraper_cls(), fixture_store, site)
+    assert products
+
+    changed = products[0]
+    stored = {product['asin']: product['fingerprint'] for product in products}
+    stored[changed['asin']] = 'eski-fingerprint'
+
+    scraper = scraper_cls()
+    scraper.fingerprints = FingerprintCache(stored)
+    rescanned = parse_fixture(scraper, fixture_store, site)
+
+    # Sadece fingerprint'i değişen ürün tekrar işlenir, diğerleri last_seen için toplanır
+    assert [product['asin'] for product in rescanned] == [changed['asin']]
+    assert sorted(scraper.fingerprints.drain_unchanged()) == sorted(set(stored) - {changed['asin']})
+
+
+@pytest.mark.parametrize('scraper_cls, site', SITES[:2])
+def test_state_and_dom_paths_agree(scraper_cls, site, fixture_store, monkeypatch):
+    state = parse_fixture(scraper_cls(), fixture_store, site)
+    monkeypatch.setenv('SCRAPER_EXTRACTION', 'dom')
+    dom = parse_fixture(scraper_cls(), fixture_store, site)
+    assert {p['asin']: p['fingerprint'] for p in state} == {p['asin']: p['fingerprint'] for p in dom}
+
+
+def test_pipeline_touches_unchanged_products(fixture_store):
+    with serve(listing_app(fixture_store)) as base_url:
+        spec = local_site(base_url)
+        first_db = FakeDatabase()
+        CrawlPipeline(first_db, [spec]).run()
+        fingerprints = {product['asin']: product['fingerprint'] for product in first_db.saved}
+        second_db = FakeDatabase(fingerprints)
+        results = CrawlPipeline(second_db, [spec]).run()
+
+    assert fingerprints
+    assert second_db.saved == []
+    assert sorted(second_db.touched) == sorted(fingerprints)
+    assert results['total_unchanged'] == len(fingerprints)
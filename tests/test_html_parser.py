@@ -0,0 +1,68 @@
+import os
+import pytest
+from scrapers.html_parser import available_backends, parse_html, resolve_backend
+from tests.conftest import FIXTURE_DIR
+
+# Fixture başına (kart selector'ı, kart içi selector → okunan attribute)
+PAGES = {
+    'trendyol/page_1.html': ('div.p-card-wrppr', {'a': 'href', '.prdct-desc-cntnr-name': None,
+                                                  '.prc-box-dscntd': None, 'img': 'src'}),
+    'hepsiburada/page_1.html': ('li.productListContent-item', {'a': 'href', '[data-test-id="product-card-name"]': None,
+                                                               '[data-test-id="price-current-price"]': None}),
+    'amazon/bilgisayar_page_1.html': ('div[data-component-type="s-search-result"]',
+                                      {'h2 a': 'href', 'h2 a span, h2 span': None, '.a-price .a-offscreen': None,
+                                       'img.s-image': 'src'}),
+}
+FAST_BACKENDS = [backend for backend in available_backends() if backend != 'html.parser']
+
+
+def read(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def snapshot(document, card_selector, fields):
+    """Belgeden düğüm API'siyle okunan değerler (karşılaştırma için)"""
+    cards = document.select(card_selector)
+    rows = []
+    for card in cards:
+        row = {'asin': card.get('data-asin'), 'missing': card.get('data-yok', 'varsayılan')}
+        for selector, attr in fields.items():
+            found = card.select_one(selector)
+            if found is None:
+                row[selector] = None
+            elif attr:
+                row[selector] = found.get(attr)
+            else:
+                row[selector] = found.get_text(strip=True)
+        row['all_links'] = [link.get('href') for link in card.select('a')]
+        rows.append(row)
+    return rows
+
+
+def test_auto_picks_fastest_installed_backend():
+    assert resolve_backend('auto') == available_backends()[0]
+    with pytest.raises(ValueError):
+        resolve_backend('regex')
+
+
+@pytest.mark.skipif(not FAST_BACKENDS, reason='selectolax/lxml kurulu değil')
+@pytest.mark.parametrize('backend', FAST_BACKENDS)
+@pytest.mark.parametrize('fixture', sorted(PAGES))
+def test_backend_matches_html_parser(backend, fixture):
+    body = read(fixture)
+    card_selector, fields = PAGES[fixture]
+    expected = snapshot(parse_html(body, 'html.parser'), card_selector, fields)
+
+    assert expected
+    assert snapshot(parse_html(body, backend), card_selector, fields) == expected
+
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_node_api_on_small_document(backend):
+    document = parse_html('<div id="a" class="x"><p> Merhaba <b>dünya</b> </p><p>iki</p></div>'.encode(), backend)
+    div = document.select_one('div.x')
+    assert div.get('id') == 'a' and div.get('title') is None and div.get('title', '-') == '-'
+    assert [p.get_text(strip=True) for p in document.select('p')] == ['Merhabadünya', 'iki']
+    assert document.select_one('p').get_text(' ', strip=True) == 'Merhaba dünya'
+    assert document.select_one('span') is None and document.select('span') == []
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from aiohttp import web
+from scrapers.fetcher import AsyncFetcher
+from scrapers.http_cache import HttpCache
+from scrapers.pipeline import CrawlPipeline
+from tests.conftest import FakeDatabase, local_site, serve
+
+
+def validating_app(fixture_store, etag: bool = True):
+    """Trendyol fixture'larını ETag ile sunan, If-None-Match tutarsa 304 dönen uygulama"""
+    seen = []
+
+    async def listing(request):
+        entry = fixture_store.get(f"https://www.trendyol.com/sr?pi={request.query['pi']}&sst=DISCOUNTED")
+        tag = f'"sayfa-{request.query["pi"]}"'
+        seen.append(request.headers.get('If-None-Match'))
+        if etag and request.headers.get('If-None-Match') == tag:
+            return web.Response(status=304, headers={'ETag': tag})
+        return web.Response(body=entry['body'], content_type='text/html', headers={'ETag': tag} if etag else {})
+
+    app = web.Application()
+    app.router.add_get('/sr', listing)
+    return app, seen
+
+
+async def fetch_twice(cache: HttpCache, url: str):
+    async with AsyncFetcher(rate_limiter=None, cache=cache, policy=None, session_pool=None) as fetcher:
+        return await fetcher.fetch(url), await fetcher.fetch(url)
+
+
+@pytest.mark.parametrize('etag', [True, False])
+def test_second_fetch_is_unchanged(tmp_path, fixture_store, etag):
+    cache = HttpCache(str(tmp_path / 'cache.sqlite'))
+    app, seen = validating_app(fixture_store, etag)
+    with serve(app) as base_url:
+        first, second = asyncio.run(fetch_twice(cache, f"{base_url}/sr?pi=1&sst=DISCOUNTED"))
+
+    assert first.ok and not first.unchanged
+    # 304 ile gelen sayfa cache'teki gövdeyle döner; ETag yoksa gövde özeti karşılaştırılır
+    assert second.ok and second.unchanged and second.body == first.body
+    assert seen == [None, '"sayfa-1"' if etag else None]
+
+
+def test_blocked_pages_are_not_cached(tmp_path):
+    async def captcha(request):
+        return web.Response(body=b'<html>Robot olmadiginizi dogrulayin: captcha</html>', content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/sr', captcha)
+    cache = HttpCache(str(tmp_path / 'cache.sqlite'))
+    with serve(app) as base_url:
+        first, second = asyncio.run(fetch_twice(cache, f"{base_url}/sr"))
+
+    assert first.verdict == second.verdict == 'captcha'
+    assert not second.unchanged
+    assert cache.conditional_headers(f"{base_url}/sr") == {}
+
+
+def run_crawl(db, spec):
+    return asyncio.run(asyncio.wait_for(CrawlPipeline(db, [spec]).run_async(), 15))
+
+
+def test_unchanged_listing_skips_parse(tmp_path, monkeypatch, fixture_store):
+    monkeypatch.setenv('HTTP_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    app, _ = validating_app(fixture_store)
+    with serve(app) as base_url:
+        spec = local_site(base_url)
+        first = FakeDatabase()
+        run_crawl(first, spec)
+        second = FakeDatabase({product['asin']: product['fingerprint'] for product in first.saved})
+        results = run_crawl(second, spec)
+
+    assert first.saved
+    assert second.saved == [] and results['total_products'] == 0
+    assert {product['asin'] for product in first.saved} <= set(second.touched)
+
+
+def test_failed_write_does_not_mark_page_unchanged(tmp_path, monkeypatch, fixture_store):
+    monkeypatch.setenv('HTTP_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    app, _ = validating_app(fixture_store)
+    with serve(app) as base_url:
+        spec = local_site(base_url)
+        run_crawl(FakeDatabase(fail=True), spec)
+        # Sayfalar 304 ile gelir ama ürünleri yazılamadığı için yeniden parse edilir
+        retry = FakeDatabase()
+        results = run_crawl(retry, spec)
+
+    assert retry.saved
+    assert results['total_saved'] == len(retry.saved)
+
+
+def test_detail_fetchers_do_not_use_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('HTTP_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    from scrapers.enrichment import DetailEnricher
+    from scrapers.registry import get_site
+
+    enricher = DetailEnricher(FakeDatabase(), concurrency=1)
+    try:
+        assert enricher._scraper(get_site('trendyol')).http_cache is None
+    finally:
+        enricher.close()
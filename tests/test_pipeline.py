@@ -0,0 +1,51 @@
+import asyncio
+from scrapers.pipeline import CrawlPipeline
+from tests.conftest import FakeDatabase, listing_app, local_site, serve
+
+
+class BrokenDatabase(FakeDatabase):
+    """Her batch yazımında hata veren veritabanı"""
+
+    def save_products_batch(self, batch):
+        raise RuntimeError('bağlantı koptu')
+
+
+def run(pipeline: CrawlPipeline, timeout: float = 15):
+    return asyncio.run(asyncio.wait_for(pipeline.run_async(), timeout))
+
+
+def test_pipeline_writes_all_products(fixture_store):
+    db = FakeDatabase()
+    with serve(listing_app(fixture_store)) as base_url:
+        results = run(CrawlPipeline(db, [local_site(base_url)], batch_size=5))
+
+    assert results['trendyol']['success']
+    assert results['total_saved'] == results['total_products'] == len(db.saved) > 5
+    assert results['errors'] == []
+
+
+def test_writer_failure_does_not_block_parsers(fixture_store):
+    # Küçük batch ve kuyruk: yazıcı dursaydı parse aşaması products.put'ta takılırdı
+    db = BrokenDatabase()
+    with serve(listing_app(fixture_store)) as base_url:
+        results = run(CrawlPipeline(db, [local_site(base_url)], batch_size=2, queue_size=1))
+
+    assert results['total_saved'] == 0
+    assert results['total_products'] > 4
+    assert any('bağlantı koptu' in error for error in results['errors'])
+
+
+def test_failed_batch_skips_touch(fixture_store):
+    with serve(listing_app(fixture_store)) as base_url:
+        spec = local_site(base_url)
+        first = FakeDatabase()
+        run(CrawlPipeline(first, [spec]))
+        # İlk ürün değişmiş olsun: batch'te yazılacak bir ürün, geri kalanlar değişmemiş
+        fingerprints = {product['asin']: product['fingerprint'] for product in first.saved}
+        fingerprints[first.saved[0]['asin']] = 'eski-fingerprint'
+        failing = FakeDatabase(fingerprints, fail=True)
+        results = run(CrawlPipeline(failing, [spec]))
+
+    assert failing.touched == []
+    assert results['total_unchanged'] == 0
+    assert results['errors']
@@ -0,0 +1,84 @@
+import os
+import json
+import random
+import shutil
+import subprocess
+from decimal import Decimal
+import pytest
+from benchmarks.make_fixtures import tr_price
+from benchmarks.price_benchmark import FORMATS, check, corpus
+from scrapers.price_parser import MAX_PRICE, MIN_PRICE, parse_price, parse_prices
+
+hypothesis = pytest.importorskip('hypothesis')
+from hypothesis import given, strategies as st  # noqa: E402
+
+JS_PARSER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scrapers', 'price_parser.js')
+
+CASES = [
+    ('1.299,99 TL', 1299.99),
+    ('₺1.299', 1299.0),
+    ('1299,99', 1299.99),
+    ('1,299.99 TL', 1299.99),
+    ('1 299,99 TL', 1299.99),
+    ('1 299,99 ₺', 1299.99),
+    ('12,5 TL', 12.5),
+    ('1.299 - 1.499 TL', 1299.0),
+    ('%40 indirim 899,90 TL', 899.9),
+    ('3 taksit x 433,33 TL', 433.33),
+    ('0,50 TL', None),
+    ('750.000 TL', None),
+    ('Fiyat yok', None),
+    ('', None),
+    (None, None),
+]
+
+# Aralık biçiminin üst değeri (1.5 katı) de sınır içinde kalır
+prices = st.decimals(min_value=Decimal(f"{MIN_PRICE:.2f}"), max_value=Decimal(f"{MAX_PRICE / 1.5:.2f}"),
+                     places=2).map(float)
+price_chars = st.text(alphabet='0123456789.,  -%₺TL x', max_size=24)
+
+
+@pytest.mark.parametrize('text, expected', CASES)
+def test_known_formats(text, expected):
+    assert parse_price(text) == expected
+
+
+def test_seeded_corpus_parses_back():
+    formats = check(corpus(500, seed=2024))
+    assert {name: row['examples'] for name, row in formats.items() if row['mismatches']} == {}
+    assert set(formats) == {name for name, _, _ in FORMATS}
+
+
+@given(prices)
+def test_round_trip_every_format(value):
+    for name, render, expected in FORMATS:
+        assert parse_price(render(value)) == pytest.approx(expected(value), abs=0.005), name
+
+
+@given(prices)
+def test_turkish_format_round_trip(value):
+    assert parse_price(f"{tr_price(value)} TL") == round(value, 2)
+
+
+@given(st.one_of(st.none(), st.text(max_size=40), price_chars))
+def test_never_raises_and_stays_in_range(text):
+    value = parse_price(text)
+    assert value is None or MIN_PRICE <= value <= MAX_PRICE
+
+
+@given(st.lists(st.one_of(st.none(), price_chars), max_size=30))
+def test_parse_prices_matches_single_calls(texts):
+    assert parse_prices(texts) == [parse_price(text) for text in texts]
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node kurulu değil')
+def test_js_parser_matches_python():
+    rng = random.Random(7)
+    noise = [''.join(rng.choice('0123456789.,  -%₺TL') for _ in range(rng.randint(1, 16))) for _ in range(2000)]
+    texts = [text for text, _ in CASES if text] + [text for _, text, _ in corpus(300, seed=7)] + noise
+
+    output = subprocess.run(['node', JS_PARSER], input=json.dumps(texts), capture_output=True, text=True,
+                            check=True, timeout=60).stdout
+    mismatches = [(text, js, parse_price(text)) for text, js in zip(texts, json.loads(output))
+                  if js != parse_price(text)]
+    assert mismatches == []
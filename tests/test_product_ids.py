@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime
+from migrations import migrate_product_ids
+from scrapers.product_ids import canonical_url, product_id
+
+TRENDYOL_URL = 'https://www.trendyol.com/marka/kulaklik-p-123456789'
+
+
+def test_product_id_prefers_native_id_and_ignores_tracking_params():
+    assert product_id('Trendyol', TRENDYOL_URL) == 'TR123456789'
+    assert product_id('Trendyol', TRENDYOL_URL + '?boutiqueId=1&merchantId=2') == 'TR123456789'
+    assert product_id('Amazon', 'https://www.amazon.com.tr/Mouse/dp/B0ABCDEF12/ref=sr_1') == 'AMB0ABCDEF12'
+
+
+def test_product_id_falls_back_to_stable_digest():
+    url = 'https://www.hepsiburada.com/kampanya/urun'
+    first = product_id('Hepsiburada', url)
+    assert first.startswith('HE-') and len(first) <= 20
+    assert product_id('Hepsiburada', url + '/?utm_source=x#top') == first
+    assert canonical_url('HTTPS://WWW.Hepsiburada.com/a/') == 'https://hepsiburada.com/a'
+
+
+def insert(db, asin, title, price, url, first_seen, last_updated):
+    with db.conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO products (asin, title, current_price, list_price, discount_percent, product_url,
+                                  category, site, first_seen, last_updated)
+            VALUES (%s, %s, %s, %s, 50, %s, 'Elektronik', 'trendyol', %s, %s)
+        """, (asin, title, price, price * 2, url, first_seen, last_updated))
+        cursor.execute("INSERT INTO price_history (asin, price) VALUES (%s, %s)", (asin, price))
+
+
+def rows(db, sql, params=()):
+    with db.conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def test_merge_product_ids_collapses_hash_duplicates(db):
+    # Aynı ürün iki yeniden başlatmada farklı hash() ID'leriyle kaydedilmiş
+    insert(db, '-12345', 'Eski başlık', 100, TRENDYOL_URL + '?boutiqueId=1',
+           datetime(2024, 1, 1), datetime(2024, 1, 2))
+    insert(db, '98765', 'Yeni başlık', 80, TRENDYOL_URL, datetime(2024, 1, 5), datetime(2024, 1, 10))
+
+    result = migrate_product_ids(db)
+
+    assert result == {'mapped': 1, 'merged': 1, 'history_moved': 2}
+    products = rows(db, "SELECT asin, title, current_price, first_seen FROM products")
+    assert products == [('TR123456789', 'Yeni başlık', 80, datetime(2024, 1, 1))]
+    assert rows(db, "SELECT asin, COUNT(*) FROM price_history GROUP BY asin") == [('TR123456789', 2)]
+
+    # Tekrar çalıştırmak bir şey değiştirmez
+    assert migrate_product_ids(db) == {'mapped': 0, 'merged': 0, 'history_moved': 0}
+
+
+def test_merge_product_ids_keeps_newer_existing_row(db):
+    insert(db, 'TR123456789', 'Güncel', 70, TRENDYOL_URL, datetime(2024, 2, 1), datetime(2024, 3, 1))
+    insert(db, '-555', 'Eski', 90, TRENDYOL_URL, datetime(2024, 1, 1), datetime(2024, 1, 15))
+
+    result = db.merge_product_ids({'-555': 'TR123456789', 'TR123456789': 'TR123456789'})
+
+    assert result['merged'] == 1 and result['history_moved'] == 1
+    assert rows(db, "SELECT asin, title, first_seen FROM products") == [
+        ('TR123456789', 'Güncel', datetime(2024, 1, 1))
+    ]
+
+
+@pytest.mark.parametrize('existing', [False, True])
+def test_merge_prefers_updated_rows_over_null_last_updated(db, existing):
+    # Hiç güncellenmemiş (last_updated NULL) satır, güncel satırın yerine geçmez
+    insert(db, 'TR123456789' if existing else '-1', 'Boş tarih', 90, TRENDYOL_URL, datetime(2024, 1, 1), None)
+    insert(db, '-2', 'Güncel', 70, TRENDYOL_URL, datetime(2024, 2, 1), datetime(2024, 3, 1))
+
+    migrate_product_ids(db)
+
+    assert rows(db, "SELECT asin, title, current_price, first_seen, last_updated FROM products") == [
+        ('TR123456789', 'Güncel', 70, datetime(2024, 1, 1), datetime(2024, 3, 1))
+    ]
+
+
+def test_migrate_prefixes_bare_amazon_asins(db):
+    # Eski Amazon satırları öneksiz ASIN taşır; link ASIN içermese de ASIN korunur
+    insert(db, 'B08XYZ1234', 'Mouse', 100, 'https://www.amazon.com.tr/Mouse/dp/B08XYZ1234/ref=sr_1_1',
+           datetime(2024, 1, 1), datetime(2024, 1, 2))
+    insert(db, 'B0NOURL001', 'Klavye', 200, 'https://www.amazon.com.tr/sspa/click?qualifier=1',
+           datetime(2024, 1, 1), datetime(2024, 1, 2))
+    insert(db, 'AMB0DONE0001', 'Kulaklık', 300, 'https://www.amazon.com.tr/sspa/click?qualifier=2',
+           datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+    assert migrate_product_ids(db)['mapped'] == 2
+    assert rows(db, "SELECT asin FROM products ORDER BY asin") == [('AMB08XYZ1234',), ('AMB0DONE0001',),
+                                                                   ('AMB0NOURL001',)]
+    assert migrate_product_ids(db) == {'mapped': 0, 'merged': 0, 'history_moved': 0}
+
+
+def test_migrate_product_ids_dry_run_changes_nothing(db):
+    insert(db, '-1', 'A', 10, TRENDYOL_URL, datetime(2024, 1, 1), datetime(2024, 1, 1))
+    assert migrate_product_ids(db, dry_run=True) == {'mapped': 1, 'merged': 0, 'history_moved': 0}
+    assert rows(db, "SELECT asin FROM products") == [('-1',)]
@@ -0,0 +1,100 @@
+import shutil
+import threading
+import pytest
+from scrapers.puppeteer_worker import PuppeteerWorker
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='node kurulu değil')
+
+# Tarayıcısız sahte worker: puppeteer_worker.js ile aynı satır protokolü
+STUB_WORKER = r"""
+const readline = require('readline');
+const send = message => process.stdout.write(JSON.stringify(message) + '\n');
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+let queue = Promise.resolve();
+
+async function handle(job) {
+    if (job.type === 'ping') return send({ id: job.id, type: 'pong', pid: process.pid });
+    if (job.type === 'crash') process.exit(1);
+    if (job.type === 'hang') return new Promise(() => {});
+    const count = job.limit || 3;
+    for (let i = 0; i < count; i++) {
+        await sleep(5);
+        send({ id: job.id, type: 'product', product: { title: `Ürün ${i}`, url: `/p-${job.id}-${i}` } });
+    }
+    send({ id: job.id, type: 'done', count, stats: { pages: 1 } });
+}
+
+readline.createInterface({ input: process.stdin }).on('line', line => {
+    const job = JSON.parse(line);
+    queue = queue.then(() => handle(job));
+});
+send({ type: 'ready' });
+"""
+
+
+@pytest.fixture
+def worker(tmp_path):
+    script = tmp_path / 'stub_worker.js'
+    script.write_text(STUB_WORKER, encoding='utf-8')
+    worker = PuppeteerWorker(script_path=str(script), startup_timeout=10, max_restarts=2)
+    yield worker
+    worker.kill()
+
+
+def pong_pid(worker):
+    return next(reply['pid'] for reply in worker.request({'type': 'ping'}, timeout=5))
+
+
+def run_with_deadline(target, seconds=10):
+    """Kilitlenme testte sonsuza kadar beklemesin"""
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault('value', target()), daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), 'worker kilitlendi'
+    return result['value']
+
+
+def test_scrape_streams_products_and_stats(worker):
+    products = list(worker.scrape(limit=4, timeout=10))
+    assert [product['url'] for product in products] == [f'/p-1-{i}' for i in range(4)]
+    assert worker.last_stats == {'pages': 1}
+
+
+def test_unfinished_stream_does_not_block_next_request(worker):
+    # Okuması yarıda kalan (kapatılmamış) akış kilidi tutmaz
+    stream = worker.scrape(limit=50, timeout=10)
+    assert next(stream)['url'] == '/p-1-0'
+    assert run_with_deadline(lambda: worker.ping(timeout=5))
+
+    # Terk edilen işin kalan satırları atılır, sonraki işe karışmaz
+    stream.close()
+    assert run_with_deadline(lambda: len(list(worker.scrape(limit=2, timeout=10)))) == 2
+
+
+def test_worker_restarts_after_crash(worker):
+    first_pid = pong_pid(worker)
+    with pytest.raises(RuntimeError):
+        list(worker.request({'type': 'crash'}, timeout=5))
+
+    second_pid = run_with_deadline(lambda: pong_pid(worker))
+    assert second_pid != first_pid
+    # Başarılı iş ardışık yeniden başlatma sayacını sıfırlar
+    assert worker.restarts == 0
+
+
+def test_hung_job_times_out_and_worker_is_replaced(worker):
+    first_pid = pong_pid(worker)
+    with pytest.raises(TimeoutError):
+        list(worker.request({'type': 'hang'}, timeout=0.3))
+    assert not worker.alive
+    assert run_with_deadline(lambda: pong_pid(worker)) != first_pid
+
+
+def test_gives_up_after_max_restarts(worker, monkeypatch):
+    monkeypatch.setattr('scrapers.puppeteer_worker.time.sleep', lambda seconds: None)
+    for _ in range(worker.max_restarts + 1):
+        with pytest.raises(RuntimeError):
+            list(worker.request({'type': 'crash'}, timeout=5))
+    with pytest.raises(RuntimeError, match='vazgeçiliyor'):
+        list(worker.request({'type': 'ping'}, timeout=5))
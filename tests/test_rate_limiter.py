@@ -0,0 +1,82 @@
+import pytest
+import scrapers.rate_limiter as rate_limiter
+from scrapers.rate_limiter import HostRateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(rate_limiter.random, 'uniform', lambda low, high: 0.0)
+
+
+def test_burst_passes_then_requests_queue(no_jitter):
+    clock = FakeClock()
+    bucket = TokenBucket(1.0, 3.0, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Token bitince istekler ortalama aralıkla (2 sn) sıraya girer
+    assert [bucket.reserve() for _ in range(3)] == [2.0, 4.0, 6.0]
+
+
+def test_tokens_refill_every_interval_up_to_burst(no_jitter):
+    clock = FakeClock()
+    bucket = TokenBucket(1.0, 3.0, burst=2, clock=clock)
+    for _ in range(2):
+        bucket.reserve()
+
+    clock.advance(2.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 2.0
+
+    # Uzun boşlukta birikim burst ile sınırlı
+    clock.advance(3600)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 2.0]
+
+
+@pytest.mark.parametrize('pick', [min, max])
+def test_jitter_stays_within_min_and_max_delay(monkeypatch, pick):
+    monkeypatch.setattr(rate_limiter.random, 'uniform', lambda low, high: pick(low, high))
+    clock = FakeClock()
+    bucket = TokenBucket(1.0, 3.0, burst=1, clock=clock)
+    bucket.reserve()
+    for _ in range(20):
+        delay = bucket.reserve()
+        assert 1.0 <= delay <= 3.0
+        assert delay == pick(1.0, 3.0)
+        # İstek zamanında gitti; bir sonraki aralık yine [min, max] içinde
+        clock.advance(2.0)
+
+
+def test_zero_delay_never_waits():
+    bucket = TokenBucket(0, 0, burst=1, clock=FakeClock())
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+
+
+def test_hosts_are_limited_independently(no_jitter):
+    clock = FakeClock()
+    limiter = HostRateLimiter(min_delay=1.0, max_delay=3.0, burst=1, clock=clock)
+    limiter.configure('yavas.example', min_delay=10.0, max_delay=10.0)
+
+    assert limiter.reserve('https://a.example/1') == 0.0
+    assert limiter.reserve('https://a.example/2') == 2.0
+    # Başka host'un kuyruğu a.example'ı beklemez
+    assert limiter.reserve('https://b.example/1') == 0.0
+    assert limiter.reserve('https://yavas.example/1') == 0.0
+    assert limiter.reserve('https://yavas.example/2') == 10.0
+    assert limiter.reserve('https://a.example/3') == 4.0
+
+
+def test_reconfiguring_host_resets_its_bucket(no_jitter):
+    limiter = HostRateLimiter(min_delay=1.0, max_delay=3.0, burst=1, clock=FakeClock())
+    limiter.reserve('https://a.example/1')
+    limiter.configure('a.example', burst=5)
+    assert [limiter.reserve('https://a.example/x') for _ in range(5)] == [0.0] * 5
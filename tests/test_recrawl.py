@@ -0,0 +1,79 @@
+import json
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from aiohttp import web
+from scrapers.recrawl import RecrawlScheduler
+from tests.conftest import FakeDatabase, serve
+
+
+class RecrawlDatabase(FakeDatabase):
+    def __init__(self, candidates):
+        super().__init__()
+        self.candidates = candidates
+
+    def get_recrawl_candidates(self):
+        return [dict(row) for row in self.candidates]
+
+
+class StaticTracker:
+    """Fiyat geçmişi olmayan ürünler (değişim görülmemiş)"""
+
+    def analyze_price_patterns(self, asins, days):
+        return {}
+
+
+def detail_app(prices):
+    """/p/<asin> altında JSON-LD fiyatlı detay sayfası; fiyatı olmayan ürün 404"""
+    async def detail(request):
+        asin = request.match_info['asin']
+        if asin not in prices:
+            raise web.HTTPNotFound()
+        product = {'@context': 'https://schema.org', '@type': 'Product', 'name': asin,
+                   'offers': {'@type': 'Offer', 'price': prices[asin], 'priceCurrency': 'TRY'}}
+        body = (f'<html><head><script type="application/ld+json">{json.dumps(product)}</script></head>'
+                f'<body>{"<p>detay</p>" * 200}</body></html>')
+        return web.Response(text=body, content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/p/{asin}', detail)
+    return app
+
+
+def candidate(base_url, asin, price, list_price=200.0):
+    seen = datetime.now() - timedelta(days=2)
+    return {'asin': asin, 'site': 'trendyol', 'title': f'Ürün {asin}', 'current_price': price,
+            'list_price': list_price, 'discount_percent': 50, 'image_url': '', 'category': 'Elektronik',
+            'product_url': f'{base_url}/p/{asin}', 'first_seen': seen - timedelta(days=10), 'last_seen': seen}
+
+
+def test_recrawl_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('RECRAWL_BUDGET_PER_HOUR', raising=False)
+    assert RecrawlScheduler(FakeDatabase(), StaticTracker()).budget_per_hour == 0
+
+
+def test_recrawl_saves_changed_and_touches_unchanged():
+    with serve(detail_app({'TR1': 80.0, 'TR2': 100.0})) as base_url:
+        db = RecrawlDatabase([candidate(base_url, 'TR1', 100.0), candidate(base_url, 'TR2', 100.0),
+                              candidate(base_url, 'TR3', 100.0)])
+        recrawler = RecrawlScheduler(db, StaticTracker(), budget_per_hour=3600, run_every=60)
+        results = asyncio.run(recrawler.run_async())
+
+    assert results['trendyol'] == {'checked': 3, 'changed': 1, 'unchanged': 1, 'failed': 0, 'gone': 1}
+    assert [(product['asin'], product['current_price']) for product in db.saved] == [('TR1', 80.0)]
+    assert db.touched == ['TR2']
+    stats = recrawler.stats()['trendyol']
+    assert stats['queued'] == 2 and stats['due'] == 0 and stats['budget_left'] == 3597
+
+
+def test_stats_waits_for_schedule_updates():
+    recrawler = RecrawlScheduler(FakeDatabase(), StaticTracker(), budget_per_hour=60)
+    snapshots = []
+    with recrawler._lock:
+        reader = threading.Thread(target=lambda: snapshots.append(recrawler.stats()))
+        reader.start()
+        reader.join(0.1)
+        # Takvim güncellenirken durum okunmaz
+        assert reader.is_alive() and snapshots == []
+    reader.join(5)
+    assert snapshots == [{}]
@@ -0,0 +1,71 @@
+from datetime import datetime
+import pytest
+import scrapers.registry as registry
+from scrapers.amazon_scraper import AmazonScraper
+from scrapers.base_scraper import BaseScraper
+from scrapers.registry import get_site, register_site, registered_sites
+
+
+@pytest.fixture
+def sites(monkeypatch):
+    """Testte kaydedilen siteler global registry'ye karışmasın"""
+    registry.load_sites()
+    monkeypatch.setattr(registry, '_sites', dict(registry._sites))
+
+
+def test_builtin_sites_and_defaults():
+    # Sıra modüllerin import sırasına bağlı
+    assert {spec.key for spec in registered_sites()} == {'trendyol', 'hepsiburada'}
+    assert {spec.key for spec in registered_sites(include_optional=True)} == {'trendyol', 'hepsiburada', 'amazon'}
+    assert [spec.key for spec in registered_sites(['amazon', 'trendyol'])] == ['amazon', 'trendyol']
+
+    amazon = get_site('Amazon')
+    assert amazon.scraper_cls is AmazonScraper and AmazonScraper.site_key == 'amazon'
+    assert amazon.host == 'www.amazon.com.tr' and amazon.concurrency == 2 and not amazon.default
+
+
+def test_unknown_site_raises():
+    with pytest.raises(ValueError):
+        get_site('n11')
+    with pytest.raises(ValueError):
+        registered_sites(['trendyol', 'n11'])
+
+
+def test_register_site_adds_spec(sites):
+    @register_site('ornek', fetch='sync', max_pages=3, min_delay=5.0, default=False)
+    class OrnekScraper(BaseScraper):
+        site_name = 'Örnek'
+        base_url = 'https://www.ornek.com'
+
+        def page_url(self, page: int) -> str:
+            return f"{self.base_url}/firsatlar?sayfa={page}"
+
+    spec = get_site('ornek')
+    assert OrnekScraper.site_key == 'ornek'
+    assert (spec.fetch, spec.max_pages, spec.min_delay, spec.max_delay) == ('sync', 3, 5.0, None)
+    assert spec.host == 'www.ornek.com'
+    assert spec.listing_urls() == [f'https://www.ornek.com/firsatlar?sayfa={page}' for page in (1, 2, 3)]
+    # Opsiyonel site varsayılan taramaya girmez
+    assert 'ornek' not in [s.key for s in registered_sites()]
+    assert registered_sites(include_optional=True)[-1] is spec
+
+
+def test_site_statistics_group_by_site(db):
+    rows = [('TR1', 'trendyol', 80, 100), ('TR2', 'trendyol', 60, 200), ('TR3', 'trendyol', 10, 50),
+            ('AM1', 'amazon', 50, 400), ('X1', None, 45, 100)]
+    with db.conn.cursor() as cursor:
+        for asin, site, discount, list_price in rows:
+            current = list_price * (100 - discount) / 100
+            cursor.execute("""
+                INSERT INTO products (asin, title, current_price, list_price, discount_percent, product_url,
+                                      category, site, first_seen, last_updated)
+                VALUES (%s, %s, %s, %s, %s, %s, 'Elektronik', %s, %s, %s)
+            """, (asin, asin, current, list_price, discount, f'https://example.com/{asin}', site,
+                  datetime(2024, 1, 1), datetime(2024, 1, 1)))
+
+    stats = db.get_site_statistics(min_discount=40)
+
+    assert set(stats) == {'trendyol', 'amazon', 'other'}
+    assert stats['trendyol'] == {'deals': 2, 'best_discount': 80, 'average_discount': 70.0, 'total_savings': 200.0}
+    assert stats['amazon']['deals'] == 1 and stats['amazon']['total_savings'] == 200.0
+    assert stats['other']['deals'] == 1
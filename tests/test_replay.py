@@ -0,0 +1,51 @@
+import asyncio
+from scrapers.replay import FixtureStore, RecordingFetcher, ReplayFetcher, ReplaySession
+from scrapers.session_pool import SessionPool
+from scrapers.trendyol_scraper import TrendyolScraper
+from tests.conftest import listing_app, serve
+
+
+def local_scraper(base_url: str) -> TrendyolScraper:
+    scraper = TrendyolScraper()
+    scraper.page_url = lambda page: f"{base_url}/sr?pi={page}&sst=DISCOUNTED"
+    scraper.rate_limiter = None
+    return scraper
+
+
+async def record(store, scraper):
+    async with RecordingFetcher(store, rate_limiter=None, policy=None, session_pool=None) as fetcher:
+        return await scraper.scrape_async(2, fetcher)
+
+
+def test_record_then_replay_offline(tmp_path, fixture_store):
+    store = FixtureStore(str(tmp_path))
+    with serve(listing_app(fixture_store)) as base_url:
+        recorded = asyncio.run(record(store, local_scraper(base_url)))
+        urls = [f"{base_url}/sr?pi={page}&sst=DISCOUNTED" for page in (1, 2)]
+
+    assert recorded
+    assert sorted(store.urls()) == sorted(urls)
+
+    # Sunucu kapandı: cevaplar sadece depodan gelir
+    scraper = local_scraper(base_url)
+    fetcher = ReplayFetcher(FixtureStore(str(tmp_path)))
+    replayed = asyncio.run(scraper.scrape_async(2, fetcher))
+    assert fetcher.misses == []
+    assert [p['asin'] for p in replayed] == [p['asin'] for p in recorded]
+
+
+def test_replay_session_bypasses_session_pool(tmp_path, fixture_store):
+    scraper = TrendyolScraper()
+    scraper.session_pool = SessionPool(size=2, proxies=[])
+    session = ReplaySession(fixture_store)
+    session.attach(scraper)
+
+    products = scraper.scrape_page(1)
+    assert products
+    assert scraper.session_pool is None
+    assert session.requests_served == 1 and session.misses == []
+
+
+def test_replay_fetcher_unknown_url_is_404(fixture_store):
+    result = asyncio.run(ReplayFetcher(fixture_store).fetch('https://www.trendyol.com/yok'))
+    assert result.status == 404 and not result.ok
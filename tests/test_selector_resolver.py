@@ -0,0 +1,122 @@
+import json
+import logging
+import pytest
+from scrapers.html_parser import parse_html
+from scrapers.selector_resolver import SelectorResolver
+
+NEW_LAYOUT = '<div class="card"><span class="price-new">100 TL</span></div>'
+OLD_LAYOUT = '<div class="card"><span class="price-old">100 TL</span></div>'
+EMPTY_CARD = '<div class="card"></div>'
+SELECTORS = ['.price-old', '.price-new', '.price']
+
+
+class RecordingRoot:
+    """Denenen selector'ları sırasıyla kaydeden kart sarmalayıcısı"""
+
+    def __init__(self, html):
+        self.root = parse_html(html.encode())
+        self.tried = []
+
+    def select_one(self, selector):
+        self.tried.append(selector)
+        return self.root.select_one(selector)
+
+    def select(self, selector):
+        self.tried.append(selector)
+        return self.root.select(selector)
+
+
+def lookup(resolver, html, selectors=SELECTORS, field='price'):
+    root = RecordingRoot(html)
+    found = resolver.select('trendyol', field, root, selectors, parse=lambda node: node.get_text(strip=True),
+                            first=True)
+    return found, root.tried
+
+
+@pytest.fixture
+def resolver():
+    return SelectorResolver(revalidate_every=1000, window=1000, alert_drop=0.2)
+
+
+def test_winning_selector_is_tried_first(resolver):
+    assert lookup(resolver, NEW_LAYOUT) == ('100 TL', ['.price-old', '.price-new'])
+    assert lookup(resolver, NEW_LAYOUT) == ('100 TL', ['.price-new'])
+    assert resolver.stats('trendyol')['trendyol']['price']['selector'] == '.price-new'
+
+    # Liste (first=False) aramaları da kazananı öğrenir
+    root = RecordingRoot(NEW_LAYOUT + NEW_LAYOUT)
+    assert len(resolver.select('trendyol', 'cards', root, ['article', 'div.card'])) == 2
+    assert root.tried == ['article', 'div.card']
+
+
+def test_learned_selector_falls_back_when_it_stops_matching(resolver):
+    lookup(resolver, NEW_LAYOUT)
+
+    # Site eski düzene döndü: kazanan ıskalar, liste sırayla denenir (kazanan tekrar denenmez)
+    assert lookup(resolver, OLD_LAYOUT) == ('100 TL', ['.price-new', '.price-old'])
+    assert lookup(resolver, OLD_LAYOUT) == ('100 TL', ['.price-old'])
+    state = resolver.stats()['trendyol']['price']
+    assert state['selector'] == '.price-old' and state['fallbacks'] == 1
+
+    assert lookup(resolver, EMPTY_CARD) == (None, ['.price-old', '.price-new', '.price'])
+    assert resolver.stats()['trendyol']['price']['selector'] == '.price-old'
+
+
+def test_periodic_revalidation_restores_preferred_selector():
+    resolver = SelectorResolver(revalidate_every=4, window=1000)
+    # İki düzen de eşleşen sayfa: öncelikli selector ikincisi kadar geçerli
+    both = '<div class="card"><span class="price-old">90 TL</span><span class="price-new">100 TL</span></div>'
+    lookup(resolver, NEW_LAYOUT)
+
+    tried = [lookup(resolver, both)[1] for _ in range(3)]
+    assert tried[:2] == [['.price-new'], ['.price-new']]
+    # 4. arama periyodik kontrol: liste baştan taranır
+    assert tried[2] == ['.price-old']
+    assert resolver.stats()['trendyol']['price']['selector'] == '.price-old'
+    assert lookup(resolver, both) == ('90 TL', ['.price-old'])
+
+
+def test_hit_rate_drop_alert(resolver, caplog):
+    resolver.window = 4
+    for _ in range(4):
+        lookup(resolver, NEW_LAYOUT)
+    assert resolver.stats()['trendyol']['price']['hit_rate'] == 1.0
+
+    # Yarısı ıskalayan pencere: %100 → %50, eşik 0.2
+    with caplog.at_level(logging.WARNING, logger='scrapers.selector_resolver'):
+        for html in (NEW_LAYOUT, EMPTY_CARD, NEW_LAYOUT, EMPTY_CARD):
+            lookup(resolver, html)
+    state = resolver.stats()['trendyol']['price']
+    assert state['hit_rate'] == 0.5 and state['alerts'] == 1
+    assert any('isabet oranı düştü' in record.getMessage() for record in caplog.records)
+
+    # Düşük ama sabit oran yeniden uyarmaz
+    for html in (NEW_LAYOUT, EMPTY_CARD, NEW_LAYOUT, EMPTY_CARD):
+        lookup(resolver, html)
+    assert resolver.stats()['trendyol']['price']['alerts'] == 1
+
+
+def test_learned_selectors_survive_restart(tmp_path):
+    path = str(tmp_path / 'cache' / 'selectors.json')
+    first = SelectorResolver(path, revalidate_every=1000, window=2)
+    lookup(first, NEW_LAYOUT)
+    lookup(first, NEW_LAYOUT)
+
+    # Pencere dolunca kazanan kendiliğinden yazılır
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {'trendyol': {'price': {'selector': '.price-new', 'hit_rate': 1.0}}}
+
+    second = SelectorResolver(path, revalidate_every=1000, window=2)
+    assert second.stats()['trendyol']['price']['hit_rate'] == 1.0
+    assert lookup(second, NEW_LAYOUT) == ('100 TL', ['.price-new'])
+
+    # Listede artık olmayan kayıtlı selector kullanılmaz
+    assert lookup(second, OLD_LAYOUT, selectors=['.price-old', '.price']) == ('100 TL', ['.price-old'])
+
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    path = tmp_path / 'selectors.json'
+    path.write_text('{bozuk', encoding='utf-8')
+    resolver = SelectorResolver(str(path))
+    assert resolver.stats() == {}
+    assert lookup(resolver, NEW_LAYOUT)[0] == '100 TL'
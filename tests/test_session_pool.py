@@ -0,0 +1,132 @@
+import asyncio
+import aiohttp
+from aiohttp import web
+from scrapers.fetcher import AsyncFetcher
+from scrapers.session_pool import USER_AGENTS, SessionPool, get_session_pool
+from scrapers.trendyol_scraper import TrendyolScraper
+from tests.conftest import serve
+
+PAGE = '<html>' + 'x' * 4096 + '</html>'
+
+
+def site_app(hits):
+    """/p/<ad>: 'captcha' → captcha sayfası, 'block' → 403, diğerleri büyük sayfa ve ilk istekte cookie"""
+    async def page(request):
+        name = request.match_info['name']
+        hits.append({'page': name, 'host': request.host, 'user_agent': request.headers.get('User-Agent'),
+                     'sid': request.cookies.get('sid'), 'via': request.headers.get('X-Via')})
+        if name == 'captcha':
+            return web.Response(text='<html>Lütfen captcha doğrulamasını tamamlayın</html>', content_type='text/html')
+        if name == 'block':
+            return web.Response(status=403, text='Forbidden')
+        response = web.Response(text=PAGE, content_type='text/html')
+        if not request.cookies.get('sid'):
+            response.set_cookie('sid', f'{name}-{len(hits)}')
+        return response
+
+    app = web.Application()
+    app.router.add_get('/p/{name}', page)
+    return app
+
+
+def proxy_app(seen):
+    """Mutlak URI'li istekleri hedefe ileten ve X-Via ekleyen basit HTTP proxy"""
+    async def forward(request):
+        seen.append(request.headers.get('Proxy-Authorization'))
+        headers = {key: value for key, value in request.headers.items()
+                   if key.lower() not in ('host', 'proxy-authorization', 'proxy-connection')}
+        headers['X-Via'] = 'proxy'
+        async with aiohttp.ClientSession() as session:
+            async with session.get(str(request.url), headers=headers) as upstream:
+                response = web.Response(status=upstream.status, body=await upstream.read())
+                for value in upstream.headers.getall('Set-Cookie', []):
+                    response.headers.add('Set-Cookie', value)
+                return response
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', forward)
+    return app
+
+
+async def fetch_all(pool, urls):
+    async with AsyncFetcher(rate_limiter=None, cache=None, policy=None, session_pool=pool) as fetcher:
+        return [await fetcher.fetch(url) for url in urls]
+
+
+def test_pool_is_off_by_default(monkeypatch):
+    monkeypatch.delenv('SESSION_POOL_SIZE', raising=False)
+    assert get_session_pool() is None
+    assert SessionPool(proxies=[]).size == 1
+
+
+def test_sessions_rotate_and_keep_their_own_cookies():
+    hits = []
+    pool = SessionPool(size=2, proxies=[])
+    with serve(site_app(hits)) as base_url:
+        results = asyncio.run(fetch_all(pool, [f'{base_url}/p/{n}' for n in ('a', 'b', 'c', 'd')]))
+
+    assert all(result.ok for result in results)
+    assert [hit['user_agent'] for hit in hits] == [USER_AGENTS[0], USER_AGENTS[1]] * 2
+    # Her oturum ilk cevapta aldığı cookie'yi sonraki isteğinde gönderir
+    assert [hit['sid'] for hit in hits] == [None, None, 'a-1', 'b-2']
+
+
+def test_sessions_are_sticky_per_host():
+    hits = []
+    pool = SessionPool(size=1, proxies=[])
+    with serve(site_app(hits)) as base_url:
+        other_url = base_url.replace('127.0.0.1', 'localhost')
+        asyncio.run(fetch_all(pool, [f'{base_url}/p/a', f'{other_url}/p/b', f'{base_url}/p/c', f'{other_url}/p/d']))
+
+    hosts = {hit['host'] for hit in hits}
+    assert len(hosts) == 2
+    # Bir host'un cookie'si diğer host'un oturumuna karışmaz
+    assert [hit['sid'] for hit in hits] == [None, None, 'a-1', 'b-2']
+    stats = pool.stats()
+    assert sorted(stats) == sorted(hosts)
+    assert all(len(host['active']) == 1 and host['active'][0]['requests'] == 2 for host in stats.values())
+
+
+def test_blocked_sessions_are_retired_and_replaced():
+    hits = []
+    pool = SessionPool(size=2, proxies=[])
+    with serve(site_app(hits)) as base_url:
+        results = asyncio.run(fetch_all(pool, [f'{base_url}/p/{n}' for n in ('a', 'captcha', 'block', 'b', 'c')]))
+        host = base_url.split('//')[1]
+
+    assert [result.verdict for result in results] == ['ok', 'captcha', 'soft_block', 'ok', 'ok']
+    stats = pool.stats(host)[host]
+    assert [(session['id'], session['retired']) for session in stats['retired']] == [
+        (f'{host}#2', 'captcha'), (f'{host}#1', 'soft_block')]
+    assert [session['id'] for session in stats['active']] == [f'{host}#4', f'{host}#3']
+    # Yeni oturumlar yeni cookie jar ile başlar
+    assert [hit['sid'] for hit in hits[3:]] == [None, None]
+
+
+def test_sessions_use_their_proxy():
+    hits, seen = [], []
+    with serve(site_app(hits)) as base_url, serve(proxy_app(seen)) as proxy_url:
+        proxy = proxy_url.replace('http://', 'http://kullanici:sifre@')
+        pool = SessionPool(size=1, proxies=[proxy])
+        asyncio.run(fetch_all(pool, [f'{base_url}/p/a']))
+        host = base_url.split('//')[1]
+
+    assert hits[0]['via'] == 'proxy'
+    assert seen[0] and seen[0].startswith('Basic ')
+    # Proxy kimlik bilgisi istatistiklere yazılmaz
+    assert pool.stats(host)[host]['active'][0]['proxy'] == proxy_url
+
+
+def test_sync_path_rotates_and_retires():
+    hits = []
+    scraper = TrendyolScraper()
+    scraper.rate_limiter = scraper.http_cache = scraper.fetch_policy = None
+    scraper.session_pool = SessionPool(size=2, proxies=[])
+    with serve(site_app(hits)) as base_url:
+        results = [scraper.fetch_page(f'{base_url}/p/{n}', 'trendyol', timeout=5) for n in ('a', 'b', 'a', 'captcha')]
+        host = base_url.split('//')[1]
+
+    assert [result.verdict for result in results] == ['ok', 'ok', 'ok', 'captcha']
+    assert [hit['user_agent'] for hit in hits] == [USER_AGENTS[0], USER_AGENTS[1]] * 2
+    assert hits[2]['sid'] == 'a-1'
+    assert [session['retired'] for session in scraper.session_pool.stats(host)[host]['retired']] == ['captcha']